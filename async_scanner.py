@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Device-aware scanning pipeline for MediaInfo Viewer
+An asyncio pipeline of walk, parse and sink stages for scanning trees spread
+over several devices. Each device (st_dev) gets its own concurrency limit,
+so a fast SSD can be kept busy without thrashing a spinning RAID or an NFS
+mount, and bounded queues between the stages provide backpressure
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+from scanner import MEDIA_EXTENSIONS, iter_media_entries, parse_file_record
+
+# Files parsed at once on a device without its own limit
+DEFAULT_DEVICE_LIMIT = 2
+
+# Items buffered between stages before the stage in front of them waits
+DEFAULT_QUEUE_SIZE = 256
+
+_DONE = object()
+
+
+class DeviceStats:
+    """Throughput counters for one device"""
+    __slots__ = ('device', 'files', 'errors', 'bytes', 'parse_seconds', 'first_start', 'last_end')
+
+    def __init__(self, device):
+        self.device = device
+        self.files = 0
+        self.errors = 0
+        self.bytes = 0
+        self.parse_seconds = 0.0  # summed over concurrent parses
+        self.first_start = None
+        self.last_end = None
+
+    @property
+    def elapsed(self):
+        """Wall-clock seconds from the first parse starting to the last finishing"""
+        if self.first_start is None:
+            return 0.0
+        return self.last_end - self.first_start
+
+    def summary(self):
+        elapsed = self.elapsed or 1e-9
+        return (f"device {self.device}: {self.files} files ({self.errors} errors), "
+                f"{self.bytes / 1048576:.1f} MB in {self.elapsed:.1f}s, "
+                f"{self.files / elapsed:.1f} files/s, {self.bytes / 1048576 / elapsed:.1f} MB/s")
+
+
+class _DeviceLane:
+    """Bounded queue of one device's files and the parse tasks draining it"""
+
+    def __init__(self, device, limit, queue_size):
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.stats = DeviceStats(device)
+        self.limit = limit
+        self.tasks = []
+
+
+class DevicePipeline:
+    """Walk trees, parse their files with per-device concurrency, and feed the results to a sink
+
+    parse(path) runs in executor and returns a record; sink(record) is
+    called on the event loop thread for every record, in completion order.
+    device_limits maps st_dev to the number of files parsed at once on
+    that device.
+    """
+
+    def __init__(self, executor, sink, parse=parse_file_record, device_limits=None,
+                 default_limit=DEFAULT_DEVICE_LIMIT, queue_size=DEFAULT_QUEUE_SIZE):
+        self.executor = executor
+        self.sink = sink
+        self.parse = parse
+        self.device_limits = device_limits or {}
+        self.default_limit = default_limit
+        self.queue_size = queue_size
+        self.lanes = {}  # st_dev -> _DeviceLane
+        self._sink_error = None
+
+    def stats(self):
+        """Get the DeviceStats of every device seen so far"""
+        return [lane.stats for lane in self.lanes.values()]
+
+    async def run(self, roots, extensions=MEDIA_EXTENSIONS, follow_symlinks=False):
+        loop = asyncio.get_running_loop()
+        self._results = asyncio.Queue(maxsize=self.queue_size)
+        sink_task = asyncio.create_task(self._sink_stage())
+
+        walkers = [loop.run_in_executor(None, self._walk, loop, root, extensions, follow_symlinks)
+                   for root in roots]
+        try:
+            await asyncio.gather(*walkers)
+            for lane in self.lanes.values():
+                for _ in lane.tasks:
+                    await lane.queue.put(_DONE)
+            await asyncio.gather(*(task for lane in self.lanes.values() for task in lane.tasks))
+        finally:
+            await self._results.put(_DONE)
+            await sink_task
+        if self._sink_error is not None:
+            raise self._sink_error
+
+    def _walk(self, loop, root, extensions, follow_symlinks):
+        """Walk stage (on a thread): route each file to its device's lane, waiting when the lane is full"""
+        for entry in iter_media_entries(root, extensions, follow_symlinks):
+            if self._sink_error is not None:
+                return
+            try:
+                # DirEntry.stat() reports no device on Windows
+                st = os.stat(entry.path) if os.name == 'nt' else entry.stat()
+            except OSError:
+                continue
+            asyncio.run_coroutine_threadsafe(self._enqueue(st.st_dev, entry.path, st.st_size), loop).result()
+
+    async def _enqueue(self, device, path, size):
+        lane = self.lanes.get(device)
+        if lane is None:
+            lane = self.lanes[device] = _DeviceLane(
+                device, self.device_limits.get(device, self.default_limit), self.queue_size
+            )
+            lane.tasks = [asyncio.create_task(self._parse_stage(lane)) for _ in range(lane.limit)]
+        await lane.queue.put((path, size))
+
+    async def _parse_stage(self, lane):
+        """Parse stage: one of a device's limited number of concurrent parsers"""
+        loop = asyncio.get_running_loop()
+        stats = lane.stats
+        while True:
+            item = await lane.queue.get()
+            if item is _DONE:
+                return
+            path, size = item
+            start = time.perf_counter()
+            if stats.first_start is None:
+                stats.first_start = start
+            try:
+                record = await loop.run_in_executor(self.executor, self.parse, path)
+            except Exception as e:
+                # The executor itself failed, e.g. a worker process died
+                record = {'path': path, 'error': str(e)}
+            end = time.perf_counter()
+            stats.parse_seconds += end - start
+            stats.last_end = end
+            stats.files += 1
+            stats.bytes += size
+            if 'error' in record:
+                stats.errors += 1
+            # Waits while the sink is behind
+            await self._results.put(record)
+
+    async def _sink_stage(self):
+        while True:
+            record = await self._results.get()
+            if record is _DONE:
+                return
+            if self._sink_error is not None:
+                # Drain what is already queued so no stage stays blocked
+                continue
+            try:
+                self.sink(record)
+            except Exception as e:
+                # Stop walking; run() raises this once the pipeline has wound down
+                self._sink_error = e
+
+
+def parse_device_limit(value):
+    """Parse a "PATH=N" option into (st_dev of PATH, N)"""
+    path, sep, limit = value.rpartition('=')
+    if not sep or not path:
+        raise ValueError(f"expected PATH=N, got {value!r}")
+    limit = int(limit)
+    if limit < 1:
+        raise ValueError("device limits must be at least 1")
+    return os.stat(path).st_dev, limit
+
+
+def default_workers(roots, device_limits=None, default_limit=DEFAULT_DEVICE_LIMIT):
+    """Get a pool size that lets every device reach its limit at once"""
+    return sum((device_limits or {}).values()) + default_limit * len(roots)
+
+
+def run_pipeline(roots, sink, parse=parse_file_record, workers=None, threads=False, device_limits=None,
+                 default_limit=DEFAULT_DEVICE_LIMIT, extensions=MEDIA_EXTENSIONS, follow_symlinks=False,
+                 executor=None):
+    """Scan roots through a DevicePipeline, returning its device stats
+
+    Files are parsed on executor if one is given, e.g. an IsolatedPool,
+    otherwise on a process (or thread) pool. parse must be picklable
+    unless threads is set.
+    """
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    device_limits = device_limits or {}
+    pipeline = DevicePipeline(executor, sink, parse, device_limits, default_limit)
+    if executor is not None:
+        asyncio.run(pipeline.run(roots, extensions, follow_symlinks))
+        return pipeline.stats()
+
+    workers = workers or default_workers(roots, device_limits, default_limit)
+    executor_class = ThreadPoolExecutor if threads else ProcessPoolExecutor
+    with executor_class(max_workers=workers) as pipeline.executor:
+        asyncio.run(pipeline.run(roots, extensions, follow_symlinks))
+    return pipeline.stats()
+
+
+def print_stats(stats, out=sys.stderr):
+    for device_stats in stats:
+        print(device_stats.summary(), file=out)
@@ -6,6 +6,7 @@ Demo script showing the enhanced MediaInfo Viewer features
 import os
 from pymediainfo import MediaInfo
 from translations import get_ui_text, get_attribute_name, get_category_name
+from formatters import format_value
 
 def demo_old_vs_new():
     """Demonstrate the difference between old and new display"""
@@ -83,7 +84,7 @@ def demo_new_style(track):
             value = getattr(track, attr, None)
             if value is not None:
                 display_name = get_attribute_name(attr, 'en')
-                formatted_value = format_value_demo(attr, value)
+                formatted_value = format_value(attr, value)
                 print(f"│   ├── {display_name}: {formatted_value}")
         print("│")
 
@@ -121,7 +122,7 @@ def demo_search_functionality(track):
             for attr, value in found_items[:2]:  # Show first 2 matches
                 en_name = get_attribute_name(attr, 'en')
                 zh_name = get_attribute_name(attr, 'zh')
-                formatted_value = format_value_demo(attr, value)
+                formatted_value = format_value(attr, value)
                 print(f"  ✅ {en_name} ({zh_name}): {formatted_value}")
         else:
             print("  ❌ No matches found")
@@ -154,21 +155,6 @@ def demo_bilingual_support(track):
         zh = get_attribute_name(attr, 'zh')
         print(f"  {en} ↔ {zh}")
 
-def format_value_demo(attr_name, value):
-    """Simple value formatting for demo"""
-    if attr_name == "file_size":
-        try:
-            size = int(float(value))
-            if size < 1024:
-                return f"{size} B"
-            elif size < 1024*1024:
-                return f"{size/1024:.1f} KB"
-            else:
-                return f"{size/(1024*1024):.1f} MB"
-        except:
-            return str(value)
-    return str(value)
-
 if __name__ == "__main__":
     demo_old_vs_new()
     
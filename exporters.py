@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Export helpers for MediaInfo Viewer
+Shared by the GUI export and the headless scanner so both produce the same records
+"""
+
+import os
+
+from track_model import track_to_dict
+from translations import get_attribute_name, get_category_name
+
+# Export format by file extension; anything else is exported as text
+EXPORT_FORMATS = {
+    '.json': 'json',
+    '.ndjson': 'ndjson',
+    '.jsonl': 'ndjson',
+    '.txt': 'text',
+}
+
+
+class ExportCancelled(Exception):
+    """Raised by write_export when the export was cancelled"""
+
+
+def export_format(file_path):
+    """Get the export format for a destination path from its extension"""
+    return EXPORT_FORMATS.get(os.path.splitext(file_path)[1].lower(), 'text')
+
+
+def media_to_records(media_info):
+    """Get one attribute dict per track of a parsed file"""
+    return [track_to_dict(track) for track in media_info.tracks]
+
+
+def views_to_records(track_views):
+    """Get one attribute dict per track from prebuilt track views"""
+    return [view.data for view in track_views]
+
+
+def format_track_text(view, language='en'):
+    """Format one track view as a plain-text report section"""
+    info_lines = []
+
+    # Header
+    info_lines.append(f"{'='*60}")
+    info_lines.append(f"{view.track_type.upper()} TRACK INFORMATION")
+    info_lines.append(f"{'='*60}")
+    info_lines.append("")
+
+    for category, rows in view.categories():
+        info_lines.append(get_category_name(category, language))
+        info_lines.append("-" * 40)
+        for row in rows:
+            info_lines.append(f"{get_attribute_name(row.attr, language):<32}: {row.formatted}")
+        info_lines.append("")
+
+    return "\n".join(info_lines)
+
+
+def write_text_report(track_views, f, language='en'):
+    """Write a plain-text report for all tracks to an open file"""
+    write_export([(None, track_views)], f, 'text', language)
+
+
+def _indent(text, prefix):
+    return "\n".join(prefix + line for line in text.split("\n"))
+
+
+def write_export(files, f, fmt='text', language='en', progress=None, cancelled=None):
+    """Stream an export of (path, track views) pairs to an open file, one track at a time
+
+    Only the track being written is ever serialized in memory. progress(done,
+    total) is called after each track, and if cancelled() returns true the
+    export stops by raising ExportCancelled. A single file exported as JSON
+    is a list of track dicts; several files, and NDJSON lines, are
+    {"path": ..., "tracks": [...]} records like the scanner writes.
+    """
+    import json
+
+    total = sum(len(track_views) for _, track_views in files)
+    done = 0
+
+    def track_written():
+        nonlocal done
+        done += 1
+        if progress is not None:
+            progress(done, total)
+        if cancelled is not None and cancelled():
+            raise ExportCancelled()
+
+    if fmt == 'text':
+        title = "媒体信息报告" if language == 'zh' else "MEDIA INFORMATION REPORT"
+        f.write(f"{title}\n")
+        f.write("=" * 60 + "\n\n")
+        for file_path, track_views in files:
+            if len(files) > 1:
+                f.write(f"{file_path}\n\n")
+            for view in track_views:
+                f.write(format_track_text(view, language))
+                f.write("\n\n" + "=" * 60 + "\n\n")
+                track_written()
+
+    elif fmt == 'ndjson':
+        for file_path, track_views in files:
+            f.write('{"path": ' + json.dumps(file_path, ensure_ascii=False) + ', "tracks": [')
+            for i, view in enumerate(track_views):
+                if i:
+                    f.write(", ")
+                f.write(json.dumps(view.data, ensure_ascii=False))
+                track_written()
+            f.write("]}\n")
+
+    elif len(files) == 1:
+        # Same layout as json.dump(records, indent=2)
+        track_views = files[0][1]
+        f.write("[" if track_views else "[]")
+        for i, view in enumerate(track_views):
+            f.write(",\n" if i else "\n")
+            f.write(_indent(json.dumps(view.data, indent=2, ensure_ascii=False), "  "))
+            track_written()
+        f.write("\n]" if track_views else "")
+
+    else:
+        f.write("[" if files else "[]")
+        for i, (file_path, track_views) in enumerate(files):
+            f.write(",\n" if i else "\n")
+            f.write('  {\n    "path": ' + json.dumps(file_path, ensure_ascii=False) + ',\n    "tracks": ')
+            f.write("[" if track_views else "[]")
+            for j, view in enumerate(track_views):
+                f.write(",\n" if j else "\n")
+                f.write(_indent(json.dumps(view.data, indent=2, ensure_ascii=False), "      "))
+                track_written()
+            f.write("\n    ]\n  }" if track_views else "\n  }")
+        f.write("\n]" if files else "")
+
+
+def export_to_file(files, file_path, fmt=None, language='en', progress=None, cancelled=None):
+    """Run write_export into file_path, leaving no partial file behind on failure or cancellation"""
+    fmt = fmt or export_format(file_path)
+    part_path = file_path + ".part"
+    try:
+        with open(part_path, 'w', encoding='utf-8') as f:
+            write_export(files, f, fmt, language, progress, cancelled)
+        os.replace(part_path, file_path)
+    except BaseException:
+        try:
+            os.remove(part_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+File-like readers that libmediainfo parses through for MediaInfo Viewer
+pymediainfo accepts any seekable binary file object and pulls the file through
+it in buffers, which lets the viewer see every byte libmediainfo reads
+"""
+
+import hashlib
+import os
+
+# Read size used for both libmediainfo buffers and hashing
+CHUNK_SIZE = 1024 * 1024
+
+# Default head and tail windows for bounded reads
+DEFAULT_HEAD_SIZE = 4 * 1024 * 1024
+DEFAULT_TAIL_SIZE = 1024 * 1024
+
+
+def parse_read_window(value):
+    """Parse a "HEAD[,TAIL]" size in megabytes into (head bytes, tail bytes)"""
+    parts = [part.strip() for part in value.split(',')]
+    if not 1 <= len(parts) <= 2:
+        raise ValueError(f"expected HEAD[,TAIL] in MB, got {value!r}")
+    sizes = [int(float(part) * 1024 * 1024) for part in parts]
+    if min(sizes) < 0:
+        raise ValueError("window sizes must not be negative")
+    return sizes[0], sizes[-1]
+
+
+class HashingReader:
+    """Binary file wrapper that hashes the file while libmediainfo reads it
+
+    Bytes are hashed in file order as they go by. When libmediainfo seeks
+    forward, the skipped range is read and hashed on the next read; seeking
+    backwards re-reads without hashing twice. finish() hashes whatever
+    libmediainfo never asked for, so the file is read about once in total.
+    """
+    mode = 'rb'
+
+    def __init__(self, raw, algorithms, chunk_size=CHUNK_SIZE):
+        self.raw = raw
+        self.chunk_size = chunk_size
+        self.hashes = {name: hashlib.new(name) for name in algorithms}
+        self.bytes_read = 0
+        self._hashed = 0     # length of the file prefix fed to the hashes
+        self._position = 0
+
+    def read(self, size=-1):
+        if self._position > self._hashed:
+            self._hash_up_to(self._position)
+        if self.raw.tell() != self._position:
+            self.raw.seek(self._position)
+        data = self.raw.read(size)
+        self.bytes_read += len(data)
+        end = self._position + len(data)
+        if end > self._hashed:
+            self._update(memoryview(data)[self._hashed - self._position:])
+            self._hashed = end
+        self._position = end
+        return data
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_SET:
+            self._position = offset
+        elif whence == os.SEEK_CUR:
+            self._position += offset
+        else:
+            # Only the size is needed for SEEK_END; the data is read lazily
+            self._position = self.raw.seek(offset, os.SEEK_END)
+        return self._position
+
+    def tell(self):
+        return self._position
+
+    def finish(self):
+        """Hash the rest of the file and return {algorithm: hex digest}"""
+        self._hash_up_to(None)
+        return {name: digest.hexdigest() for name, digest in self.hashes.items()}
+
+    def _hash_up_to(self, end):
+        """Read and hash from the hashed prefix up to end, or to the end of the file"""
+        self.raw.seek(self._hashed)
+        while end is None or self._hashed < end:
+            size = self.chunk_size if end is None else min(self.chunk_size, end - self._hashed)
+            data = self.raw.read(size)
+            if not data:
+                break
+            self.bytes_read += len(data)
+            self._update(data)
+            self._hashed += len(data)
+
+    def _update(self, data):
+        for digest in self.hashes.values():
+            digest.update(data)
+
+
+class HeadTailReader:
+    """Binary file wrapper that serves libmediainfo from a head and a tail window
+
+    Container-level information usually sits at the start and end of a file,
+    so each window is fetched with one large sequential read the first time
+    it is touched and then served from memory. Reading on past a window ends
+    the file, since libmediainfo otherwise consumes whatever it is given
+    (e.g. all of a WAV's samples). Only where libmediainfo seeks outside the
+    windows is the file itself read, for up to a head window's worth of
+    bytes from the seek target. bytes_read counts every byte actually read,
+    for tuning the window sizes on slow or remote storage.
+    """
+    mode = 'rb'
+
+    def __init__(self, raw, head_size=DEFAULT_HEAD_SIZE, tail_size=DEFAULT_TAIL_SIZE):
+        self.raw = raw
+        self.size = raw.seek(0, os.SEEK_END)
+        self.bytes_read = 0
+        self.fallback_reads = 0
+        self._position = 0
+        # Bytes that may be read outside the windows after each seek
+        self._seek_run = head_size
+        # End of the run opened by the last seek
+        self._run_end = 0
+        head_end = min(head_size, self.size)
+        tail_start = max(head_end, self.size - tail_size)
+        # [start, end, data or None until fetched]
+        self._windows = [[0, head_end, None], [tail_start, self.size, None]]
+
+    def read(self, size=-1):
+        end = self.size if size is None or size < 0 else min(self._position + size, self.size)
+
+        for window in self._windows:
+            start, window_end, data = window
+            if start <= self._position < window_end:
+                if data is None:
+                    data = window[2] = self._read_at(start, window_end - start)
+                # A short read up to the window's end; libmediainfo asks again for the rest
+                chunk = data[self._position - start:min(end, window_end) - start]
+                self._position += len(chunk)
+                return chunk
+            if self._position < start < end:
+                # Stop where the window begins so its bytes are only fetched once
+                end = start
+
+        # Outside the windows, only what follows a seek is read
+        end = min(end, self._run_end)
+        if end <= self._position:
+            return b''
+        self.fallback_reads += 1
+        chunk = self._read_at(self._position, end - self._position)
+        self._position += len(chunk)
+        return chunk
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_SET:
+            self._position = offset
+        elif whence == os.SEEK_CUR:
+            self._position += offset
+        else:
+            self._position = self.size + offset
+        self._run_end = self._position + self._seek_run
+        return self._position
+
+    def tell(self):
+        return self._position
+
+    def _read_at(self, offset, size):
+        self.raw.seek(offset)
+        data = self.raw.read(size)
+        self.bytes_read += len(data)
+        return data
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Value formatting for MediaInfo Viewer
+A registry maps attributes to unit formatters, and formatted values are
+memoized so repeated raw values across tracks and files are formatted once
+"""
+
+import abc
+import functools
+
+# Distinct (attribute, raw value) pairs remembered by format_value
+CACHE_SIZE = 65536
+
+
+def parse_number(value):
+    """Convert a raw MediaInfo value to an integer, or None if it isn't numeric"""
+    try:
+        return int(float(value))
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+class UnitFormatter(abc.ABC):
+    """Formats integers of one unit, e.g. milliseconds as a clock time"""
+
+    @abc.abstractmethod
+    def format(self, number):
+        """Format one integer value"""
+
+
+class DurationFormatter(UnitFormatter):
+    """Milliseconds as MM:SS, or HH:MM:SS from one hour up"""
+
+    def format(self, ms):
+        seconds = ms // 1000
+        hours = seconds // 3600
+        minutes = (seconds % 3600) // 60
+        secs = seconds % 60
+        if hours > 0:
+            return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+        return f"{minutes:02d}:{secs:02d}"
+
+
+class SizeFormatter(UnitFormatter):
+    """Bytes with a binary unit, e.g. 1000.0 KB"""
+    UNITS = ['B', 'KB', 'MB', 'GB', 'TB', 'PB']
+
+    def format(self, size):
+        for unit in self.UNITS[:-1]:
+            if size < 1024.0:
+                return f"{size:.1f} {unit}"
+            size /= 1024.0
+        return f"{size:.1f} {self.UNITS[-1]}"
+
+
+class BitRateFormatter(UnitFormatter):
+    """Bits per second as bps, kbps or Mbps"""
+
+    def format(self, bitrate):
+        if bitrate >= 1000000:
+            return f"{bitrate/1000000:.1f} Mbps"
+        elif bitrate >= 1000:
+            return f"{bitrate/1000:.1f} kbps"
+        return f"{bitrate} bps"
+
+
+# attribute -> UnitFormatter; attributes not listed are shown as their string value
+_FORMATTERS = {}
+
+
+def register_formatter(formatter, *attrs):
+    """Format the given attributes with a UnitFormatter"""
+    for attr in attrs:
+        _FORMATTERS[attr] = formatter
+    _format_cached.cache_clear()
+
+
+def get_formatter(attr):
+    """Get the UnitFormatter registered for an attribute, or None"""
+    return _FORMATTERS.get(attr)
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _format_cached(attr, value):
+    number = parse_number(value)
+    if number is None:
+        return str(value)
+    return _FORMATTERS[attr].format(number)
+
+
+def format_value(attr_name, value):
+    """Format values for better display"""
+    if attr_name not in _FORMATTERS:
+        return str(value)
+    try:
+        return _format_cached(attr_name, value)
+    except TypeError:
+        # Unhashable raw value: it can't be numeric either
+        return str(value)
+
+
+def format_column(attr_name, values):
+    """Format many values of one attribute, e.g. one attribute's rows across a file's tracks"""
+    if attr_name not in _FORMATTERS:
+        return [str(value) for value in values]
+    return [format_value(attr_name, value) for value in values]
+
+
+def cache_info():
+    """Get the hit/miss statistics of the format_value cache"""
+    return _format_cached.cache_info()
+
+
+register_formatter(DurationFormatter(), "duration")
+register_formatter(SizeFormatter(), "file_size", "stream_size")
+register_formatter(BitRateFormatter(), "bit_rate", "overall_bit_rate", "maximum_bit_rate")
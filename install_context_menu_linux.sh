@@ -15,7 +15,7 @@ cat > ~/.local/share/applications/mediainfo-viewer.desktop << EOF
 Type=Application
 Name=MediaInfo Viewer
 Comment=View media file information with modern UI
-Exec=python3 "$SCRIPT_DIR/mediainfo_viewer.py" %f
+Exec=python3 "$SCRIPT_DIR/mediainfo_viewer.py" %F
 Icon=multimedia-player
 MimeType=video/mp4;video/x-msvideo;video/x-matroska;video/quicktime;video/x-ms-wmv;video/x-flv;audio/mpeg;audio/x-wav;audio/flac;audio/aac;audio/mp4;audio/ogg;image/jpeg;image/png;image/gif;image/bmp;image/tiff;video/webm;video/3gpp;audio/x-ms-wma;image/webp;
 Categories=AudioVideo;Player;
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Crash-isolated batch parsing for MediaInfo Viewer
+Parses files one at a time in recyclable worker subprocesses, so a file that
+makes libmediainfo hang, crash or balloon in memory costs only its own worker.
+Such files are killed off after a wall-clock timeout or memory cap and go to
+a quarantine list with the reason, and the scan carries on with a fresh worker
+"""
+
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing.connection import wait
+
+from packed_records import pack_records, unpack_records
+from scanner import parse_file_record
+
+# Wall-clock seconds a single file may take before its worker is killed
+DEFAULT_TIMEOUT = 60.0
+
+# Resident memory a worker may reach, in bytes
+DEFAULT_MAX_RSS = 2048 * 1024 * 1024
+
+# Files a worker parses before it is replaced, bounding slow leaks
+DEFAULT_MAX_FILES = 500
+
+# Seconds between memory and liveness checks of busy workers
+RSS_CHECK_INTERVAL = 0.5
+
+# Quarantine reasons
+TIMEOUT = 'timeout'
+MEMORY = 'memory'
+CRASHED = 'crashed'
+
+_SPAWN_LOCK = threading.Lock()
+
+try:
+    _PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = 4096
+
+
+def process_rss(pid):
+    """Get a process's resident memory in bytes, or None where /proc is unavailable"""
+    try:
+        with open(f'/proc/{pid}/statm', 'rb') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def _exit_description(exitcode):
+    if exitcode is None:
+        return "worker stopped responding"
+    if exitcode < 0:
+        try:
+            return f"worker killed by {signal.Signals(-exitcode).name}"
+        except ValueError:
+            return f"worker killed by signal {-exitcode}"
+    return f"worker exited with status {exitcode}"
+
+
+def _worker_main(conn, parse):
+    """Worker process: run each job received until told to stop
+
+    A job is a path for parse, or a (function, args) pair when parse is None.
+    """
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        if parse is None:
+            fn, args = job
+            path = args[0] if args else None
+        else:
+            fn, args, path = parse, (job,), job
+        try:
+            record = fn(*args)
+        except Exception as e:
+            record = {'path': path, 'error': str(e)}
+        conn.send_bytes(pack_records([record]))
+
+
+class _Worker:
+    """One worker process and the file it is parsing, if any"""
+
+    def __init__(self, context, parse):
+        # A worker forked by another thread in between would inherit this
+        # pipe's child end and hide the EOF that reports this worker's death
+        with _SPAWN_LOCK:
+            self.conn, child_conn = context.Pipe()
+            self.process = context.Process(target=_worker_main, args=(child_conn, parse), daemon=True)
+            self.process.start()
+            child_conn.close()
+        self.path = None
+        self.started = None
+        self.files = 0
+
+    def submit(self, job, path):
+        self.conn.send(job)
+        self.path = path
+        self.started = time.monotonic()
+
+    def stop(self):
+        """Ask the worker to exit, killing it if it does not"""
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(1.0)
+        if self.process.is_alive():
+            self.kill()
+        self.conn.close()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class IsolatedPool:
+    """Parses paths in worker subprocesses with a per-file timeout and memory cap
+
+    parse(path) runs in the workers and returns a JSON-serialisable record
+    dict, which comes back as a PackedRecord; parse must be picklable where
+    processes are spawned. Files whose worker times out, exceeds max_rss or
+    dies are added to quarantine as {'path', 'reason', 'detail'} and yield
+    an error record instead.
+
+    map() parses a stream of paths with parse. submit(fn, path, ...) runs
+    any record-returning function under the same limits and returns a
+    Future, so the pool can also serve as asyncio's run_in_executor target.
+    """
+
+    def __init__(self, parse=parse_file_record, workers=None, timeout=DEFAULT_TIMEOUT,
+                 max_rss=DEFAULT_MAX_RSS, max_files=DEFAULT_MAX_FILES):
+        self.parse = parse
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.max_rss = max_rss
+        self.max_files = max_files
+        self.quarantine = []
+        # Workers replaced after a failure, as opposed to routine recycling
+        self.restarts = 0
+        self._context = multiprocessing.get_context()
+        self._lock = threading.Lock()
+        self._jobs = queue.SimpleQueue()
+        self._dispatchers = []
+        self._shut_down = False
+
+    def map(self, paths):
+        """Parse paths, yielding one record per path in completion order"""
+        paths = iter(paths)
+        idle = []
+        busy = {}  # connection -> worker
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(busy) < self.workers:
+                    path = next(paths, None)
+                    if path is None:
+                        exhausted = True
+                        break
+                    worker = idle.pop() if idle else _Worker(self._context, self.parse)
+                    worker.submit(path, path)
+                    busy[worker.conn] = worker
+                if not busy:
+                    return
+
+                for conn in wait(list(busy), self._wait_timeout(busy)):
+                    worker = busy.pop(conn)
+                    try:
+                        record, = unpack_records(conn.recv_bytes())
+                    except (EOFError, OSError):
+                        worker.process.join(1.0)
+                        yield self._fail(worker, CRASHED, _exit_description(worker.process.exitcode))
+                        continue
+                    worker.files += 1
+                    worker.path = None
+                    if worker.files >= self.max_files or self._over_memory(worker):
+                        worker.stop()
+                    else:
+                        idle.append(worker)
+                    yield record
+
+                now = time.monotonic()
+                for conn, worker in list(busy.items()):
+                    if not worker.process.is_alive() and not conn.poll():
+                        del busy[conn]
+                        worker.process.join()
+                        yield self._fail(worker, CRASHED, _exit_description(worker.process.exitcode))
+                    elif self.timeout and now - worker.started >= self.timeout:
+                        del busy[conn]
+                        yield self._fail(worker, TIMEOUT, f"no result after {self.timeout:g}s")
+                    elif self._over_memory(worker):
+                        del busy[conn]
+                        yield self._fail(worker, MEMORY, f"worker exceeded {self.max_rss >> 20} MB")
+        finally:
+            for worker in idle:
+                worker.stop()
+            for worker in busy.values():
+                worker.kill()
+
+    def submit(self, fn, *args):
+        """Run fn(*args) in a worker, returning a Future of its record
+
+        args[0] is the path quarantined if the worker fails. Each worker
+        process is driven by a dispatcher thread started on first use.
+        """
+        future = Future()
+        with self._lock:
+            if self._shut_down:
+                raise RuntimeError("cannot submit after shutdown")
+            if not self._dispatchers:
+                self._dispatchers = [
+                    threading.Thread(target=self._dispatch, name=f'mediainfo-isolated-{i}', daemon=True)
+                    for i in range(self.workers)
+                ]
+                for thread in self._dispatchers:
+                    thread.start()
+            self._jobs.put((future, fn, args))
+        return future
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        """Stop the submit() workers once their queued jobs are done, like Executor.shutdown"""
+        with self._lock:
+            if self._shut_down:
+                return
+            self._shut_down = True
+        if cancel_futures:
+            while True:
+                try:
+                    job = self._jobs.get_nowait()
+                except queue.Empty:
+                    break
+                job[0].cancel()
+        for _ in self._dispatchers:
+            self._jobs.put(None)
+        if wait:
+            for thread in self._dispatchers:
+                thread.join()
+
+    def _dispatch(self):
+        """Dispatcher thread: run submitted jobs one at a time on its own worker"""
+        worker = None
+        try:
+            while True:
+                job = self._jobs.get()
+                if job is None:
+                    return
+                future, fn, args = job
+                if not future.set_running_or_notify_cancel():
+                    continue
+                if worker is None:
+                    worker = _Worker(self._context, None)
+                worker.submit((fn, args), args[0] if args else None)
+                record = self._collect(worker)
+                if worker.path is not None:
+                    # Failed and killed
+                    worker = None
+                elif worker.files >= self.max_files or self._over_memory(worker):
+                    worker.stop()
+                    worker = None
+                future.set_result(record)
+        finally:
+            if worker is not None:
+                worker.stop()
+
+    def _collect(self, worker):
+        """Wait for a worker's current job, enforcing the timeout and memory cap"""
+        while True:
+            # Also wakes up to notice a worker that died without its EOF showing
+            timeout = RSS_CHECK_INTERVAL
+            if self.timeout:
+                timeout = min(timeout, max(0.0, worker.started + self.timeout - time.monotonic()))
+            if worker.conn.poll(timeout):
+                try:
+                    record, = unpack_records(worker.conn.recv_bytes())
+                except (EOFError, OSError):
+                    worker.process.join(1.0)
+                    return self._fail(worker, CRASHED, _exit_description(worker.process.exitcode))
+                worker.files += 1
+                worker.path = None
+                return record
+            if not worker.process.is_alive() and not worker.conn.poll():
+                worker.process.join()
+                return self._fail(worker, CRASHED, _exit_description(worker.process.exitcode))
+            if self.timeout and time.monotonic() - worker.started >= self.timeout:
+                return self._fail(worker, TIMEOUT, f"no result after {self.timeout:g}s")
+            if self._over_memory(worker):
+                return self._fail(worker, MEMORY, f"worker exceeded {self.max_rss >> 20} MB")
+
+    def _wait_timeout(self, busy):
+        """Seconds until the next timeout, memory or liveness check is due"""
+        # Memory and liveness are checked at least this often
+        timeout = RSS_CHECK_INTERVAL
+        if self.timeout:
+            timeout = min(timeout, min(worker.started for worker in busy.values()) + self.timeout - time.monotonic())
+        return max(0.0, timeout)
+
+    def _over_memory(self, worker):
+        if not self.max_rss:
+            return False
+        rss = process_rss(worker.process.pid)
+        return rss is not None and rss > self.max_rss
+
+    def _fail(self, worker, reason, detail):
+        """Kill a worker, quarantine its file and return the error record for it"""
+        path = worker.path
+        if worker.process.is_alive():
+            worker.kill()
+        else:
+            worker.conn.close()
+        with self._lock:
+            self.restarts += 1
+            self.quarantine.append({'path': path, 'reason': reason, 'detail': detail})
+        print(f"Quarantined {path}: {detail}", file=sys.stderr)
+        return {'path': path, 'error': detail, 'quarantined': reason}
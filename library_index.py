@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Media library index for MediaInfo Viewer
+Stores the tracks of scanned files in SQLite, with the attributes most often
+queried in typed, indexed columns and everything else in a JSON blob, so that
+questions like "HEVC video over 3840 wide with PQ transfer" stay fast on
+libraries of millions of tracks
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+
+from formatters import parse_number
+
+# Attributes stored in their own typed, indexed column: name -> SQLite type
+TYPED_COLUMNS = {
+    'track_type': 'TEXT',
+    'format': 'TEXT',
+    'width': 'INTEGER',
+    'height': 'INTEGER',
+    'duration': 'REAL',
+    'bit_rate': 'INTEGER',
+    'sampling_rate': 'INTEGER',
+    'channel_s': 'INTEGER',
+    'transfer_characteristics': 'TEXT',
+    'language': 'TEXT',
+}
+
+# Multi-column indexes for the usual ways of narrowing a query down
+COMPOSITE_INDEXES = {
+    'tracks_type_format': ('track_type', 'format'),
+    'tracks_format_size': ('format', 'width', 'height'),
+}
+
+# Comparison operators of query conditions, longest first for parsing
+OPERATORS = ('>=', '<=', '!=', '=', '>', '<', '~')
+
+_CONDITION_RE = re.compile(r'^\s*(\w+)\s*(' + '|'.join(re.escape(op) for op in OPERATORS) + r')\s*(.*?)\s*$')
+
+# Files added per transaction when indexing in bulk
+COMMIT_INTERVAL = 500
+
+
+def default_library_path():
+    """Get the per-user location of the library index database"""
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_DATA_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'share')
+    return os.path.join(base, 'mediainfo_viewer', 'library.sqlite3')
+
+
+def parse_condition(text):
+    """Parse a query condition like "width>=3840" into (attribute, operator, value)
+
+    "~" matches a case-insensitive substring; the other operators compare
+    numerically when the value is a number.
+    """
+    match = _CONDITION_RE.match(text)
+    if match is None or not match.group(3):
+        raise ValueError(f"invalid condition {text!r}, expected e.g. format=HEVC or width>=3840")
+    return match.group(1), match.group(2), match.group(3)
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def _column_value(sql_type, value):
+    """Convert a raw attribute string for a typed column; None if missing or not numeric"""
+    if value is None:
+        return None
+    if sql_type == 'INTEGER':
+        return parse_number(value)
+    if sql_type == 'REAL':
+        return _to_float(value)
+    return value
+
+
+class LibraryIndex:
+    """SQLite index of the tracks of many files, queryable by attribute conditions"""
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or default_library_path()
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " id INTEGER PRIMARY KEY,"
+            " path TEXT NOT NULL UNIQUE,"
+            " dev INTEGER,"
+            " ino INTEGER,"
+            " size INTEGER,"
+            " mtime_ns INTEGER)"
+        )
+        typed = ''.join(
+            f" {name} {sql_type}{' COLLATE NOCASE' if sql_type == 'TEXT' else ''},"
+            for name, sql_type in TYPED_COLUMNS.items()
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tracks ("
+            " file_id INTEGER NOT NULL,"
+            " track_index INTEGER NOT NULL,"
+            f"{typed}"
+            " attributes TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS tracks_file ON tracks (file_id)")
+        for name in TYPED_COLUMNS:
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS tracks_{name} ON tracks ({name})")
+        for index_name, columns in COMPOSITE_INDEXES.items():
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON tracks ({', '.join(columns)})")
+        self._conn.commit()
+
+    def add(self, file_path, tracks, identity=None):
+        """Index a file's tracks (one attribute dict each), replacing any earlier entry"""
+        with self._lock:
+            try:
+                self._add(file_path, tracks, identity)
+                self._conn.commit()
+            except sqlite3.Error:
+                self._conn.rollback()
+                raise
+
+    def add_records(self, records):
+        """Index scan records ({'path', 'tracks'} dicts) in bulk, returning the number added
+
+        Records carrying an error instead of tracks are skipped.
+        """
+        added = 0
+        with self._lock:
+            try:
+                for record in records:
+                    if 'tracks' not in record:
+                        continue
+                    self._add(record['path'], record['tracks'], record.get('identity'))
+                    added += 1
+                    if added % COMMIT_INTERVAL == 0:
+                        self._conn.commit()
+                self._conn.commit()
+                # Refresh the planner statistics the choice of index depends on
+                self._conn.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                self._conn.rollback()
+                raise
+        return added
+
+    def _add(self, file_path, tracks, identity):
+        file_path = os.path.abspath(file_path)
+        dev, ino, size, mtime_ns = identity or (None, None, None, None)
+        row = self._conn.execute("SELECT id FROM files WHERE path = ?", (file_path,)).fetchone()
+        if row is None:
+            file_id = self._conn.execute(
+                "INSERT INTO files (path, dev, ino, size, mtime_ns) VALUES (?, ?, ?, ?, ?)",
+                (file_path, dev, ino, size, mtime_ns)
+            ).lastrowid
+        else:
+            file_id = row[0]
+            self._conn.execute(
+                "UPDATE files SET dev = ?, ino = ?, size = ?, mtime_ns = ? WHERE id = ?",
+                (dev, ino, size, mtime_ns, file_id)
+            )
+            self._conn.execute("DELETE FROM tracks WHERE file_id = ?", (file_id,))
+
+        columns = ', '.join(TYPED_COLUMNS)
+        placeholders = ', '.join('?' * (len(TYPED_COLUMNS) + 3))
+        self._conn.executemany(
+            f"INSERT INTO tracks (file_id, track_index, {columns}, attributes) VALUES ({placeholders})",
+            [
+                (file_id, index,
+                 *(_column_value(sql_type, track.get(name)) for name, sql_type in TYPED_COLUMNS.items()),
+                 json.dumps({attr: value for attr, value in track.items() if attr not in TYPED_COLUMNS},
+                            ensure_ascii=False, separators=(',', ':')))
+                for index, track in enumerate(tracks)
+            ]
+        )
+
+    def remove(self, file_path):
+        """Drop a file and its tracks from the index"""
+        self.remove_many([file_path])
+
+    def remove_many(self, file_paths):
+        """Drop several files and their tracks from the index in one transaction"""
+        with self._lock:
+            try:
+                for file_path in file_paths:
+                    row = self._conn.execute(
+                        "SELECT id FROM files WHERE path = ?", (os.path.abspath(file_path),)
+                    ).fetchone()
+                    if row is not None:
+                        self._conn.execute("DELETE FROM tracks WHERE file_id = ?", (row[0],))
+                        self._conn.execute("DELETE FROM files WHERE id = ?", (row[0],))
+                self._conn.commit()
+            except sqlite3.Error:
+                self._conn.rollback()
+                raise
+
+    def manifest(self, root):
+        """Get {path: (dev, ino, size, mtime_ns)} for the indexed files at or under root"""
+        root = os.path.abspath(root)
+        prefix = root.rstrip(os.sep) + os.sep
+        # Range scan over the path index instead of LIKE, which would need escaping
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, dev, ino, size, mtime_ns FROM files"
+                " WHERE path = ? OR (path >= ? AND path < ?)",
+                (root, prefix, prefix[:-1] + chr(ord(os.sep) + 1))
+            ).fetchall()
+        return {path: (dev, ino, size, mtime_ns) for path, dev, ino, size, mtime_ns in rows}
+
+    def _where(self, conditions):
+        """Build the WHERE clause and parameters for a list of conditions"""
+        clauses = []
+        params = []
+        for condition in conditions:
+            attr, op, value = parse_condition(condition) if isinstance(condition, str) else condition
+            if op not in OPERATORS or not re.fullmatch(r'\w+', attr):
+                raise ValueError(f"invalid condition {condition!r}")
+            sql_type = TYPED_COLUMNS.get(attr)
+            if sql_type is not None:
+                column = f"t.{attr}"
+            else:
+                column = f"json_extract(t.attributes, '$.{attr}')"
+
+            number = _to_float(value)
+            if op == '~':
+                clauses.append(f"{column} LIKE ? ESCAPE '\\'")
+                escaped = value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+                params.append(f"%{escaped}%")
+            elif number is not None and sql_type != 'TEXT':
+                # Untyped attributes are stored as strings and compared as numbers
+                if sql_type is None:
+                    column = f"CAST({column} AS REAL)"
+                clauses.append(f"{column} {op} ?")
+                params.append(number)
+            else:
+                if sql_type is None:
+                    column = f"{column} COLLATE NOCASE"
+                clauses.append(f"{column} {op} ?")
+                params.append(value)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(self, conditions=(), limit=None):
+        """Get the tracks matching every condition as (path, track index, attributes) tuples
+
+        conditions are strings like "width>=3840" or (attribute, operator,
+        value) tuples. Typed columns are compared through their indexes.
+        Tracks come in the order they were indexed, a file's tracks together
+        and in track order: that is rowid order, which every index already
+        holds within equal keys, so a limited query stops after limit rows
+        instead of sorting every match.
+        """
+        where, params = self._where(conditions)
+        sql = (
+            f"SELECT f.path, t.track_index, {', '.join('t.' + name for name in TYPED_COLUMNS)}, t.attributes"
+            f" FROM tracks t JOIN files f ON f.id = t.file_id{where}"
+            " ORDER BY t.rowid"
+        )
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        results = []
+        for path, track_index, *values, attributes in rows:
+            track = json.loads(attributes)
+            for name, value in zip(TYPED_COLUMNS, values):
+                if value is not None:
+                    track[name] = value
+            results.append((path, track_index, track))
+        return results
+
+    def count(self, conditions=()):
+        """Count the tracks matching every condition"""
+        where, params = self._where(conditions)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM tracks t{where}", params).fetchone()[0]
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
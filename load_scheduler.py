@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Load scheduler for MediaInfo Viewer
+Runs file loads on a bounded worker pool and tags each with a generation, so
+that only the most recently requested load can ever deliver its result
+"""
+
+import queue
+import threading
+
+# Parses allowed to run at once; further loads wait in the queue
+DEFAULT_MAX_WORKERS = 2
+
+
+class LoadScheduler:
+    """Bounded, cancellable executor for foreground file loads"""
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, on_change=None):
+        self._jobs = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._queued = set()  # generations submitted but not started
+        self._in_flight = 0
+        self._closed = False
+        # Daemon threads, unlike a ThreadPoolExecutor's, so a parse stuck on
+        # slow storage never keeps the process alive after the window closes
+        self._threads = [
+            threading.Thread(target=self._worker, name=f'mediainfo-load-{i}', daemon=True)
+            for i in range(max_workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+        # Called with (queued, in_flight) from any thread whenever either changes
+        self.on_change = on_change
+
+    def submit(self, fn, *args, callback=None, partial_callback=None):
+        """Schedule fn(*args), superseding every earlier load
+
+        callback(generation, result, error) is invoked on the worker thread once
+        fn finishes, but only if no newer load was submitted in the meantime.
+        If partial_callback is given, fn is also passed a report(result)
+        keyword argument for delivering intermediate results, which reach
+        partial_callback(generation, result) under the same rule.
+        Returns the generation token of the new load.
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("cannot submit loads after shutdown")
+            self._generation += 1
+            generation = self._generation
+
+            # Loads that haven't started yet are dropped outright; workers skip them
+            self._queued.clear()
+            self._queued.add(generation)
+            self._jobs.put((generation, fn, args, callback, partial_callback))
+        self._notify()
+        return generation
+
+    def _worker(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            self._run(*job)
+
+    def _run(self, generation, fn, args, callback, partial_callback):
+        with self._lock:
+            if generation not in self._queued:
+                # Dropped before it started
+                return
+            self._queued.discard(generation)
+            superseded = generation != self._generation
+            if not superseded:
+                self._in_flight += 1
+        self._notify()
+        if superseded:
+            return
+
+        kwargs = {}
+        if partial_callback is not None:
+            def report(partial):
+                if self.is_current(generation):
+                    partial_callback(generation, partial)
+            kwargs['report'] = report
+
+        result = error = None
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            error = e
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._notify()
+
+        if callback is not None and self.is_current(generation):
+            callback(generation, result, error)
+
+    def cancel_pending(self):
+        """Supersede every submitted load without starting a new one"""
+        with self._lock:
+            self._generation += 1
+            self._queued.clear()
+        self._notify()
+
+    def is_current(self, generation):
+        """Check whether a generation is still the newest requested load"""
+        return generation == self._generation
+
+    def stats(self):
+        """Get (queued, in_flight) load counts"""
+        with self._lock:
+            return len(self._queued), self._in_flight
+
+    @property
+    def busy(self):
+        """Whether any foreground load is queued or running"""
+        queued, in_flight = self.stats()
+        return queued + in_flight > 0
+
+    def _notify(self):
+        if self.on_change is not None:
+            self.on_change(*self.stats())
+
+    def shutdown(self):
+        """Stop accepting loads and drop the ones still queued, without waiting for running ones"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._generation += 1
+            self._queued.clear()
+        for _ in self._threads:
+            self._jobs.put(None)
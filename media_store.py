@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+In-memory store of parsed files for MediaInfo Viewer
+Keeps recently used parse results in an LRU bounded by an estimated memory
+budget; whatever is evicted can be reloaded from the on-disk parse cache
+"""
+
+import threading
+from collections import OrderedDict
+
+# Default memory budget for parsed files kept in memory
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Rough per-attribute cost of the MediaInfo track entry, data dict entry and row object
+ATTRIBUTE_OVERHEAD = 400
+
+
+def estimate_size(track_views):
+    """Estimate the in-memory footprint of a parsed file from its track views
+
+    Each attribute's strings are held about three times over (the MediaInfo
+    track, the track view's data dict and its formatted row), plus the
+    objects around them.
+    """
+    size = 0
+    for view in track_views:
+        for attr, text in view.data.items():
+            size += 3 * (len(attr) + len(text)) + ATTRIBUTE_OVERHEAD
+    return size
+
+
+class MediaStore:
+    """Thread-safe LRU of parse results with a byte budget"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, on_evict=None):
+        self.max_bytes = max_bytes
+        # Called with (key, value) for every entry dropped to fit the budget
+        self.on_evict = on_evict
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (value, size), least recently used first
+        self._total_bytes = 0
+
+    def get(self, key):
+        """Get a stored value and mark it most recently used, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def peek(self, key):
+        """Get a stored value without affecting its recency, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[0] if entry is not None else None
+
+    def put(self, key, value, size):
+        """Store a value as most recently used, evicting older entries to fit the budget
+
+        The new entry itself is always kept, even if it alone exceeds the budget.
+        """
+        evicted = []
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._total_bytes -= old[1]
+            self._entries[key] = (value, size)
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                old_key, (old_value, old_size) = self._entries.popitem(last=False)
+                self._total_bytes -= old_size
+                evicted.append((old_key, old_value))
+
+        if self.on_evict is not None:
+            for old_key, old_value in evicted:
+                self.on_evict(old_key, old_value)
+
+    def pop(self, key):
+        """Remove an entry, returning its value or None"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+            self._total_bytes -= entry[1]
+            return entry[0]
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def keys(self):
+        """Get the stored keys, least recently used first"""
+        with self._lock:
+            return list(self._entries)
+
+    @property
+    def total_bytes(self):
+        """Estimated bytes held by all entries"""
+        return self._total_bytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
@@ -6,23 +6,95 @@ A beautiful and intuitive media file information viewer with modern UI
 
 import os
 import sys
-import tkinter as tk
-from tkinter import filedialog, messagebox, ttk
-import customtkinter as ctk
-from pymediainfo import MediaInfo
-from PIL import Image, ImageTk
 import threading
-import json
-from pathlib import Path
-import darkdetect
-from translations import get_ui_text, get_attribute_name, get_category_name, get_available_languages
+import time
 
-# Set appearance mode
-ctk.set_appearance_mode("system")  # Modes: "System" (standard), "Dark", "Light"
-ctk.set_default_color_theme("blue")  # Themes: "blue" (standard), "green", "dark-blue"
+# Reference point for --startup-profile timings
+_MODULE_LOAD_START = time.perf_counter()
+
+import functools
+import importlib
+from translations import get_ui_text, get_attribute_name, get_available_languages, get_language_name, get_track_type_name
+import single_instance
+from formatters import format_value
+from track_model import OTHER_CATEGORY, build_media_view, category_labels
+from search_index import TrackSearchIndex, GlobalSearchIndex
+from load_scheduler import LoadScheduler
+from media_store import MediaStore, estimate_size
+from prefetcher import DEFAULT_PREFETCH_COUNT, ORDERS as PREFETCH_ORDERS, Prefetcher
+
+# GUI toolkit modules, imported on first window construction by load_gui_modules()
+# so that headless commands and forwarding launches never pay for them
+tk = None
+ttk = None
+filedialog = None
+messagebox = None
+ctk = None
+TrackList = None
+
+# Delay after the last keystroke before the search filter runs
+SEARCH_DEBOUNCE_MS = 150
+
+# Attribute rows inserted at a time when a category is opened or scrolled to its end
+TREE_PAGE_SIZE = 200
+
+# (label, seconds) pairs reported by --startup-profile
+STARTUP_TIMINGS = []
+
+def timed_import(module_name):
+    """Import a module, recording how long it took"""
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    STARTUP_TIMINGS.append((f"import {module_name}", time.perf_counter() - start))
+    return module
+
+def load_gui_modules():
+    """Import the Tk and CustomTkinter stack on first use"""
+    global tk, ttk, filedialog, messagebox, ctk, TrackList
+    if ctk is not None:
+        return
+    
+    tk = timed_import('tkinter')
+    ttk = timed_import('tkinter.ttk')
+    filedialog = timed_import('tkinter.filedialog')
+    messagebox = timed_import('tkinter.messagebox')
+    ctk = timed_import('customtkinter')
+    TrackList = timed_import('track_list').TrackList
+    
+    # Set appearance mode
+    ctk.set_appearance_mode("system")  # Modes: "System" (standard), "Dark", "Light"
+    ctk.set_default_color_theme("blue")  # Themes: "blue" (standard), "green", "dark-blue"
+
+def print_startup_profile():
+    """Print the recorded startup timings to stderr"""
+    print("Startup profile:", file=sys.stderr)
+    for label, seconds in STARTUP_TIMINGS:
+        print(f"  {label:<32} {seconds * 1000:8.1f} ms", file=sys.stderr)
+
+class CategoryNode:
+    """Tree state of one attribute category of the displayed track
+
+    Rows are inserted lazily: none until the category is first opened, then a
+    page at a time. items holds the inserted prefix of rows, and more_item is
+    the placeholder child standing in for the rest (None once all are shown).
+    """
+    __slots__ = ('category', 'item', 'rows', 'start', 'items', 'expanded', 'more_item')
+    
+    def __init__(self, category, item, rows, start):
+        self.category = category
+        self.item = item
+        self.rows = rows
+        # Index of the first row in the track's search index
+        self.start = start
+        self.items = []
+        self.expanded = False
+        self.more_item = None
 
 class MediaInfoViewer:
-    def __init__(self):
+    def __init__(self, file_path=None, parse_cache=None, quick_parse_threshold=None, memory_budget=None,
+                 prefetch_count=DEFAULT_PREFETCH_COUNT, prefetch_order='name', checksums=(),
+                 read_window=None):
+        load_gui_modules()
         self.root = ctk.CTk()
         self.current_language = 'en'  # Default language
         self.root.title(get_ui_text('title', self.current_language))
@@ -36,21 +108,64 @@ class MediaInfoViewer:
         except:
             pass
             
-        self.setup_ui()
+        self.parse_cache = parse_cache
+        self.quick_parse_threshold = quick_parse_threshold
+        # hashlib algorithms computed in the same read as the parse, shown on the General track
+        self.checksums = checksums
+        # (head, tail) bytes that libmediainfo is served from, for slow or remote storage
+        self.read_window = read_window
+        # path -> (bytes read, file size) of its last measured parse, written by load workers
+        self.read_stats = {}
+        self.file_path = None
         self.media_info = None
+        self.track_views = []
+        self.current_track_data = None
+        # Paths of the open tabs, in tab order, and tab label -> path
+        self.tabs = []
+        self.tab_paths = {}
+        # Recently viewed parse results: path -> (MediaInfo, track views); evicted
+        # files stay open as tabs and are reloaded from the parse cache
+        self.media_store = MediaStore() if memory_budget is None else MediaStore(memory_budget)
+        self.global_index = GlobalSearchIndex()
+        self.load_scheduler = LoadScheduler(
+            on_change=lambda queued, in_flight: self.root.after(0, self.update_load_status)
+        )
+        # Parses the next files in the folder of each opened file while the foreground is idle
+        self.prefetcher = Prefetcher(
+            self.parse_media,
+            is_busy=lambda: self.load_scheduler.busy,
+            count=prefetch_count, order=prefetch_order
+        )
+        self.search_hits = []
+        # Search hit to jump to once its file has been reloaded
+        self.pending_jump = None
+        # File whose quick-pass result is displayed while its full analysis runs
+        self.partial_file = None
+        # CategoryNode per category of the displayed track, in display order
+        self.tree_layout = []
+        self.category_nodes = {}  # category item -> CategoryNode
+        self.attribute_rows = {}  # attr -> (CategoryNode, row offset)
+        self.row_values = {}      # attribute item -> displayed value
+        self._page_after_id = None
+        # Set to cancel the running export; None when no export is running
+        self.export_cancel = None
+        self.visible_rows = set()
+        self.visible_categories = set()
+        self.search_index = TrackSearchIndex()
+        self._search_after_id = None
         self.search_var = tk.StringVar()
         self.search_var.trace('w', self.on_search_change)
+        self.global_search_var = tk.BooleanVar(value=False)
+        self.setup_ui()
         
         # Check if file was passed as argument
-        if len(sys.argv) > 1:
-            file_path = sys.argv[1]
-            if os.path.exists(file_path):
-                self.load_file(file_path)
+        if file_path and os.path.exists(file_path):
+            self.load_file(file_path)
     
     def setup_ui(self):
         # Configure grid weight
         self.root.grid_columnconfigure(1, weight=1)
-        self.root.grid_rowconfigure(1, weight=1)
+        self.root.grid_rowconfigure(2, weight=1)
         
         # Top frame for controls
         self.top_frame = ctk.CTkFrame(self.root)
@@ -82,14 +197,16 @@ class MediaInfoViewer:
         )
         self.language_label.pack(side="right", padx=(10, 5), pady=10)
         
+        # Menu name -> language code, for every built-in language and language pack
+        self.language_codes = {get_language_name(language): language for language in get_available_languages()}
         self.language_combo = ctk.CTkComboBox(
             self.top_frame,
-            values=["English", "中文"],
+            values=list(self.language_codes),
             command=self.change_language,
             width=100,
             height=35
         )
-        self.language_combo.set("English")
+        self.language_combo.set(get_language_name(self.current_language))
         self.language_combo.pack(side="right", padx=5, pady=10)
         
         # Export button
@@ -108,7 +225,7 @@ class MediaInfoViewer:
         
         # Status bar
         self.status_frame = ctk.CTkFrame(self.root, height=30)
-        self.status_frame.grid(row=2, column=0, columnspan=2, sticky="ew", padx=10, pady=(0, 10))
+        self.status_frame.grid(row=3, column=0, columnspan=2, sticky="ew", padx=10, pady=(0, 10))
         
         self.status_label = ctk.CTkLabel(
             self.status_frame, 
@@ -116,11 +233,49 @@ class MediaInfoViewer:
             font=ctk.CTkFont(size=11)
         )
         self.status_label.pack(side="left", padx=10, pady=5)
+        
+        # Shown only while an export is running
+        self.cancel_export_button = ctk.CTkButton(
+            self.status_frame,
+            text=get_ui_text('cancel_export', self.current_language),
+            command=self.cancel_export,
+            width=80,
+            height=24
+        )
+        
+        # Parse cache hit/miss counters
+        self.cache_label = ctk.CTkLabel(
+            self.status_frame,
+            text="",
+            font=ctk.CTkFont(size=11)
+        )
+        self.cache_label.pack(side="right", padx=10, pady=5)
+        self.update_cache_status()
+        
+        # Load queue depth and parses in flight
+        self.load_label = ctk.CTkLabel(
+            self.status_frame,
+            text="",
+            font=ctk.CTkFont(size=11)
+        )
+        self.load_label.pack(side="right", padx=10, pady=5)
+        self.update_load_status()
     
     def setup_main_content(self):
+        # One tab per open file, shown once a file is open
+        self.tab_frame = ctk.CTkFrame(self.root, fg_color="transparent")
+        self.tab_frame.grid(row=1, column=0, columnspan=2, sticky="ew", padx=10)
+        self.tab_bar = ctk.CTkSegmentedButton(self.tab_frame, values=[], command=self.on_tab_select)
+        self.tab_bar.pack(side="left", fill="x", expand=True)
+        self.close_tab_button = ctk.CTkButton(
+            self.tab_frame, text="✕", width=30, command=self.close_current_tab
+        )
+        self.close_tab_button.pack(side="right", padx=(5, 0))
+        self.tab_frame.grid_remove()
+        
         # Left sidebar for track selection
         self.sidebar = ctk.CTkFrame(self.root, width=250)  # Wider sidebar
-        self.sidebar.grid(row=1, column=0, sticky="nsew", padx=(10, 5), pady=5)
+        self.sidebar.grid(row=2, column=0, sticky="nsew", padx=(10, 5), pady=5)
         self.sidebar.grid_propagate(False)
         
         self.sidebar_label = ctk.CTkLabel(
@@ -130,13 +285,13 @@ class MediaInfoViewer:
         )
         self.sidebar_label.pack(pady=10)
         
-        # Scrollable frame for track list
-        self.track_frame = ctk.CTkScrollableFrame(self.sidebar)
-        self.track_frame.pack(fill="both", expand=True, padx=10, pady=10)
+        # Track list; its buttons are recycled across scrolling and loads
+        self.track_list = TrackList(self.sidebar, on_select=self.show_track_info)
+        self.track_list.pack(fill="both", expand=True, padx=10, pady=10)
         
         # Main content area
         self.content_frame = ctk.CTkFrame(self.root)
-        self.content_frame.grid(row=1, column=1, sticky="nsew", padx=(5, 10), pady=5)
+        self.content_frame.grid(row=2, column=1, sticky="nsew", padx=(5, 10), pady=5)
         self.content_frame.grid_columnconfigure(0, weight=1)
         self.content_frame.grid_rowconfigure(2, weight=1)
         
@@ -161,10 +316,20 @@ class MediaInfoViewer:
             height=35,
             font=ctk.CTkFont(size=12)
         )
-        self.search_entry.pack(fill="x", padx=10, pady=10)
+        self.search_entry.pack(side="left", fill="x", expand=True, padx=10, pady=10)
+        
+        # Search across every track of every open file
+        self.global_search_check = ctk.CTkCheckBox(
+            self.search_frame,
+            text=get_ui_text('search_all_files', self.current_language),
+            variable=self.global_search_var,
+            command=self.on_global_search_toggle
+        )
+        self.global_search_check.pack(side="right", padx=10, pady=10)
         
         # Create main info display using Treeview for structured data
         self.setup_treeview()
+        self.setup_results_pane()
         
         # Default message
         self.show_welcome_message()
@@ -188,9 +353,12 @@ class MediaInfoViewer:
         self.tree.column("value", width=400, minwidth=200)
         
         # Add scrollbars
-        v_scrollbar = ttk.Scrollbar(self.tree_frame, orient="vertical", command=self.tree.yview)
-        v_scrollbar.grid(row=0, column=1, sticky="ns")
-        self.tree.configure(yscrollcommand=v_scrollbar.set)
+        self.tree_scrollbar = ttk.Scrollbar(self.tree_frame, orient="vertical", command=self.tree.yview)
+        self.tree_scrollbar.grid(row=0, column=1, sticky="ns")
+        self.tree.configure(yscrollcommand=self.on_tree_scroll)
+        
+        # Category rows are inserted on demand
+        self.tree.bind("<<TreeviewOpen>>", self.on_tree_open)
         
         h_scrollbar = ttk.Scrollbar(self.tree_frame, orient="horizontal", command=self.tree.xview)
         h_scrollbar.grid(row=1, column=0, sticky="ew")
@@ -201,19 +369,60 @@ class MediaInfoViewer:
         style.configure("Treeview", font=("Segoe UI", 10))
         style.configure("Treeview.Heading", font=("Segoe UI", 11, "bold"))
     
+    def setup_results_pane(self):
+        """Setup the global search results list, shown only in all-files search mode"""
+        self.results_frame = ctk.CTkFrame(self.content_frame)
+        self.results_frame.grid(row=3, column=0, sticky="nsew", padx=20, pady=(0, 20))
+        self.results_frame.grid_columnconfigure(0, weight=1)
+        self.results_frame.grid_rowconfigure(1, weight=1)
+        
+        self.results_label = ctk.CTkLabel(self.results_frame, text="", font=ctk.CTkFont(size=12))
+        self.results_label.grid(row=0, column=0, sticky="w", padx=10, pady=(5, 0))
+        
+        columns = ("file", "track", "attribute", "value")
+        self.results_tree = ttk.Treeview(self.results_frame, columns=columns, show="headings", height=8)
+        self.results_tree.grid(row=1, column=0, sticky="nsew", padx=(10, 0), pady=10)
+        for column, width in zip(columns, (200, 120, 180, 250)):
+            self.results_tree.column(column, width=width, minwidth=80)
+        self.update_results_headings()
+        
+        results_scrollbar = ttk.Scrollbar(self.results_frame, orient="vertical", command=self.results_tree.yview)
+        results_scrollbar.grid(row=1, column=1, sticky="ns", pady=10)
+        self.results_tree.configure(yscrollcommand=results_scrollbar.set)
+        self.results_tree.bind("<<TreeviewSelect>>", self.on_result_select)
+        
+        self.results_frame.grid_remove()
+    
+    def update_results_headings(self):
+        """Update the global search result column headings for the current language"""
+        for column, key in (("file", 'file'), ("track", 'track'), ("attribute", 'attribute'), ("value", 'value')):
+            self.results_tree.heading(column, text=get_ui_text(key, self.current_language))
+    
     def change_language(self, language_name):
         """Change the application language"""
-        if language_name == "中文":
-            self.current_language = 'zh'
-        else:
-            self.current_language = 'en'
+        self.current_language = self.language_codes.get(language_name, 'en')
         
         # Update UI elements
         self.update_ui_language()
         
-        # Refresh media info display if available
+        # Relabel the displayed file in place
         if self.media_info:
-            self.display_media_info()
+            self.relabel_display()
+    
+    def relabel_display(self):
+        """Switch the track list, tree and search results to the current language without rebuilding them"""
+        language = self.current_language
+        self.track_list.relabel([self.track_label(view) for view in self.track_views])
+        
+        for node in self.tree_layout:
+            self.tree.item(node.item, text=f"📋 {category_labels(node.category)[language]}")
+            for item, row in zip(node.items, node.rows):
+                self.tree.item(item, text=row.labels[language])
+            self.update_more_item(node)
+        
+        self.update_track_title()
+        if self.global_search_var.get():
+            self.run_global_search()
     
     def update_ui_language(self):
         """Update all UI elements with current language"""
@@ -224,7 +433,12 @@ class MediaInfoViewer:
         self.content_title.configure(text=get_ui_text('media_information', self.current_language))
         self.language_label.configure(text=get_ui_text('language', self.current_language) + ":")
         self.search_entry.configure(placeholder_text=get_ui_text('search_placeholder', self.current_language))
+        self.global_search_check.configure(text=get_ui_text('search_all_files', self.current_language))
+        self.cancel_export_button.configure(text=get_ui_text('cancel_export', self.current_language))
+        self.update_results_headings()
         self.status_label.configure(text=get_ui_text('ready', self.current_language))
+        self.update_cache_status()
+        self.update_load_status()
         
         # Update treeview headers
         if hasattr(self, 'tree'):
@@ -232,50 +446,207 @@ class MediaInfoViewer:
             self.tree.heading("value", text=get_ui_text('value', self.current_language))
     
     def on_search_change(self, *args):
-        """Handle search text changes"""
-        if hasattr(self, 'current_track_data'):
+        """Handle search text changes, filtering once typing pauses"""
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+        if self.global_search_var.get():
+            self._search_after_id = self.root.after(SEARCH_DEBOUNCE_MS, self.run_global_search)
+        else:
+            self._search_after_id = self.root.after(SEARCH_DEBOUNCE_MS, self.filter_tree_items)
+    
+    def on_global_search_toggle(self):
+        """Switch between filtering the current track and searching all open files"""
+        if self.global_search_var.get():
+            self.results_frame.grid()
+            self.content_frame.grid_rowconfigure(3, weight=1)
             self.filter_tree_items()
+            self.run_global_search()
+        else:
+            self.results_frame.grid_remove()
+            self.content_frame.grid_rowconfigure(3, weight=0)
+            self.filter_tree_items()
+    
+    def run_global_search(self):
+        """Search every track of every open file and list the ranked hits"""
+        self._search_after_id = None
+        self.results_tree.delete(*self.results_tree.get_children())
+        self.search_hits = self.global_index.search(self.search_var.get())
+        
+        for i, hit in enumerate(self.search_hits):
+            # Files evicted from memory fall back to the label stored in the index
+            entry = self.media_store.peek(hit.file_path)
+            label = self.track_label(entry[1][hit.track_index]) if entry is not None else hit.track_label
+            self.results_tree.insert("", "end", iid=str(i), values=(
+                os.path.basename(hit.file_path),
+                label,
+                get_attribute_name(hit.attr, self.current_language),
+                hit.value
+            ))
+        
+        files = len({hit.file_path for hit in self.search_hits})
+        self.results_label.configure(text=get_ui_text('search_results', self.current_language).format(
+            count=len(self.search_hits), files=files
+        ))
+    
+    def on_result_select(self, event=None):
+        """Jump to the file, track and attribute of the selected search hit"""
+        selection = self.results_tree.selection()
+        if not selection:
+            return
+        hit = self.search_hits[int(selection[0])]
+        
+        if hit.file_path != self.file_path:
+            entry = self.media_store.get(hit.file_path)
+            if entry is None:
+                # Evicted from memory: jump once it has been reloaded
+                self.pending_jump = hit
+                self.load_file(hit.file_path)
+                return
+            self.show_media(hit.file_path, *entry, track_index=hit.track_index)
+        elif self.current_track_data is not self.track_views[hit.track_index]:
+            self.show_track_info(hit.track_index)
+        self.jump_to_attribute(hit.attr)
+    
+    def jump_to_attribute(self, attr):
+        """Select and scroll to an attribute of the displayed track"""
+        item = self.reveal_attribute(attr)
+        if item is not None:
+            self.tree.selection_set(item)
+            self.tree.see(item)
     
     def filter_tree_items(self):
         """Filter tree items based on search text"""
-        search_text = self.search_var.get().lower()
-        if not search_text:
-            # Show all items
-            for item in self.tree.get_children():
-                self.show_tree_item(item, True)
-        else:
-            # Filter items
-            for item in self.tree.get_children():
-                self.filter_tree_item(item, search_text)
-    
-    def filter_tree_item(self, item, search_text):
-        """Recursively filter tree items"""
-        item_text = self.tree.item(item, "text").lower()
-        item_value = self.tree.item(item, "values")
-        item_value_text = item_value[0].lower() if item_value else ""
-        
-        # Check if item matches search
-        matches = search_text in item_text or search_text in item_value_text
-        
-        # Check children
-        children = self.tree.get_children(item)
-        child_matches = False
-        for child in children:
-            if self.filter_tree_item(child, search_text):
-                child_matches = True
-        
-        # Show item if it matches or has matching children
-        show_item = matches or child_matches
-        self.show_tree_item(item, show_item)
+        self._search_after_id = None
+        if not self.tree_layout:
+            return
         
-        if show_item and child_matches:
-            self.tree.item(item, open=True)
+        # The all-files search lists its hits separately and leaves the track unfiltered
+        query = "" if self.global_search_var.get() else self.search_var.get()
+        self.apply_tree_filter(self.search_index.search(query))
+    
+    def refilter(self):
+        """Re-apply the current track filter after rows were added"""
+        if self.search_var.get() and not self.global_search_var.get():
+            self.filter_tree_items()
+    
+    def apply_tree_filter(self, matches):
+        """Show only the given row indexes (None shows every row), touching only rows whose visibility changed"""
+        searching = matches is not None
+        
+        category_position = 0
+        for node in self.tree_layout:
+            if searching:
+                # Matching rows that haven't been inserted yet are inserted now
+                hits = [row for row in range(node.start, node.start + len(node.rows)) if row in matches]
+                if hits:
+                    self.expand_category(node)
+                    self.insert_rows(node, hits[-1] - node.start + 1)
+            
+            position = 0
+            for offset, item in enumerate(node.items):
+                row = node.start + offset
+                visible = not searching or row in matches
+                if visible != (row in self.visible_rows):
+                    if visible:
+                        self.tree.reattach(item, node.item, position)
+                        self.visible_rows.add(row)
+                    else:
+                        self.tree.detach(item)
+                        self.visible_rows.discard(row)
+                if visible:
+                    position += 1
+            
+            # While searching, show a category only if some of its attributes match
+            if position or not searching:
+                if node.item not in self.visible_categories:
+                    self.tree.reattach(node.item, "", category_position)
+                    self.visible_categories.add(node.item)
+                if searching:
+                    self.tree.item(node.item, open=True)
+                category_position += 1
+            elif node.item in self.visible_categories:
+                self.tree.detach(node.item)
+                self.visible_categories.discard(node.item)
+    
+    def expand_category(self, node):
+        """Insert the first page of a category's rows if it has none yet"""
+        if node.expanded:
+            return
+        node.expanded = True
+        self.insert_rows(node, TREE_PAGE_SIZE)
+    
+    def insert_rows(self, node, count):
+        """Insert a category's rows up to count, after the rows it already shows"""
+        count = min(count, len(node.rows))
+        if count > len(node.items):
+            position = self.tree.index(node.more_item) if node.more_item is not None else "end"
+            for offset in range(len(node.items), count):
+                row = node.rows[offset]
+                item = self.tree.insert(node.item, position, text=row.labels[self.current_language],
+                                        values=(row.formatted,))
+                node.items.append(item)
+                self.row_values[item] = row.formatted
+                self.visible_rows.add(node.start + offset)
+                if position != "end":
+                    position += 1
+        self.update_more_item(node)
+    
+    def update_more_item(self, node):
+        """Create, relabel or remove the placeholder for a category's rows not yet inserted"""
+        remaining = len(node.rows) - len(node.items)
+        if not remaining:
+            if node.more_item is not None:
+                self.tree.delete(node.more_item)
+                node.more_item = None
+            return
         
+        # An unopened category only needs a child so that it can be expanded
+        text = get_ui_text('more_rows', self.current_language).format(count=remaining) if node.expanded else ""
+        if node.more_item is None:
+            node.more_item = self.tree.insert(node.item, "end", text=text, values=("",))
+        else:
+            self.tree.item(node.more_item, text=text)
+    
+    def on_tree_open(self, event=None):
+        """Insert the rows of a category the first time it is opened"""
+        node = self.category_nodes.get(self.tree.focus())
+        if node is not None and not node.expanded:
+            self.expand_category(node)
+            self.refilter()
+    
+    def on_tree_scroll(self, first, last):
+        """Update the scrollbar and load the next page of any category scrolled to its end"""
+        self.tree_scrollbar.set(first, last)
+        if self._page_after_id is None and any(node.expanded and node.more_item is not None
+                                               for node in self.tree_layout):
+            self._page_after_id = self.root.after_idle(self.load_visible_pages)
+    
+    def load_visible_pages(self):
+        """Insert another page into each category whose placeholder row is on screen"""
+        self._page_after_id = None
+        loaded = False
+        for node in self.tree_layout:
+            if node.expanded and node.more_item is not None and self.tree.bbox(node.more_item):
+                self.insert_rows(node, len(node.items) + TREE_PAGE_SIZE)
+                loaded = True
+        if loaded:
+            self.refilter()
+    
+    def reveal_attribute(self, attr):
+        """Get the tree item of an attribute of the displayed track, inserting and opening it if needed"""
+        location = self.attribute_rows.get(attr)
+        if location is None:
+            return None
+        node, offset = location
+        self.expand_category(node)
+        self.insert_rows(node, offset + 1)
+        self.tree.item(node.item, open=True)
+        return node.items[offset]
+    
     def show_welcome_message(self):
         """Show welcome message in the treeview"""
         # Clear the tree
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self.clear_tree()
         
         # Add welcome items
         welcome_node = self.tree.insert("", "end", text=get_ui_text('welcome_title', self.current_language), values=("",), open=True)
@@ -308,29 +679,119 @@ class MediaInfoViewer:
         formats_node = self.tree.insert(welcome_node, "end", text=get_ui_text('supported_formats', self.current_language), values=("",))
     
     def load_file(self, file_path):
+        self.add_tab(file_path)
+        
+        # Recently viewed and prefetched files are already parsed
+        entry = self.media_store.get(file_path)
+        prefetched = self.prefetcher.take(file_path) if entry is None else None
+        if entry is not None or prefetched is not None:
+            self.load_scheduler.cancel_pending()
+            self.partial_file = None
+            if prefetched is not None:
+                self.on_file_loaded(file_path, *prefetched)
+            else:
+                self.show_media(file_path, *entry)
+            self.update_status(self.loaded_message(file_path))
+            self.prefetcher.schedule(file_path, skip=self.media_store)
+            return
+        
         # Update status
         self.update_status(get_ui_text('loading', self.current_language))
         self.file_path_label.configure(text=os.path.basename(file_path))
         
-        # Load media info in separate thread to keep UI responsive
-        def load_thread():
-            try:
-                self.media_info = MediaInfo.parse(file_path)
-                self.root.after(0, self.display_media_info)
-                self.root.after(0, lambda: self.update_status(get_ui_text('file_loaded', self.current_language)))
-                self.root.after(0, lambda: self.export_button.configure(state="normal"))
-            except Exception as e:
-                self.root.after(0, lambda: self.show_error(f"Error loading file: {str(e)}"))
-                self.root.after(0, lambda: self.update_status(get_ui_text('error_loading', self.current_language)))
-        
-        threading.Thread(target=load_thread, daemon=True).start()
+        # Parse on the bounded load pool; a newer load supersedes this one
+        self.load_scheduler.submit(
+            self.parse_file, file_path,
+            callback=self.on_load_finished,
+            partial_callback=self.on_load_progress
+        )
+        # Waits for this load to finish before parsing anything
+        self.prefetcher.schedule(file_path, skip=self.media_store)
     
-    def show_tree_item(self, item, show):
-        """Show or hide a tree item"""
-        if show:
-            self.tree.reattach(item, self.tree.parent(item), self.tree.index(item))
-        else:
-            self.tree.detach(item)
+    def parse_file(self, file_path, report=None):
+        """Parse a file and build its track views (runs on a load worker)
+
+        A prefetch of the file that is already under way is joined instead
+        of parsing the file a second time.
+        """
+        prefetched = self.prefetcher.take(file_path, wait=True)
+        if prefetched is not None:
+            return (file_path, *prefetched)
+        return (file_path, *self.parse_media(file_path, report))
+    
+    def parse_media(self, file_path, report=None):
+        """Parse a file into (MediaInfo, track views); also the prefetcher's parse
+
+        Large files are first given a quick pass whose result is passed to
+        report so the track list can be shown while the full analysis runs.
+        """
+        from parse_cache import load_media
+        
+        def on_quick(media_info):
+            report((file_path, media_info, build_media_view(media_info)))
+        
+        def on_read(bytes_read, file_size):
+            self.read_stats[file_path] = (bytes_read, file_size)
+        
+        media_info = load_media(
+            file_path, self.parse_cache,
+            quick_threshold=self.quick_parse_threshold,
+            on_quick=on_quick if report is not None else None,
+            checksums=self.checksums,
+            read_window=self.read_window,
+            on_read=on_read
+        )
+        return media_info, build_media_view(media_info)
+    
+    def on_load_progress(self, generation, result):
+        """Show the quick-pass result of a large file while its full analysis continues"""
+        def deliver():
+            if not self.load_scheduler.is_current(generation):
+                return
+            self.show_media(*result)
+            self.partial_file = result[0]
+            self.update_status(get_ui_text('loading_full', self.current_language))
+        
+        self.root.after(0, deliver)
+    
+    def on_load_finished(self, generation, result, error):
+        """Hand a finished load to the UI thread unless a newer load superseded it"""
+        def deliver():
+            self.update_cache_status()
+            if not self.load_scheduler.is_current(generation):
+                return
+            partial_file, self.partial_file = self.partial_file, None
+            if error is not None:
+                self.show_error(f"Error loading file: {str(error)}")
+                self.update_status(get_ui_text('error_loading', self.current_language))
+                return
+            
+            if partial_file is not None and partial_file == self.file_path == result[0]:
+                self.refresh_media(*result)
+            else:
+                self.on_file_loaded(*result)
+            self.update_status(self.loaded_message(result[0]))
+            self.export_button.configure(state="normal")
+        
+        self.root.after(0, deliver)
+    
+    def loaded_message(self, file_path):
+        """Status text for a loaded file, with the bytes read if its parse was measured"""
+        stats = self.read_stats.pop(file_path, None)
+        if stats is None:
+            return get_ui_text('file_loaded', self.current_language)
+        return get_ui_text('file_loaded_read', self.current_language).format(
+            read=format_value('file_size', stats[0]), size=format_value('file_size', stats[1])
+        )
+    
+    def open_paths(self, paths):
+        """Bring the window to the front and load paths handed over by another launch"""
+        self.root.deiconify()
+        self.root.lift()
+        self.root.focus_force()
+        for file_path in paths:
+            if os.path.exists(file_path):
+                self.load_file(file_path)
     
     def open_file(self):
         file_types = [
@@ -349,316 +810,293 @@ class MediaInfoViewer:
         if filename:
             self.load_file(filename)
     
-    def load_file(self, file_path):
-        # Update status
-        self.update_status("Loading file...")
+    def remember_file(self, file_path, media_info, track_views):
+        """Keep a fully parsed file in memory and in the all-files search index"""
+        self.media_store.put(file_path, (media_info, track_views), estimate_size(track_views))
+        self.global_index.add_file(file_path, track_views, name_translations=[
+            functools.partial(get_attribute_name, language=language)
+            for language in get_available_languages()
+        ])
+    
+    def on_file_loaded(self, file_path, media_info, track_views):
+        """Display a freshly parsed file and refresh any all-files search results"""
+        self.remember_file(file_path, media_info, track_views)
+        
+        jump, self.pending_jump = self.pending_jump, None
+        if jump is not None and jump.file_path == file_path and jump.track_index < len(track_views):
+            self.show_media(file_path, media_info, track_views, jump.track_index)
+            self.jump_to_attribute(jump.attr)
+        else:
+            self.show_media(file_path, media_info, track_views)
+        if self.global_search_var.get():
+            self.run_global_search()
+    
+    def show_media(self, file_path, media_info, track_views, track_index=0):
+        """Make a parsed file the displayed one"""
+        self.file_path = file_path
+        self.media_info = media_info
+        self.track_views = track_views
         self.file_path_label.configure(text=os.path.basename(file_path))
+        self.select_tab(file_path)
+        self.export_button.configure(state="normal")
+        self.display_media_info(track_index)
+    
+    def refresh_media(self, file_path, media_info, track_views):
+        """Replace the displayed quick-pass result with the full analysis, updating widgets in place"""
+        self.remember_file(file_path, media_info, track_views)
+        self.media_info = media_info
+        
+        track_index = self.current_track_data.index if self.current_track_data is not None else 0
+        if len(track_views) != len(self.track_views) or track_index >= len(track_views):
+            self.track_views = track_views
+            self.display_media_info(min(track_index, len(track_views) - 1))
+        else:
+            self.track_views = track_views
+            self.track_list.relabel([self.track_label(view) for view in track_views])
+            self.current_track_data = track_views[track_index]
+            self.sync_track_tree(self.current_track_data)
         
-        # Load media info in separate thread to keep UI responsive
-        def load_thread():
-            try:
-                self.media_info = MediaInfo.parse(file_path)
-                self.root.after(0, self.display_media_info)
-                self.root.after(0, lambda: self.update_status("File loaded successfully"))
-                self.root.after(0, lambda: self.export_button.configure(state="normal"))
-            except Exception as e:
-                self.root.after(0, lambda: self.show_error(f"Error loading file: {str(e)}"))
-                self.root.after(0, lambda: self.update_status("Error loading file"))
-        
-    def display_media_info(self):
-        # Clear previous track buttons
-        for widget in self.track_frame.winfo_children():
-            widget.destroy()
-        
+        if self.global_search_var.get():
+            self.run_global_search()
+    
+    def add_tab(self, file_path):
+        """Open a tab for a file unless it already has one"""
+        if file_path not in self.tabs:
+            self.tabs.append(file_path)
+            self.refresh_tabs()
+        self.select_tab(file_path)
+    
+    def refresh_tabs(self):
+        """Rebuild the tab bar labels, numbering files that share a name"""
+        self.tab_paths = {}
+        for path in self.tabs:
+            name = label = os.path.basename(path)
+            number = 2
+            while label in self.tab_paths:
+                label = f"{name} ({number})"
+                number += 1
+            self.tab_paths[label] = path
+        self.tab_bar.configure(values=list(self.tab_paths))
+        if self.tabs:
+            self.tab_frame.grid()
+        else:
+            self.tab_frame.grid_remove()
+    
+    def select_tab(self, file_path):
+        for label, path in self.tab_paths.items():
+            if path == file_path:
+                self.tab_bar.set(label)
+                return
+    
+    def on_tab_select(self, label):
+        """Switch to another open file, parsing it only if it was evicted from memory"""
+        file_path = self.tab_paths.get(label)
+        if file_path is not None and file_path != self.file_path:
+            self.load_file(file_path)
+    
+    def close_current_tab(self):
+        """Close the displayed file and switch to a neighbouring tab"""
+        file_path = self.file_path
+        if file_path not in self.tabs:
+            return
+        position = self.tabs.index(file_path)
+        self.tabs.remove(file_path)
+        self.media_store.pop(file_path)
+        self.global_index.remove_file(file_path)
+        self.refresh_tabs()
+        if self.global_search_var.get():
+            self.run_global_search()
+        
+        if self.tabs:
+            self.load_file(self.tabs[min(position, len(self.tabs) - 1)])
+        else:
+            self.load_scheduler.cancel_pending()
+            self.partial_file = None
+            self.file_path = None
+            self.media_info = None
+            self.track_views = []
+            self.current_track_data = None
+            self.track_list.set_tracks([])
+            self.file_path_label.configure(text=get_ui_text('no_file_selected', self.current_language))
+            self.content_title.configure(text=get_ui_text('media_information', self.current_language))
+            self.export_button.configure(state="disabled")
+            self.show_welcome_message()
+    
+    def track_label(self, view):
+        """Get the sidebar label of a track, e.g. Audio #2 (AAC)"""
+        track_name = get_track_type_name(view.track_type, self.current_language)
+        if view.track_id:
+            track_name += f" #{view.track_id}"
+        if view.format:
+            track_name += f" ({view.format})"
+        return track_name
+    
+    def display_media_info(self, track_index=0):
         if not self.media_info:
+            self.track_list.set_tracks([])
             return
         
-        # Create track buttons
-        self.track_buttons = []
-        for i, track in enumerate(self.media_info.tracks):
-            track_type = track.track_type or "Unknown"
-            if self.current_language == 'zh':
-                type_map = {
-                    'General': '常规',
-                    'Video': '视频', 
-                    'Audio': '音频',
-                    'Text': '文本',
-                    'Image': '图像',
-                    'Menu': '菜单'
-                }
-                track_type = type_map.get(track_type, track_type)
-            
-            track_name = f"{track_type}"
-            
-            if track.track_id:
-                track_name += f" #{track.track_id}"
-            
-            if hasattr(track, 'format') and track.format:
-                track_name += f" ({track.format})"
-            
-            button = ctk.CTkButton(
-                self.track_frame,
-                text=track_name,
-                command=lambda idx=i: self.show_track_info(idx),
-                height=40,
-                anchor="w"
-            )
-            button.pack(fill="x", pady=5)
-            self.track_buttons.append(button)
+        self.track_list.set_tracks([self.track_label(view) for view in self.track_views])
         
         # Show general info by default
-        if self.media_info.tracks:
-            self.show_track_info(0)
+        if self.track_views:
+            self.show_track_info(track_index)
     
     def show_track_info(self, track_index):
-        if not self.media_info or track_index >= len(self.media_info.tracks):
+        if not self.media_info or track_index >= len(self.track_views):
             return
         
-        track = self.media_info.tracks[track_index]
-        self.current_track_data = track
+        view = self.track_views[track_index]
+        self.current_track_data = view
+        self.track_list.select(track_index)
         
         # Clear the tree
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self.clear_tree()
         
         # Populate tree with track information
-        self.populate_track_tree(track)
-        
-        # Update title
-        track_type = track.track_type or "Unknown"
-        if self.current_language == 'zh':
-            type_map = {
-                'General': '常规',
-                'Video': '视频',
-                'Audio': '音频', 
-                'Text': '文本',
-                'Image': '图像',
-                'Menu': '菜单'
-            }
-            track_type = type_map.get(track_type, track_type)
-        
+        self.sync_track_tree(view)
+        self.update_track_title()
+    
+    def update_track_title(self):
+        """Show the type of the displayed track above the tree"""
+        track_type = get_track_type_name(self.current_track_data.track_type, self.current_language)
         title_text = f"📄 {track_type} " + ("轨道信息" if self.current_language == 'zh' else "Track Information")
         self.content_title.configure(text=title_text)
     
-    def populate_track_tree(self, track):
-        """Populate the tree with track information in a structured way"""
-        track_type = track.track_type or "Unknown"
-        
-        # Organize attributes by category
-        categories = {
-            "Basic Information": [
-                "format", "format_profile", "codec_id", "duration", "file_size",
-                "overall_bit_rate", "track_id", "stream_identifier"
-            ],
-            "Video Properties": [
-                "width", "height", "display_aspect_ratio", "frame_rate", "bit_rate",
-                "bit_depth", "chroma_subsampling", "color_space", "scan_type", "pixel_aspect_ratio"
-            ],
-            "Audio Properties": [
-                "channel_s", "sampling_rate", "bit_rate", "compression_mode",
-                "channel_layout", "bit_depth", "channel_positions"
-            ],
-            "Technical Details": [
-                "writing_library", "encoded_date", "tagged_date", "color_primaries",
-                "transfer_characteristics", "matrix_coefficients", "commercial_name", "internet_media_type"
-            ],
-            "Metadata": [
-                "title", "performer", "album", "track_name", "artist", "genre",
-                "recorded_date", "copyright", "comment"
-            ]
-        }
-        
-        # Display relevant categories based on track type
-        relevant_categories = ["Basic Information"]
-        if track_type.lower() == "video":
-            relevant_categories.extend(["Video Properties", "Technical Details"])
-        elif track_type.lower() == "audio":
-            relevant_categories.extend(["Audio Properties", "Metadata"])
-        else:
-            relevant_categories.extend(["Technical Details", "Metadata"])
-        
-        # Add categories as tree nodes
-        for category in relevant_categories:
-            category_items = []
-            for attr in categories[category]:
-                value = getattr(track, attr, None)
-                if value is not None and str(value).strip():
-                    category_items.append((attr, value))
-            
-            if category_items:
-                # Translate category name
-                category_name = get_category_name(category, self.current_language)
-                category_node = self.tree.insert("", "end", text=f"📋 {category_name}", values=("",), open=True)
-                
-                for attr, value in category_items:
-                    # Format the attribute name and value
-                    display_name = get_attribute_name(attr, self.current_language)
-                    formatted_value = self.format_value(attr, value)
-                    self.tree.insert(category_node, "end", text=display_name, values=(formatted_value,))
-        
-        # Add other properties not in categories
-        other_attrs = []
-        for attr_name in dir(track):
-            if (not attr_name.startswith('_') and 
-                not callable(getattr(track, attr_name)) and
-                attr_name not in [item for sublist in categories.values() for item in sublist]):
-                
-                value = getattr(track, attr_name)
-                if value is not None and str(value).strip():
-                    other_attrs.append((attr_name, value))
-        
-        if other_attrs:
-            other_category = get_category_name("Other Properties", self.current_language)
-            other_node = self.tree.insert("", "end", text=f"📋 {other_category}", values=("",), open=False)
+    def clear_tree(self):
+        """Remove every item from the tree, including items hidden by the search"""
+        attribute_items = [item for node in self.tree_layout for item in node.items]
+        attribute_items += [node.more_item for node in self.tree_layout if node.more_item is not None]
+        if attribute_items:
+            self.tree.delete(*attribute_items)
+        if self.tree_layout:
+            self.tree.delete(*[node.item for node in self.tree_layout])
+        self.tree_layout = []
+        self.category_nodes = {}
+        self.attribute_rows = {}
+        self.row_values = {}
+        self.visible_rows = set()
+        self.visible_categories = set()
+        self.search_index = TrackSearchIndex()
+        self.tree.delete(*self.tree.get_children())
+    
+    def sync_children(self, parent, old_items, new_keys, insert):
+        """Reorder, insert and delete parent's children so they match new_keys
+
+        old_items maps keys to the current child items in display order. Items
+        whose key survives are kept as they are, so their selection and open
+        state persist; insert(key, index) creates items for new keys.
+        Returns the child items in new_keys order.
+        """
+        wanted = set(new_keys)
+        stale = [item for key, item in old_items.items() if key not in wanted]
+        if stale:
+            self.tree.delete(*stale)
+        
+        # Surviving items keep their relative order unless the new order differs
+        survivors = [key for key in old_items if key in wanted]
+        next_survivor = 0
+        items = []
+        for position, key in enumerate(new_keys):
+            item = old_items.get(key)
+            if item is None:
+                item = insert(key, position)
+            elif next_survivor < len(survivors) and survivors[next_survivor] == key:
+                next_survivor += 1
+            else:
+                self.tree.move(item, parent, position)
+                survivors.remove(key)
+            items.append(item)
+        return items
+    
+    def sync_track_tree(self, view):
+        """Populate the tree with track information in a structured way
+
+        Only the first page of each open category is inserted; closed
+        categories get their rows when first opened. When the tree already
+        shows a version of the same track (e.g. the quick pass of a large
+        file), rows are diffed in place instead of rebuilt, so the update
+        neither flickers nor loses the selection.
+        """
+        # Bring back rows hidden by the search so child indexes are plain positions
+        self.apply_tree_filter(None)
+        
+        groups = view.categories()
+        old_nodes = {node.category: node for node in self.tree_layout}
+        
+        def insert_category(category, position):
+            # Translate category name; "Other Properties" starts collapsed
+            category_name = category_labels(category)[self.current_language]
+            return self.tree.insert("", position, text=f"📋 {category_name}", values=("",),
+                                    open=category != OTHER_CATEGORY)
+        
+        category_items = self.sync_children(
+            "", {node.category: node.item for node in self.tree_layout},
+            [category for category, _ in groups], insert_category
+        )
+        
+        old_values = self.row_values
+        self.tree_layout = []
+        self.category_nodes = {}
+        self.attribute_rows = {}
+        self.row_values = {}
+        self.visible_rows = set()
+        search_entries = []
+        
+        for category_item, (category, rows) in zip(category_items, groups):
+            node = CategoryNode(category, category_item, rows, len(search_entries))
+            old = old_nodes.get(category)
+            if old is not None:
+                node.expanded = old.expanded
+                node.more_item = old.more_item
+                old_items = dict(zip((row.attr for row in old.rows), old.items))
+            else:
+                node.expanded = category != OTHER_CATEGORY
+                old_items = {}
             
-            for attr_name, value in other_attrs:
-                display_name = get_attribute_name(attr_name, self.current_language)
-                formatted_value = self.format_value(attr_name, value)
-    def export_text(self, file_path):
-        with open(file_path, 'w', encoding='utf-8') as f:
-            title = "媒体信息报告" if self.current_language == 'zh' else "MEDIA INFORMATION REPORT"
-            f.write(f"{title}\n")
-            f.write("=" * 60 + "\n\n")
+            # Keep as many rows inserted as before, but at least a page
+            count = min(len(rows), max(len(old_items), TREE_PAGE_SIZE)) if node.expanded else 0
+            by_attr = {row.attr: row for row in rows[:count]}
             
-            for i, track in enumerate(self.media_info.tracks):
-                f.write(self.format_track_info_for_export(track))
-                f.write("\n\n" + "=" * 60 + "\n\n")
-    
-    def format_track_info_for_export(self, track):
-        """Format track information for export (legacy text format)"""
-        info_lines = []
-        track_type = track.track_type or "Unknown"
-        
-        # Header
-        info_lines.append(f"{'='*60}")
-        info_lines.append(f"{track_type.upper()} TRACK INFORMATION")
-        info_lines.append(f"{'='*60}")
-        info_lines.append("")
-        
-        # Organize attributes by category
-        categories = {
-            "Basic Information": [
-                "format", "format_profile", "codec_id", "duration", "file_size",
-                "overall_bit_rate", "track_id", "stream_identifier"
-            ],
-            "Video Properties": [
-                "width", "height", "display_aspect_ratio", "frame_rate", "bit_rate",
-                "bit_depth", "chroma_subsampling", "color_space", "scan_type"
-            ],
-            "Audio Properties": [
-                "channel_s", "sampling_rate", "bit_rate", "compression_mode",
-                "channel_layout", "bit_depth"
-            ],
-            "Technical Details": [
-                "writing_library", "encoded_date", "tagged_date", "color_primaries",
-                "transfer_characteristics", "matrix_coefficients"
-            ],
-            "Metadata": [
-                "title", "performer", "album", "track_name", "artist", "genre",
-                "recorded_date", "copyright"
-            ]
-        }
-        
-        # Display relevant categories based on track type
-        relevant_categories = ["Basic Information"]
-        if track_type.lower() == "video":
-            relevant_categories.extend(["Video Properties", "Technical Details"])
-        elif track_type.lower() == "audio":
-            relevant_categories.extend(["Audio Properties", "Metadata"])
-        else:
-            relevant_categories.extend(["Technical Details", "Metadata"])
-        # Add categories as tree nodes
-        for category in relevant_categories:
-            category_items = []
-            for attr in categories[category]:
-                value = getattr(track, attr, None)
-                if value is not None and str(value).strip():
-                    category_items.append((attr, value))
+            def insert_row(attr, position, category_item=category_item, by_attr=by_attr):
+                row = by_attr[attr]
+                return self.tree.insert(category_item, position, text=row.labels[self.current_language],
+                                        values=(row.formatted,))
             
-            if category_items:
-                # Translate category name
-                category_name = get_category_name(category, self.current_language)
-                category_node = self.tree.insert("", "end", text=f"📋 {category_name}", values=("",), open=True)
-                
-                for attr, value in category_items:
-                    # Format the attribute name and value
-                    display_name = get_attribute_name(attr, self.current_language)
-                    formatted_value = self.format_value(attr, value)
-                    self.tree.insert(category_node, "end", text=display_name, values=(formatted_value,))
-        
-        # Add other properties not in categories
-        other_attrs = []
-        for attr_name in dir(track):
-            if (not attr_name.startswith('_') and 
-                not callable(getattr(track, attr_name)) and
-                attr_name not in [item for sublist in categories.values() for item in sublist]):
-                
-                value = getattr(track, attr_name)
-                if value is not None and str(value).strip():
-                    other_attrs.append((attr_name, value))
-        
-        if other_attrs:
-            other_category = get_category_name("Other Properties", self.current_language)
-            other_node = self.tree.insert("", "end", text=f"📋 {other_category}", values=("",), open=False)
+            node.items = self.sync_children(category_item, old_items, list(by_attr), insert_row)
+            for offset, item in enumerate(node.items):
+                formatted = rows[offset].formatted
+                if old_values.get(item, formatted) != formatted:
+                    self.tree.item(item, values=(formatted,))
+                self.row_values[item] = formatted
+                self.visible_rows.add(node.start + offset)
+            self.update_more_item(node)
+            if node.more_item is not None:
+                self.tree.move(node.more_item, category_item, "end")
             
-            for attr_name, value in other_attrs:
-                display_name = get_attribute_name(attr_name, self.current_language)
-                formatted_value = self.format_value(attr_name, value)
-                self.tree.insert(other_node, "end", text=display_name, values=(formatted_value,))
+            for offset, row in enumerate(rows):
+                self.attribute_rows.setdefault(row.attr, (node, offset))
+                # Names in every language are searchable, so a language switch keeps the index valid
+                search_entries.append((*row.labels.values(), row.attr, row.formatted, row.raw))
+            self.tree_layout.append(node)
+            self.category_nodes[category_item] = node
+        
+        self.visible_categories = set(category_items)
+        self.search_index = TrackSearchIndex(search_entries)
+        self.refilter()
     
     def show_error(self, message):
         messagebox.showerror("Error", message)
         # Clear the tree and show error
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        error_node = self.tree.insert("", "end", text="❌ Error", values=(message,))
-    
-    def format_value(self, attr_name, value):
-        """Format values for better display"""
-        if attr_name in ["duration"]:
-            # Convert milliseconds to readable format
-            try:
-                ms = int(float(value))
-                seconds = ms // 1000
-                hours = seconds // 3600
-                minutes = (seconds % 3600) // 60
-                secs = seconds % 60
-                if hours > 0:
-                    return f"{hours:02d}:{minutes:02d}:{secs:02d}"
-                else:
-                    return f"{minutes:02d}:{secs:02d}"
-            except:
-                return str(value)
-        elif attr_name in ["file_size", "stream_size"]:
-            # Format file size
-            try:
-                size = int(float(value))
-                for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-                    if size < 1024.0:
-                        return f"{size:.1f} {unit}"
-                    size /= 1024.0
-                return f"{size:.1f} PB"
-            except:
-                return str(value)
-        elif attr_name in ["bit_rate", "overall_bit_rate", "maximum_bit_rate"]:
-            # Format bit rate
-            try:
-                bitrate = int(float(value))
-                if bitrate >= 1000000:
-                    return f"{bitrate/1000000:.1f} Mbps"
-                elif bitrate >= 1000:
-                    return f"{bitrate/1000:.1f} kbps"
-                else:
-                    return f"{bitrate} bps"
-            except:
-                return str(value)
-        
-        return str(value)
+        self.clear_tree()
+        self.tree.insert("", "end", text="❌ Error", values=(message,))
     
     def export_info(self):
         if not self.media_info:
             messagebox.showwarning("Warning", "No media information to export")
             return
+        if self.export_cancel is not None:
+            return
         
         file_path = filedialog.asksaveasfilename(
             title="Export Media Information",
@@ -666,62 +1104,212 @@ class MediaInfoViewer:
             filetypes=[
                 ("Text Files", "*.txt"),
                 ("JSON Files", "*.json"),
+                ("NDJSON Files", "*.ndjson *.jsonl"),
                 ("All Files", "*.*")
             ]
         )
+        if not file_path:
+            return
         
-        if file_path:
+        # Every open file that is still in memory
+        resident = [(path, entry[1]) for path in self.tabs
+                    for entry in [self.media_store.peek(path)] if entry is not None]
+        files = [(self.file_path, self.track_views)]
+        if len(resident) > 1 and messagebox.askyesno(
+            "Export", get_ui_text('export_all_files', self.current_language).format(count=len(resident))
+        ):
+            files = resident
+        self.start_export(files, file_path)
+    
+    def start_export(self, files, file_path):
+        """Stream an export to disk on a worker thread, reporting progress in the status bar"""
+        from exporters import export_to_file
+        
+        cancel = threading.Event()
+        self.export_cancel = cancel
+        self.export_button.configure(state="disabled")
+        self.cancel_export_button.pack(side="left", padx=5, pady=3)
+        self.update_export_progress(0, 1)
+        
+        language = self.current_language
+        last_report = [0.0]
+        
+        def progress(done, total):
+            # At most ten status updates a second reach the Tk thread
+            now = time.perf_counter()
+            if done == total or now - last_report[0] >= 0.1:
+                last_report[0] = now
+                self.root.after(0, self.update_export_progress, done, total)
+        
+        def run():
+            error = None
             try:
-                if file_path.endswith('.json'):
-                    self.export_json(file_path)
-                else:
-                    self.export_text(file_path)
-                
-                messagebox.showinfo("Success", f"Information exported to {file_path}")
-                self.update_status(f"Exported to {os.path.basename(file_path)}")
+                export_to_file(files, file_path, language=language, progress=progress, cancelled=cancel.is_set)
             except Exception as e:
-                messagebox.showerror("Error", f"Failed to export: {str(e)}")
+                error = e
+            self.root.after(0, self.on_export_finished, file_path, error)
+        
+        threading.Thread(target=run, name='mediainfo-export', daemon=True).start()
     
-    def export_text(self, file_path):
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write("MEDIA INFORMATION REPORT\n")
-            f.write("=" * 60 + "\n\n")
-            
-            for i, track in enumerate(self.media_info.tracks):
-                f.write(self.format_track_info(track))
-                f.write("\n\n" + "=" * 60 + "\n\n")
-    
-    def export_json(self, file_path):
-        data = []
-        for track in self.media_info.tracks:
-            track_data = {}
-            for attr_name in dir(track):
-                if (not attr_name.startswith('_') and 
-                    not callable(getattr(track, attr_name))):
-                    value = getattr(track, attr_name)
-                    if value is not None:
-                        track_data[attr_name] = str(value)
-            data.append(track_data)
-        
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+    def update_export_progress(self, done, total):
+        if self.export_cancel is None:
+            return
+        percent = done * 100 // total if total else 100
+        self.update_status(get_ui_text('exporting', self.current_language).format(percent=percent))
     
-    def show_error(self, message):
-        messagebox.showerror("Error", message)
-        self.info_textbox.configure(state="normal")
-        self.info_textbox.delete("1.0", tk.END)
-        self.info_textbox.insert("1.0", f"❌ Error: {message}")
-        self.info_textbox.configure(state="disabled")
+    def cancel_export(self):
+        if self.export_cancel is not None:
+            self.export_cancel.set()
+    
+    def on_export_finished(self, file_path, error):
+        """Report the outcome of a background export"""
+        from exporters import ExportCancelled
+        
+        self.export_cancel = None
+        self.cancel_export_button.pack_forget()
+        self.export_button.configure(state="normal")
+        
+        if isinstance(error, ExportCancelled):
+            self.update_status(get_ui_text('export_cancelled', self.current_language))
+        elif error is not None:
+            self.update_status(get_ui_text('ready', self.current_language))
+            messagebox.showerror("Error", f"Failed to export: {str(error)}")
+        else:
+            self.update_status(f"Exported to {os.path.basename(file_path)}")
+            messagebox.showinfo("Success", f"Information exported to {file_path}")
     
     def update_status(self, message):
         self.status_label.configure(text=message)
     
-    def run(self):
+    def update_cache_status(self):
+        """Show parse cache hit/miss counters in the status bar"""
+        if self.parse_cache is None:
+            text = get_ui_text('cache_disabled', self.current_language)
+        else:
+            text = get_ui_text('cache_stats', self.current_language).format(
+                hits=self.parse_cache.hits, misses=self.parse_cache.misses
+            )
+        self.cache_label.configure(text=text)
+    
+    def update_load_status(self):
+        """Show the load queue depth and number of parses in flight in the status bar"""
+        queued, in_flight = self.load_scheduler.stats()
+        self.load_label.configure(text=get_ui_text('load_stats', self.current_language).format(
+            queued=queued, in_flight=in_flight
+        ))
+    
+    def run(self, startup_profile=False):
+        if startup_profile:
+            def report():
+                STARTUP_TIMINGS.append(("time to mainloop", time.perf_counter() - _MODULE_LOAD_START))
+                print_startup_profile()
+            self.root.after_idle(report)
         self.root.mainloop()
 
-def main():
-    app = MediaInfoViewer()
-    app.run()
+def parse_args(argv=None):
+    import argparse
+    
+    from file_readers import DEFAULT_HEAD_SIZE, DEFAULT_TAIL_SIZE, parse_read_window
+    
+    parser = argparse.ArgumentParser(description="Modern MediaInfo Viewer")
+    parser.add_argument("files", nargs="*", metavar="file", help="media file(s) to open")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="always run libmediainfo instead of using the parse cache")
+    parser.add_argument("--cache-size", type=int, default=None,
+                        metavar="MB", help="maximum size of the parse cache in megabytes (default: 256)")
+    parser.add_argument("--quick-parse-threshold", type=int, default=None, metavar="MB",
+                        help="show a quick low-ParseSpeed pass first for files at least this big "
+                             "(default: 1024; negative disables)")
+    parser.add_argument("--memory-budget", type=int, default=None, metavar="MB",
+                        help="memory budget for parsed files kept open in tabs (default: 256)")
+    parser.add_argument("--checksums", action="store_true",
+                        help="compute MD5 and SHA-256 checksums in the same read as the analysis")
+    parser.add_argument("--bounded-read", action="store_true",
+                        help="serve libmediainfo from head and tail windows, for slow or remote storage")
+    parser.add_argument("--read-window", type=parse_read_window, default=None, metavar="HEAD[,TAIL]",
+                        help=f"head and tail window sizes in MB for --bounded-read "
+                             f"(default: {DEFAULT_HEAD_SIZE >> 20},{DEFAULT_TAIL_SIZE >> 20})")
+    parser.add_argument("--prefetch", type=int, default=DEFAULT_PREFETCH_COUNT, metavar="N",
+                        help=f"parse the next N files in the folder of each opened file in the background "
+                             f"(default: {DEFAULT_PREFETCH_COUNT}; 0 disables)")
+    parser.add_argument("--prefetch-order", choices=PREFETCH_ORDERS, default="name",
+                        help="order of the files prefetched after an opened file (default: name)")
+    parser.add_argument("--new-instance", action="store_true",
+                        help="always open a new window instead of reusing a running viewer")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="print import and window construction timings to stderr")
+    return parser.parse_args(argv)
+
+def read_window_arg(args):
+    """Get the (head, tail) window for --bounded-read, or None when reading normally"""
+    from file_readers import DEFAULT_HEAD_SIZE, DEFAULT_TAIL_SIZE
+    
+    if not args.bounded_read:
+        return None
+    return args.read_window or (DEFAULT_HEAD_SIZE, DEFAULT_TAIL_SIZE)
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    
+    # Headless subcommands, e.g. "mediainfo_viewer.py scan /media/library"
+    if argv and argv[0] in ("scan", "pipeline", "duplicates", "index", "update", "query"):
+        from scanner import main as cli_main
+        return cli_main(argv)
+    
+    args = parse_args(argv)
+    
+    # Hand the files to an already running viewer and exit
+    use_single_instance = not args.new_instance and single_instance.is_supported()
+    if use_single_instance and single_instance.forward_paths(args.files):
+        return 0
+    
+    STARTUP_TIMINGS.append(("module load and argument parsing", time.perf_counter() - _MODULE_LOAD_START))
+    
+    parse_cache_module = timed_import('parse_cache')
+    parse_cache = None
+    if not args.no_cache:
+        try:
+            max_bytes = parse_cache_module.DEFAULT_MAX_BYTES
+            if args.cache_size is not None:
+                max_bytes = args.cache_size * 1024 * 1024
+            parse_cache = parse_cache_module.ParseCache(max_bytes=max_bytes)
+        except Exception as e:
+            print(f"Parse cache unavailable: {e}", file=sys.stderr)
+    
+    if args.quick_parse_threshold is None:
+        quick_parse_threshold = parse_cache_module.QUICK_PARSE_THRESHOLD
+    elif args.quick_parse_threshold >= 0:
+        quick_parse_threshold = args.quick_parse_threshold * 1024 * 1024
+    else:
+        quick_parse_threshold = None
+    
+    load_gui_modules()
+    start = time.perf_counter()
+    memory_budget = args.memory_budget * 1024 * 1024 if args.memory_budget is not None else None
+    app = MediaInfoViewer(parse_cache=parse_cache, quick_parse_threshold=quick_parse_threshold,
+                          memory_budget=memory_budget, prefetch_count=args.prefetch,
+                          prefetch_order=args.prefetch_order,
+                          checksums=parse_cache_module.CHECKSUM_ALGORITHMS if args.checksums else (),
+                          read_window=read_window_arg(args))
+    STARTUP_TIMINGS.append(("window construction", time.perf_counter() - start))
+    app.open_paths(args.files)
+    
+    server = None
+    if use_single_instance:
+        server = single_instance.InstanceServer(
+            lambda paths: app.root.after(0, lambda: app.open_paths(paths))
+        )
+        if not server.start():
+            server = None
+    
+    try:
+        app.run(startup_profile=args.startup_profile)
+    finally:
+        app.load_scheduler.shutdown()
+        app.prefetcher.close()
+        if server is not None:
+            server.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
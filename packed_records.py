@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Compact transfer of scan records from parser processes for MediaInfo Viewer
+Workers serialise their records to JSON themselves and hand a whole batch back
+as one bytes object, so the parent pays for a single memory copy instead of
+unpickling every attribute dict, writes NDJSON lines straight through, and
+only decodes a record when something actually reads from it
+"""
+
+import json
+import struct
+from collections.abc import Mapping
+
+# Batch layout: record count, then (length, flags) per record, then the JSON texts
+_COUNT = struct.Struct('<I')
+_ENTRY = struct.Struct('<IB')
+
+# Record flags
+FLAG_ERROR = 0x01
+
+
+def pack_records(records):
+    """Pack record dicts into one bytes object"""
+    entries = []
+    texts = []
+    for record in records:
+        text = json.dumps(record, ensure_ascii=False).encode('utf-8')
+        entries.append(_ENTRY.pack(len(text), FLAG_ERROR if 'error' in record else 0))
+        texts.append(text)
+    return b''.join([_COUNT.pack(len(texts)), *entries, *texts])
+
+
+def unpack_records(data):
+    """Split a packed batch into PackedRecords without decoding any of them"""
+    view = memoryview(data)
+    count, = _COUNT.unpack_from(view)
+    offset = _COUNT.size + count * _ENTRY.size
+    records = []
+    for length, flags in _ENTRY.iter_unpack(view[_COUNT.size:offset]):
+        records.append(PackedRecord(view[offset:offset + length], flags))
+        offset += length
+    return records
+
+
+class PackedRecord(Mapping):
+    """A scan record kept as its JSON text until a field is read
+
+    Checking for 'error' or 'tracks' is answered from the batch flags, so
+    counting failures or skipping them never decodes anything.
+    """
+    __slots__ = ('_text', 'flags', '_record')
+
+    def __init__(self, text, flags=0):
+        self._text = text
+        self.flags = flags
+        self._record = None
+
+    @property
+    def failed(self):
+        return bool(self.flags & FLAG_ERROR)
+
+    @property
+    def text(self):
+        """The record as a JSON string, as written to NDJSON"""
+        if self._text is None:
+            return json.dumps(self._record, ensure_ascii=False)
+        return str(self._text, 'utf-8')
+
+    def _decoded(self):
+        if self._record is None:
+            self._record = json.loads(str(self._text, 'utf-8'))
+            # The batch buffer is no longer needed by this record
+            self._text = None
+        return self._record
+
+    def __contains__(self, key):
+        if key == 'error':
+            return self.failed
+        if key == 'tracks':
+            return not self.failed
+        return key in self._decoded()
+
+    def __getitem__(self, key):
+        return self._decoded()[key]
+
+    def __iter__(self):
+        return iter(self._decoded())
+
+    def __len__(self):
+        return len(self._decoded())
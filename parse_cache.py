@@ -0,0 +1,498 @@
+#!/usr/bin/env python3
+"""
+Persistent parse cache for MediaInfo Viewer
+Stores MediaInfo's XML output in SQLite, keyed by file identity, so that
+re-opening a file that has already been analysed skips libmediainfo entirely
+"""
+
+import hashlib
+import mmap
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+
+# Default size budget for the cache database (compressed XML payload)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# libmediainfo ParseSpeed for the quick first pass over large files
+QUICK_PARSE_SPEED = 0.0
+
+# Files at least this big get a quick pass before the full analysis
+QUICK_PARSE_THRESHOLD = 1024 * 1024 * 1024
+
+# hashlib algorithms computed when checksums are requested
+CHECKSUM_ALGORITHMS = ('md5', 'sha256')
+
+# Content fingerprints hash this many evenly spread windows of this size
+FINGERPRINT_WINDOWS = 4
+FINGERPRINT_WINDOW_SIZE = 64 * 1024
+
+# General track fields that describe where a file is rather than what it contains
+_LOCATION_FIELD = re.compile(
+    r'<(Complete_name|Folder_name|File_name_extension|File_name|File_extension'
+    r'|File_last_modification_date|File_last_modification_date__local_)>[^<]*</\1>'
+)
+
+# Checksum fields added to the General track by parse_media_xml
+_CHECKSUM_FIELD = re.compile(
+    r'<(' + '|'.join(name.upper() for name in CHECKSUM_ALGORITHMS) + r')>[^<]*</\1>\n?'
+)
+
+
+def default_cache_path():
+    """Get the per-user location of the parse cache database"""
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'mediainfo_viewer', 'parse_cache.sqlite3')
+
+
+def file_identity(file_path):
+    """Get the (device, inode, size, mtime_ns) tuple identifying a file's contents"""
+    st = os.stat(file_path)
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def content_fingerprint(file_path):
+    """Get a cheap fingerprint of a file's contents that survives renames and copies
+
+    Hashes the size and a few fixed sample windows (or the whole file if it
+    is small), so files that differ only between the windows collide.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        digest.update(size.to_bytes(8, 'little'))
+        if size <= FINGERPRINT_WINDOWS * FINGERPRINT_WINDOW_SIZE:
+            windows = [(0, size)] if size else []
+        else:
+            step = (size - FINGERPRINT_WINDOW_SIZE) // (FINGERPRINT_WINDOWS - 1)
+            windows = [(i * step, FINGERPRINT_WINDOW_SIZE) for i in range(FINGERPRINT_WINDOWS)]
+
+        try:
+            view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        except (OSError, ValueError):
+            view = None
+        for start, length in windows:
+            if view is not None:
+                digest.update(view[start:start + length])
+            else:
+                f.seek(start)
+                digest.update(f.read(length))
+        if view is not None:
+            view.close()
+    return f"{size:x}-{digest.hexdigest()}"
+
+
+def relocate_xml(xml, file_path):
+    """Point a report's name, folder and modification date fields at file_path
+
+    Reports reused for a moved, renamed or copied file would otherwise show
+    where the file was first parsed.
+    """
+    end = xml.find('</track>')
+    if end < 0:
+        return xml
+    from xml.sax.saxutils import escape
+    folder, name = os.path.split(os.path.abspath(file_path))
+    stem, extension = os.path.splitext(name)
+    mtime = os.stat(file_path).st_mtime
+    values = {
+        'Complete_name': file_path,
+        'Folder_name': folder,
+        'File_name_extension': name,
+        'File_name': stem,
+        'File_extension': extension[1:],
+        'File_last_modification_date': time.strftime('%Y-%m-%d %H:%M:%S UTC', time.gmtime(mtime)),
+        'File_last_modification_date__local_': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(mtime)),
+    }
+    general = _LOCATION_FIELD.sub(
+        lambda match: f'<{match.group(1)}>{escape(values[match.group(1)])}</{match.group(1)}>', xml[:end]
+    )
+    return general + xml[end:]
+
+
+class _OptionsGate:
+    """Lets parses with identical options overlap while keeping different options apart
+
+    libmediainfo shares some options between handles, so parses with
+    different settings (e.g. ParseSpeed) must not run at the same time.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._active_key = None
+        self._active = 0
+
+    @contextmanager
+    def hold(self, key):
+        with self._cond:
+            while self._active and self._active_key != key:
+                self._cond.wait()
+            self._active_key = key
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active -= 1
+                if not self._active:
+                    self._cond.notify_all()
+
+
+_options_gate = _OptionsGate()
+
+
+def parse_media_xml(file_path, checksums=(), read_window=None, on_read=None, **options):
+    """Run libmediainfo on a file and return its raw XML report
+
+    With checksums (hashlib algorithm names), the file is read once through a
+    HashingReader feeding both libmediainfo and the hashes, and the digests
+    are added to the General track, e.g. as its md5 attribute. Otherwise a
+    (head, tail) read_window serves libmediainfo through a HeadTailReader.
+    Either way, on_read(bytes_read, file_size) reports the bytes read.
+    """
+    from pymediainfo import MediaInfo
+    key = tuple(sorted(options.items()))
+    if not checksums and read_window is None:
+        with _options_gate.hold(key):
+            return MediaInfo.parse(file_path, output="OLDXML", **options)
+
+    from file_readers import CHUNK_SIZE, HashingReader, HeadTailReader
+    with open(file_path, 'rb') as f:
+        reader = HashingReader(f, checksums) if checksums else HeadTailReader(f, *read_window)
+        # File_FileName is per handle, but the option reset after the parse is not
+        with _options_gate.hold(key + (('buffered', True),)):
+            xml = MediaInfo.parse(
+                reader, output="OLDXML", buffer_size=CHUNK_SIZE,
+                mediainfo_options={'File_FileName': file_path}, **options
+            )
+        if checksums:
+            digests = reader.finish()
+            xml = add_general_fields(xml, {name.upper(): digest for name, digest in digests.items()})
+        if on_read is not None:
+            on_read(reader.bytes_read, os.fstat(f.fileno()).st_size)
+    return xml
+
+
+def add_general_fields(xml, fields):
+    """Append fields to the General track of a raw XML report"""
+    from xml.sax.saxutils import escape
+    position = xml.find('</track>')
+    if position < 0:
+        return xml
+    elements = ''.join(f'<{tag}>{escape(value)}</{tag}>\n' for tag, value in fields.items())
+    return xml[:position] + elements + xml[position:]
+
+
+def has_checksums(media_info, checksums):
+    """Check whether a parsed report carries all the given checksums"""
+    if not checksums:
+        return True
+    general = media_info.general_tracks[0] if media_info.general_tracks else None
+    return general is not None and all(getattr(general, name, None) for name in checksums)
+
+
+def media_info_from_xml(xml):
+    """Build a MediaInfo object from a raw XML report"""
+    from pymediainfo import MediaInfo
+    return MediaInfo(xml)
+
+
+def load_media(file_path, cache=None, quick_threshold=None, on_quick=None, checksums=(),
+               read_window=None, on_read=None):
+    """Get a MediaInfo object for a file, consulting the cache first
+
+    On a cache miss for a file of at least quick_threshold bytes, a fast low
+    ParseSpeed pass is run first and handed to on_quick before the full
+    analysis starts. Only the full result is cached. Cached reports lacking
+    any of the requested checksums count as misses. checksums, read_window
+    and on_read are passed to parse_media_xml for the full analysis.
+    """
+    identity = file_identity(file_path)
+    fingerprint = None
+    if cache is not None:
+        xml = cache.get(file_path, identity, count=False)
+        if xml is not None:
+            # The same inode may have been renamed or hard-linked since
+            relocated = relocate_xml(xml, file_path)
+            if relocated != xml:
+                cache.record_alias(file_path, identity)
+            media_info = media_info_from_xml(relocated)
+            if has_checksums(media_info, checksums):
+                cache.count_lookup(True)
+                return media_info
+        cache.count_lookup(False)
+
+        # Moved or copied files are found by content. Sampled windows can't
+        # vouch for checksums, so those always come from reading this file.
+        fingerprint = content_fingerprint(file_path)
+        xml = cache.get_by_fingerprint(fingerprint) if not checksums else None
+        if xml is not None:
+            xml = relocate_xml(_CHECKSUM_FIELD.sub('', xml), file_path)
+            cache.put(file_path, xml, identity, fingerprint)
+            return media_info_from_xml(xml)
+
+    if on_quick is not None and quick_threshold is not None and identity[2] >= quick_threshold:
+        on_quick(media_info_from_xml(parse_media_xml(
+            file_path, read_window=read_window, parse_speed=QUICK_PARSE_SPEED
+        )))
+
+    xml = parse_media_xml(file_path, checksums, read_window, on_read)
+    # Don't cache a report for a file that changed while it was being parsed
+    if cache is not None and file_identity(file_path) == identity:
+        cache.put(file_path, xml, identity, fingerprint)
+    return media_info_from_xml(xml)
+
+
+class ParseCache:
+    """SQLite-backed cache of MediaInfo reports with size-bounded LRU eviction"""
+
+    def __init__(self, db_path=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.db_path = db_path or default_cache_path()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # Identity misses answered by a report for the same content at another path
+        self.fingerprint_hits = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " dev INTEGER NOT NULL,"
+            " ino INTEGER NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " mtime_ns INTEGER NOT NULL,"
+            " xml BLOB NOT NULL,"
+            " nbytes INTEGER NOT NULL,"
+            " last_used REAL NOT NULL,"
+            " PRIMARY KEY (dev, ino))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)")
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(entries)")}
+        if 'fingerprint' not in columns:
+            # Databases created before content fingerprints were added
+            self._conn.execute("ALTER TABLE entries ADD COLUMN fingerprint TEXT")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_fingerprint ON entries (fingerprint)")
+        # Every path seen with its content fingerprint, for finding duplicates
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS paths ("
+            " path TEXT PRIMARY KEY,"
+            " fingerprint TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS paths_fingerprint ON paths (fingerprint)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM entries").fetchone()[0]
+
+    def get(self, file_path, identity=None, count=True):
+        """Get the cached XML report for a file, or None on a miss
+
+        With count false the lookup is left out of hits and misses, for
+        callers that may still reject the entry and report via count_lookup.
+        """
+        if identity is None:
+            identity = file_identity(file_path)
+        dev, ino, size, mtime_ns = identity
+
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT xml FROM entries WHERE dev = ? AND ino = ? AND size = ? AND mtime_ns = ?",
+                    (dev, ino, size, mtime_ns)
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE entries SET last_used = ? WHERE dev = ? AND ino = ?",
+                        (time.time(), dev, ino)
+                    )
+                    self._conn.commit()
+            except sqlite3.Error:
+                row = None
+
+            if count:
+                self._count(row is not None)
+            if row is None:
+                return None
+
+        return zlib.decompress(row[0]).decode('utf-8')
+
+    def count_lookup(self, hit):
+        """Count a lookup made with get(count=False) once it is known whether the entry was used"""
+        with self._lock:
+            self._count(hit)
+
+    def _count(self, hit):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def get_by_fingerprint(self, fingerprint):
+        """Get a cached XML report for any file with the given content fingerprint, or None"""
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT xml, dev, ino FROM entries WHERE fingerprint = ? ORDER BY last_used DESC LIMIT 1",
+                    (fingerprint,)
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE entries SET last_used = ? WHERE dev = ? AND ino = ?",
+                        (time.time(), row[1], row[2])
+                    )
+                    self._conn.commit()
+            except sqlite3.Error:
+                row = None
+
+            if row is None:
+                return None
+            self.fingerprint_hits += 1
+
+        return zlib.decompress(row[0]).decode('utf-8')
+
+    def put(self, file_path, xml, identity=None, fingerprint=None):
+        """Store the XML report for a file, evicting least recently used entries if needed
+
+        With a content fingerprint, the report can also be found for copies
+        of the file, and the path is recorded for duplicates().
+        """
+        if identity is None:
+            identity = file_identity(file_path)
+        dev, ino, size, mtime_ns = identity
+        payload = zlib.compress(xml.encode('utf-8'), 6)
+
+        with self._lock:
+            try:
+                old = self._conn.execute(
+                    "SELECT nbytes FROM entries WHERE dev = ? AND ino = ?", (dev, ino)
+                ).fetchone()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries"
+                    " (dev, ino, size, mtime_ns, xml, nbytes, last_used, fingerprint)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (dev, ino, size, mtime_ns, payload, len(payload), time.time(), fingerprint)
+                )
+                if fingerprint is not None:
+                    self._record_path(file_path, fingerprint)
+                self._total_bytes += len(payload) - (old[0] if old else 0)
+                self._evict()
+                self._conn.commit()
+            except sqlite3.Error:
+                self._conn.rollback()
+
+    def parse(self, file_path):
+        """Get a MediaInfo object for a file, running libmediainfo only on a cache miss"""
+        return load_media(file_path, self)
+
+    def record_path(self, file_path, fingerprint=None):
+        """Remember a file's content fingerprint for duplicates() without parsing it"""
+        if fingerprint is None:
+            fingerprint = content_fingerprint(file_path)
+        with self._lock:
+            try:
+                self._record_path(file_path, fingerprint)
+                self._conn.commit()
+            except sqlite3.Error:
+                self._conn.rollback()
+        return fingerprint
+
+    def record_alias(self, file_path, identity):
+        """Record a new path for a cached file under the fingerprint stored with its entry
+
+        Paths already recorded are left alone, so repeated loads cost no
+        fingerprint reads or database writes.
+        """
+        dev, ino = identity[:2]
+        with self._lock:
+            try:
+                changes = self._conn.total_changes
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO paths (path, fingerprint)"
+                    " SELECT ?, fingerprint FROM entries"
+                    " WHERE dev = ? AND ino = ? AND fingerprint IS NOT NULL",
+                    (os.path.abspath(file_path), dev, ino)
+                )
+                if self._conn.total_changes != changes:
+                    self._conn.commit()
+            except sqlite3.Error:
+                self._conn.rollback()
+
+    def _record_path(self, file_path, fingerprint):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO paths (path, fingerprint) VALUES (?, ?)",
+            (os.path.abspath(file_path), fingerprint)
+        )
+
+    def duplicates(self):
+        """Get groups of recorded paths whose contents share a fingerprint
+
+        Returns (fingerprint, paths) pairs. Paths that have disappeared or
+        whose contents have changed since they were recorded are re-checked
+        and dropped from their group.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT fingerprint, path FROM paths WHERE fingerprint IN"
+                " (SELECT fingerprint FROM paths GROUP BY fingerprint HAVING COUNT(*) > 1)"
+                " ORDER BY fingerprint, path"
+            ).fetchall()
+
+        groups = {}
+        for fingerprint, path in rows:
+            try:
+                current = content_fingerprint(path)
+            except OSError:
+                current = None
+            if current == fingerprint:
+                groups.setdefault(fingerprint, []).append(path)
+            elif current is not None:
+                self.record_path(path, current)
+            else:
+                with self._lock:
+                    self._conn.execute("DELETE FROM paths WHERE path = ?", (path,))
+                    self._conn.commit()
+        return [(fingerprint, paths) for fingerprint, paths in groups.items() if len(paths) > 1]
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits its size budget"""
+        while self._total_bytes > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT dev, ino, nbytes FROM entries ORDER BY last_used LIMIT 64"
+            ).fetchall()
+            if not rows:
+                self._total_bytes = 0
+                break
+            for dev, ino, nbytes in rows:
+                self._conn.execute("DELETE FROM entries WHERE dev = ? AND ino = ?", (dev, ino))
+                self._total_bytes -= nbytes
+                if self._total_bytes <= self.max_bytes:
+                    break
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def clear(self):
+        """Remove every cached entry"""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.execute("DELETE FROM paths")
+            self._conn.commit()
+            self._total_bytes = 0
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Neighbour prefetch for MediaInfo Viewer
+After a file is opened, parses the files next to it in its folder on a single
+low-priority thread, so that opening them one after another needs no parse.
+The prefetcher backs off while a foreground load is running and paces its own
+reads to leave the disk to the foreground
+"""
+
+import os
+import sys
+import threading
+import time
+
+from media_store import MediaStore, estimate_size
+
+# Siblings parsed ahead of the opened file
+DEFAULT_PREFETCH_COUNT = 3
+
+# Memory budget for prefetched results not yet opened
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+# Pause after each prefetch parse, and poll interval while the foreground is busy, in seconds
+PREFETCH_INTERVAL = 0.25
+BACKOFF_INTERVAL = 0.1
+
+# Sibling orders: directory listing order by name, or by modification time
+ORDERS = ('name', 'mtime')
+
+
+def sibling_files(file_path, count, order='name', extensions=None):
+    """Get up to count media files following file_path in its folder, in name or modification-time order"""
+    if extensions is None:
+        from scanner import MEDIA_EXTENSIONS as extensions
+    directory = os.path.dirname(os.path.abspath(file_path))
+    try:
+        with os.scandir(directory) as it:
+            entries = [entry for entry in it
+                       if os.path.splitext(entry.name)[1].lower() in extensions and entry.is_file()]
+    except OSError:
+        return []
+
+    if order == 'mtime':
+        def mtime(entry):
+            try:
+                return entry.stat().st_mtime
+            except OSError:
+                return 0
+        entries.sort(key=lambda entry: (mtime(entry), entry.name))
+    else:
+        entries.sort(key=lambda entry: entry.name)
+
+    name = os.path.basename(file_path)
+    position = next((i for i, entry in enumerate(entries) if entry.name == name), None)
+    if position is None:
+        # Not a listed media file itself, so no neighbours to speak of
+        return []
+    return [entry.path for entry in entries[position + 1:position + 1 + count]]
+
+
+class Prefetcher:
+    """Parses the neighbours of opened files in the background into a bounded store"""
+
+    def __init__(self, parse, is_busy=None, count=DEFAULT_PREFETCH_COUNT, order='name',
+                 max_bytes=DEFAULT_MAX_BYTES, interval=PREFETCH_INTERVAL):
+        # parse(path) -> (MediaInfo, track views); runs on the prefetch thread
+        self.parse = parse
+        # Called before each parse; while it returns True the prefetcher waits
+        self.is_busy = is_busy or (lambda: False)
+        self.count = count
+        self.order = order
+        self.interval = interval
+        self.store = MediaStore(max_bytes=max_bytes)
+        self._cond = threading.Condition()
+        self._queue = []
+        self._current = None  # path being parsed right now
+        self._closed = False
+        self._thread = None
+
+    def schedule(self, file_path, skip=()):
+        """Replace the pending prefetches with the siblings of a newly opened file
+
+        Files in skip (e.g. those already open) are not prefetched.
+        """
+        if self.count <= 0:
+            return
+        siblings = [path for path in sibling_files(file_path, self.count, self.order)
+                    if path not in skip and path not in self.store]
+        with self._cond:
+            if self._closed:
+                return
+            self._queue = siblings
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name='mediainfo-prefetch', daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def take(self, file_path, wait=False):
+        """Remove and return a prefetched (MediaInfo, track views), or None
+
+        With wait, a prefetch of file_path already in progress is waited for
+        and handed over instead of the caller parsing the file a second time.
+        """
+        with self._cond:
+            if file_path in self._queue:
+                self._queue.remove(file_path)
+            while wait and self._current == file_path:
+                self._cond.wait()
+        return self.store.pop(file_path)
+
+    def close(self):
+        """Stop the prefetch thread after its current parse"""
+        with self._cond:
+            self._closed = True
+            self._queue = []
+            self._cond.notify_all()
+
+    def _next(self):
+        """Wait for the next file to prefetch, or None once closed"""
+        with self._cond:
+            while True:
+                if self._closed:
+                    return None
+                if self._queue and not self.is_busy():
+                    self._current = self._queue.pop(0)
+                    return self._current
+                # Poll while the foreground is loading, otherwise sleep until scheduled
+                self._cond.wait(BACKOFF_INTERVAL if self._queue else None)
+
+    def _worker(self):
+        _lower_thread_priority()
+        while True:
+            file_path = self._next()
+            if file_path is None:
+                return
+            try:
+                media_info, track_views = self.parse(file_path)
+            except Exception:
+                # The file will be parsed and its error shown if it is opened
+                pass
+            else:
+                self.store.put(file_path, (media_info, track_views), estimate_size(track_views))
+            finally:
+                with self._cond:
+                    self._current = None
+                    self._cond.notify_all()
+            time.sleep(self.interval)
+
+
+def _lower_thread_priority():
+    """Give the calling thread the lowest CPU priority where the OS allows it per thread"""
+    if not sys.platform.startswith('linux'):
+        return
+    try:
+        # On Linux, nice values apply to the individual thread
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+    except (AttributeError, OSError):
+        pass
@@ -0,0 +1,658 @@
+#!/usr/bin/env python3
+"""
+Headless batch scanner for MediaInfo Viewer
+Recursively walks a directory tree, parses files over a process pool and
+streams one JSON record per file (NDJSON)
+"""
+
+import argparse
+import functools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from exporters import media_to_records
+from file_readers import DEFAULT_HEAD_SIZE, DEFAULT_TAIL_SIZE, parse_read_window
+from packed_records import PackedRecord, pack_records, unpack_records
+from parse_cache import CHECKSUM_ALGORITHMS
+
+# Extensions scanned by default, matching the viewer's open dialog
+MEDIA_EXTENSIONS = {
+    '.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm', '.m4v', '.3gp',
+    '.ts', '.m2ts', '.mts', '.mpg', '.mpeg', '.vob',
+    '.mp3', '.wav', '.flac', '.aac', '.m4a', '.ogg', '.wma', '.opus',
+    '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp'
+}
+
+# Number of files handed to a worker per task
+DEFAULT_BATCH_SIZE = 16
+
+
+# Seconds between incremental rescans in --watch mode where inotify is unavailable
+WATCH_POLL_INTERVAL = 60
+
+
+def iter_media_files(root, extensions=MEDIA_EXTENSIONS, follow_symlinks=False):
+    """Recursively yield files under root, optionally filtered by extension"""
+    for entry in iter_media_entries(root, extensions, follow_symlinks):
+        yield entry.path
+
+
+def iter_media_entries(root, extensions=MEDIA_EXTENSIONS, follow_symlinks=False):
+    """Recursively yield the os.DirEntry of each file under root, optionally filtered by extension"""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError as e:
+            print(f"Skipping {directory}: {e}", file=sys.stderr)
+            continue
+
+        subdirs = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=follow_symlinks):
+                    subdirs.append(entry.path)
+                elif entry.is_file(follow_symlinks=follow_symlinks):
+                    if extensions is None or os.path.splitext(entry.name)[1].lower() in extensions:
+                        yield entry
+            except OSError:
+                continue
+        # Depth-first, visiting subdirectories in name order
+        stack.extend(reversed(subdirs))
+
+
+def parse_file_record(path, checksums=(), read_window=None, identify=False):
+    """Parse a single file into an NDJSON-ready record
+
+    With checksums or a bounded read_window, the record also gets the
+    number of bytes read from the file. With identify, it gets the file's
+    (dev, ino, size, mtime_ns) identity from before the parse.
+    """
+    from parse_cache import file_identity, media_info_from_xml, parse_media_xml
+    stats = {}
+    try:
+        if identify:
+            stats['identity'] = file_identity(path)
+        media_info = media_info_from_xml(parse_media_xml(
+            path, checksums, read_window, on_read=lambda bytes_read, size: stats.update(bytes_read=bytes_read)
+        ))
+        return {'path': path, 'tracks': media_to_records(media_info), **stats}
+    except Exception as e:
+        return {'path': path, 'error': str(e)}
+
+
+def stat_identity(entry):
+    """Get the (dev, ino, size, mtime_ns) identity of a walked file, like parse_cache.file_identity"""
+    # DirEntry.stat() reports no inode on Windows
+    st = os.stat(entry.path) if os.name == 'nt' else entry.stat()
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def diff_tree(library, root, extensions=MEDIA_EXTENSIONS, follow_symlinks=False):
+    """Compare a tree against its library manifest
+
+    Returns (changed, removed): files that are new or whose identity differs
+    from the stored one, and indexed files that are no longer there.
+    """
+    root = os.path.abspath(root)
+    manifest = library.manifest(root)
+    changed = []
+    for entry in iter_media_entries(root, extensions, follow_symlinks):
+        try:
+            identity = stat_identity(entry)
+        except OSError:
+            continue
+        if manifest.pop(entry.path, None) != identity:
+            changed.append(entry.path)
+    return changed, sorted(manifest)
+
+
+def parse_batch(paths, checksums=(), read_window=None, identify=False):
+    """Worker entry point: parse a batch of files into one packed bytes object
+
+    Serialising here, in parallel, spares the parent from unpickling every
+    attribute dict; it unpacks PackedRecords that decode on first access.
+    """
+    return pack_records([parse_file_record(path, checksums, read_window, identify) for path in paths])
+
+
+def iter_batches(paths, batch_size):
+    """Group an iterable of paths into lists of at most batch_size"""
+    batch = []
+    for path in paths:
+        batch.append(path)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def scan(paths, workers=None, batch_size=DEFAULT_BATCH_SIZE, checksums=(), read_window=None, identify=False):
+    """Parse paths over a process pool, yielding PackedRecords as they complete
+
+    Only a bounded number of batches is in flight at once, so walking a huge
+    tree and writing results both stream instead of queueing everything up front.
+    If a file crashes its worker, the batches lost with the pool are parsed
+    again one file at a time, so only that file ends up with an error record.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = workers * 2
+    options = (checksums, read_window, identify)
+    pending = {}  # future -> batch
+
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        for batch in iter_batches(paths, batch_size):
+            pending[pool.submit(parse_batch, batch, *options)] = batch
+            if len(pending) >= max_pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                lost = yield from _batch_results(done, pending)
+                if lost:
+                    # Every other batch in flight fails along with the pool
+                    lost += yield from _batch_results(list(pending), pending)
+                    pool.shutdown()
+                    yield from _parse_one_by_one(lost, options)
+                    pool = ProcessPoolExecutor(max_workers=workers)
+        lost = yield from _batch_results(list(pending), pending)
+        yield from _parse_one_by_one(lost, options)
+    finally:
+        pool.shutdown()
+
+
+def _batch_results(futures, pending):
+    """Yield the records of finished batches; return the paths of those lost with a broken pool"""
+    lost = []
+    for future in futures:
+        batch = pending.pop(future)
+        try:
+            data = future.result()
+        except BrokenProcessPool:
+            lost.extend(batch)
+            continue
+        yield from unpack_records(data)
+    return lost
+
+
+def _parse_one_by_one(paths, options):
+    """Parse files lost with a broken pool alone in a worker each time, to single out the crashing one"""
+    pool = None
+    try:
+        for path in paths:
+            if pool is None:
+                pool = ProcessPoolExecutor(max_workers=1)
+            try:
+                data = pool.submit(parse_batch, [path], *options).result()
+            except BrokenProcessPool:
+                pool.shutdown()
+                pool = None
+                print(f"Worker crashed parsing {path}", file=sys.stderr)
+                yield {'path': path, 'error': "worker crashed while parsing this file"}
+                continue
+            yield from unpack_records(data)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def record_json(record):
+    """Serialise a record dict, or a PackedRecord without decoding it, to one JSON line"""
+    return record.text if isinstance(record, PackedRecord) else json.dumps(record, ensure_ascii=False)
+
+
+def write_ndjson(records, out):
+    """Write records one JSON object per line, returning (files, errors)"""
+    files = errors = 0
+    for record in records:
+        out.write(record_json(record))
+        out.write("\n")
+        files += 1
+        if 'error' in record:
+            errors += 1
+    out.flush()
+    return files, errors
+
+
+def parse_extensions(value):
+    """Parse the --ext option into a set of lowercase extensions"""
+    if value == '*':
+        return None
+    return {('.' + ext.strip().lstrip('.')).lower() for ext in value.split(',') if ext.strip()}
+
+
+def add_isolation_arguments(parser):
+    """Add the options for parsing in crash-isolated workers"""
+    parser.add_argument("--isolate", action="store_true",
+                        help="parse each file in recyclable worker processes that are killed and "
+                             "replaced when a file hangs, crashes or uses too much memory")
+    parser.add_argument("--timeout", type=float, default=None, metavar="SECONDS",
+                        help="with --isolate, wall-clock limit per file (default: 60; 0 for none)")
+    parser.add_argument("--max-rss", type=int, default=None, metavar="MB",
+                        help="with --isolate, memory limit per worker (default: 2048; 0 for none)")
+    parser.add_argument("--max-files-per-worker", type=int, default=None, metavar="N",
+                        help="with --isolate, replace each worker after N files (default: 500)")
+    parser.add_argument("--quarantine", default=None, metavar="PATH",
+                        help="with --isolate, write the files that failed and why to this NDJSON file")
+
+
+def isolated_pool(args, parse, workers=None):
+    """Create an IsolatedPool configured from the isolation options"""
+    from isolated_pool import DEFAULT_MAX_FILES, DEFAULT_MAX_RSS, DEFAULT_TIMEOUT, IsolatedPool
+    return IsolatedPool(
+        parse, workers=workers or args.workers,
+        timeout=DEFAULT_TIMEOUT if args.timeout is None else args.timeout,
+        max_rss=DEFAULT_MAX_RSS if args.max_rss is None else args.max_rss * 1024 * 1024,
+        max_files=args.max_files_per_worker or DEFAULT_MAX_FILES,
+    )
+
+
+def report_quarantine(pool, args):
+    """Summarise the quarantined files and write them out if asked to"""
+    if args.quarantine:
+        with open(args.quarantine, 'w', encoding='utf-8') as out:
+            write_ndjson(pool.quarantine, out)
+    if pool.quarantine:
+        print(f"Quarantined {len(pool.quarantine)} files"
+              + (f", listed in {args.quarantine}" if args.quarantine else ""), file=sys.stderr)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="MediaInfo Viewer headless tools")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+
+    scan_parser = subparsers.add_parser("scan", help="recursively scan a directory tree to NDJSON")
+    scan_parser.add_argument("root", help="directory to scan")
+    scan_parser.add_argument("-j", "--workers", type=int, default=None,
+                             help="number of parser processes (default: number of cores)")
+    scan_parser.add_argument("-o", "--output", default="-",
+                             help="NDJSON output file (default: stdout)")
+    scan_parser.add_argument("--ext", type=parse_extensions, default=MEDIA_EXTENSIONS,
+                             help="comma-separated extensions to include, or '*' for all files")
+    scan_parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                             help="files per worker task")
+    scan_parser.add_argument("--follow-symlinks", action="store_true",
+                             help="follow symbolic links while walking")
+    scan_parser.add_argument("--checksums", action="store_true",
+                             help="add MD5 and SHA-256 checksums, computed in the same read as the analysis")
+    scan_parser.add_argument("--bounded-read", action="store_true",
+                             help="read head and tail windows where possible and record bytes_read per file")
+    scan_parser.add_argument("--read-window", type=parse_read_window, default=None, metavar="HEAD[,TAIL]",
+                             help=f"head and tail window sizes in MB for --bounded-read "
+                                  f"(default: {DEFAULT_HEAD_SIZE >> 20},{DEFAULT_TAIL_SIZE >> 20})")
+    add_isolation_arguments(scan_parser)
+
+    pipeline_parser = subparsers.add_parser(
+        "pipeline", help="scan trees on several devices to NDJSON, with a concurrency limit per device"
+    )
+    pipeline_parser.add_argument("roots", nargs="+", metavar="root", help="directories to scan")
+    pipeline_parser.add_argument("-o", "--output", default="-",
+                                 help="NDJSON output file (default: stdout)")
+    pipeline_parser.add_argument("--ext", type=parse_extensions, default=MEDIA_EXTENSIONS,
+                                 help="comma-separated extensions to include, or '*' for all files")
+    pipeline_parser.add_argument("--follow-symlinks", action="store_true",
+                                 help="follow symbolic links while walking")
+    pipeline_parser.add_argument("--device-limit", action="append", default=[], metavar="PATH=N",
+                                 help="parse at most N files at once on the device holding PATH (repeatable)")
+    pipeline_parser.add_argument("--default-limit", type=int, default=None, metavar="N",
+                                 help="files parsed at once on other devices (default: 2)")
+    pipeline_parser.add_argument("-j", "--workers", type=int, default=None,
+                                 help="size of the parser pool (default: enough for every device's limit)")
+    pipeline_parser.add_argument("--threads", action="store_true",
+                                 help="parse on threads instead of processes, e.g. for network storage")
+    pipeline_parser.add_argument("--checksums", action="store_true",
+                                 help="add MD5 and SHA-256 checksums, computed in the same read as the analysis")
+    pipeline_parser.add_argument("--bounded-read", action="store_true",
+                                 help="read head and tail windows where possible and record bytes_read per file")
+    pipeline_parser.add_argument("--read-window", type=parse_read_window, default=None, metavar="HEAD[,TAIL]",
+                                 help="head and tail window sizes in MB for --bounded-read")
+    add_isolation_arguments(pipeline_parser)
+
+    duplicates_parser = subparsers.add_parser(
+        "duplicates", help="list files with identical contents, by content fingerprint"
+    )
+    duplicates_parser.add_argument("roots", nargs="*", metavar="root",
+                                   help="directories to fingerprint into the index first")
+    duplicates_parser.add_argument("-o", "--output", default="-",
+                                   help="NDJSON output file (default: stdout)")
+    duplicates_parser.add_argument("--ext", type=parse_extensions, default=MEDIA_EXTENSIONS,
+                                   help="comma-separated extensions to include, or '*' for all files")
+    duplicates_parser.add_argument("--follow-symlinks", action="store_true",
+                                   help="follow symbolic links while walking")
+    duplicates_parser.add_argument("--index", default=None, metavar="PATH",
+                                   help="fingerprint index database (default: the viewer's parse cache)")
+
+    index_parser = subparsers.add_parser("index", help="parse directory trees into the library index")
+    index_parser.add_argument("roots", nargs="+", metavar="root", help="directories to index")
+    index_parser.add_argument("--library", default=None, metavar="PATH",
+                              help="library index database (default: per-user data directory)")
+    index_parser.add_argument("-j", "--workers", type=int, default=None,
+                              help="number of parser processes (default: number of cores)")
+    index_parser.add_argument("--ext", type=parse_extensions, default=MEDIA_EXTENSIONS,
+                              help="comma-separated extensions to include, or '*' for all files")
+    index_parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                              help="files per worker task")
+    index_parser.add_argument("--follow-symlinks", action="store_true",
+                              help="follow symbolic links while walking")
+    add_isolation_arguments(index_parser)
+
+    update_parser = subparsers.add_parser(
+        "update", help="incrementally update the library index, parsing only new and changed files"
+    )
+    update_parser.add_argument("roots", nargs="+", metavar="root", help="directories to update")
+    update_parser.add_argument("--library", default=None, metavar="PATH",
+                               help="library index database (default: per-user data directory)")
+    update_parser.add_argument("-j", "--workers", type=int, default=None,
+                               help="number of parser processes (default: number of cores)")
+    update_parser.add_argument("--ext", type=parse_extensions, default=MEDIA_EXTENSIONS,
+                               help="comma-separated extensions to include, or '*' for all files")
+    update_parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                               help="files per worker task")
+    update_parser.add_argument("--follow-symlinks", action="store_true",
+                               help="follow symbolic links while walking")
+    update_parser.add_argument("--watch", action="store_true",
+                               help="keep running and index changes as they happen (inotify on Linux)")
+    update_parser.add_argument("--settle", type=float, default=None, metavar="SECONDS",
+                               help="with --watch, wait until a file has had no writes for this long (default: 2)")
+    add_isolation_arguments(update_parser)
+
+    query_parser = subparsers.add_parser(
+        "query", help="find tracks in the library index, e.g. format=HEVC 'width>=3840'"
+    )
+    query_parser.add_argument("conditions", nargs="*", metavar="condition",
+                              help="attribute conditions with =, !=, <, <=, >, >= or ~ (substring), all required")
+    query_parser.add_argument("--library", default=None, metavar="PATH",
+                              help="library index database (default: per-user data directory)")
+    query_parser.add_argument("--limit", type=int, default=50,
+                              help="maximum number of tracks to print (default: 50; 0 for all)")
+    query_parser.add_argument("--count", action="store_true",
+                              help="print only the number of matching tracks")
+    query_parser.add_argument("-o", "--output", default="-",
+                              help="NDJSON output file (default: stdout)")
+    return parser
+
+
+def run_index(args):
+    """Parse every media file under the roots into the library index"""
+    from library_index import LibraryIndex
+
+    start = time.perf_counter()
+    paths = (path for root in args.roots for path in iter_media_files(root, args.ext, args.follow_symlinks))
+    library = LibraryIndex(args.library)
+    pool = None
+    try:
+        if args.isolate:
+            pool = isolated_pool(args, functools.partial(parse_file_record, identify=True))
+            records = pool.map(paths)
+        else:
+            records = scan(paths, workers=args.workers, batch_size=args.batch_size, identify=True)
+        added = library.add_records(records)
+    finally:
+        library.close()
+    if pool is not None:
+        report_quarantine(pool, args)
+
+    elapsed = time.perf_counter() - start
+    print(f"Indexed {added} files in {elapsed:.1f}s", file=sys.stderr)
+    return 0
+
+
+def update_records(paths, args, pool=None):
+    """Parse files for the library, in the crash-isolated pool if there is one"""
+    if pool is not None:
+        return pool.map(paths)
+    return scan(paths, workers=args.workers, batch_size=args.batch_size, identify=True)
+
+
+def update_tree(library, root, args, pool=None):
+    """Bring the library up to date with one tree, returning (parsed, removed) counts"""
+    changed, removed = diff_tree(library, root, args.ext, args.follow_symlinks)
+    if removed:
+        library.remove_many(removed)
+    parsed = 0
+    if changed:
+        parsed = library.add_records(update_records(changed, args, pool))
+    return parsed, len(removed)
+
+
+def update_path(library, path, args, pool=None):
+    """Index whatever a settled watch event points at, returning (parsed, removed) counts"""
+    if os.path.isdir(path):
+        return update_tree(library, path, args, pool)
+    if os.path.isfile(path):
+        if args.ext is not None and os.path.splitext(path)[1].lower() not in args.ext:
+            return 0, 0
+        from parse_cache import file_identity
+        try:
+            if library.manifest(path).get(os.path.abspath(path)) == file_identity(path):
+                return 0, 0
+        except OSError:
+            return 0, 0
+        if pool is not None:
+            return library.add_records(pool.map([path])), 0
+        return library.add_records([parse_file_record(path, identify=True)]), 0
+    # Deleted or moved away, possibly a whole directory
+    removed = list(library.manifest(path))
+    library.remove_many(removed)
+    return 0, len(removed)
+
+
+def watch_trees(library, roots, args, pool=None):
+    """Index changes under the roots as they happen, until interrupted"""
+    from tree_watcher import DEFAULT_SETTLE, TreeWatcher, is_supported
+
+    if not is_supported():
+        print(f"inotify unavailable; rescanning every {WATCH_POLL_INTERVAL}s", file=sys.stderr)
+        while True:
+            time.sleep(WATCH_POLL_INTERVAL)
+            for root in roots:
+                parsed, removed = update_tree(library, root, args, pool)
+                if parsed or removed:
+                    print(f"{root}: parsed {parsed}, removed {removed}", file=sys.stderr)
+
+    settle = DEFAULT_SETTLE if args.settle is None else args.settle
+    watchers = [TreeWatcher(root, settle, args.follow_symlinks) for root in roots]
+    print(f"Watching {len(roots)} trees for changes", file=sys.stderr)
+    try:
+        while True:
+            for root, watcher in zip(roots, watchers):
+                # With several roots, cycle through them instead of blocking on one
+                paths = watcher.poll(timeout=None if len(watchers) == 1 else 0.5)
+                if watcher.overflowed:
+                    # Events were dropped; fall back to comparing the whole tree
+                    watcher.overflowed = False
+                    paths = [root]
+                for path in paths:
+                    parsed, removed = update_path(library, path, args, pool)
+                    if parsed or removed:
+                        print(f"{path}: parsed {parsed}, removed {removed}", file=sys.stderr)
+    finally:
+        for watcher in watchers:
+            watcher.close()
+
+
+def run_update(args):
+    """Parse only the new and changed files under the roots, then optionally keep watching"""
+    from library_index import LibraryIndex
+
+    library = LibraryIndex(args.library)
+    # One pool for the whole run, so watch mode keeps a single quarantine list
+    pool = isolated_pool(args, functools.partial(parse_file_record, identify=True)) if args.isolate else None
+    try:
+        for root in args.roots:
+            start = time.perf_counter()
+            parsed, removed = update_tree(library, root, args, pool)
+            elapsed = time.perf_counter() - start
+            print(f"{root}: parsed {parsed} new or changed files, removed {removed} in {elapsed:.1f}s",
+                  file=sys.stderr)
+        if args.watch:
+            watch_trees(library, args.roots, args, pool)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        library.close()
+        if pool is not None:
+            report_quarantine(pool, args)
+    return 0
+
+
+def run_query(args):
+    """Print the library tracks matching every condition, one JSON object per line"""
+    from library_index import LibraryIndex
+
+    library = LibraryIndex(args.library)
+    try:
+        if args.count:
+            print(library.count(args.conditions))
+            return 0
+        start = time.perf_counter()
+        results = library.query(args.conditions, limit=args.limit or None)
+        elapsed = time.perf_counter() - start
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    finally:
+        library.close()
+
+    records = ({'path': path, 'track_index': index, 'track': track} for path, index, track in results)
+    if args.output == "-":
+        count, _ = write_ndjson(records, sys.stdout)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as out:
+            count, _ = write_ndjson(records, out)
+    print(f"{count} tracks in {elapsed * 1000:.1f}ms", file=sys.stderr)
+    return 0
+
+
+def run_duplicates(args):
+    """Fingerprint the given trees, then write one record per group of identical files"""
+    from parse_cache import ParseCache
+
+    start = time.perf_counter()
+    cache = ParseCache(args.index)
+    try:
+        for root in args.roots:
+            for path in iter_media_files(root, args.ext, args.follow_symlinks):
+                try:
+                    cache.record_path(path)
+                except OSError as e:
+                    print(f"Skipping {path}: {e}", file=sys.stderr)
+        records = [{'fingerprint': fingerprint, 'size': int(fingerprint.split('-')[0], 16), 'paths': paths}
+                   for fingerprint, paths in cache.duplicates()]
+    finally:
+        cache.close()
+
+    if args.output == "-":
+        groups, _ = write_ndjson(records, sys.stdout)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as out:
+            groups, _ = write_ndjson(records, out)
+
+    elapsed = time.perf_counter() - start
+    print(f"Found {groups} groups of duplicates in {elapsed:.1f}s", file=sys.stderr)
+    return 0
+
+
+def run_scan(args):
+    start = time.perf_counter()
+    paths = iter_media_files(args.root, args.ext, args.follow_symlinks)
+    checksums = CHECKSUM_ALGORITHMS if args.checksums else ()
+    read_window = None
+    if args.bounded_read:
+        read_window = args.read_window or (DEFAULT_HEAD_SIZE, DEFAULT_TAIL_SIZE)
+    pool = None
+    if args.isolate:
+        pool = isolated_pool(args, functools.partial(parse_file_record, checksums=checksums, read_window=read_window))
+        records = pool.map(paths)
+    else:
+        records = scan(paths, workers=args.workers, batch_size=args.batch_size, checksums=checksums,
+                       read_window=read_window)
+
+    if args.output == "-":
+        files, errors = write_ndjson(records, sys.stdout)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as out:
+            files, errors = write_ndjson(records, out)
+    if pool is not None:
+        report_quarantine(pool, args)
+
+    elapsed = time.perf_counter() - start
+    print(f"Scanned {files} files ({errors} errors) in {elapsed:.1f}s", file=sys.stderr)
+    return 0
+
+
+def run_devices(args):
+    """Scan trees through the asyncio pipeline, limiting concurrency per device"""
+    from async_scanner import DEFAULT_DEVICE_LIMIT, default_workers, parse_device_limit, print_stats, run_pipeline
+
+    try:
+        device_limits = dict(parse_device_limit(value) for value in args.device_limit)
+    except (OSError, ValueError) as e:
+        print(f"Invalid --device-limit: {e}", file=sys.stderr)
+        return 2
+    checksums = CHECKSUM_ALGORITHMS if args.checksums else ()
+    read_window = None
+    if args.bounded_read:
+        read_window = args.read_window or (DEFAULT_HEAD_SIZE, DEFAULT_TAIL_SIZE)
+    parse = functools.partial(parse_file_record, checksums=checksums, read_window=read_window)
+
+    start = time.perf_counter()
+    out = sys.stdout if args.output == "-" else open(args.output, 'w', encoding='utf-8')
+    counts = {'files': 0, 'errors': 0}
+
+    def sink(record):
+        out.write(record_json(record))
+        out.write("\n")
+        counts['files'] += 1
+        if 'error' in record:
+            counts['errors'] += 1
+
+    default_limit = args.default_limit or DEFAULT_DEVICE_LIMIT
+    pool = None
+    if args.isolate:
+        pool = isolated_pool(args, parse, args.workers or default_workers(args.roots, device_limits, default_limit))
+    try:
+        stats = run_pipeline(
+            args.roots, sink, parse, workers=args.workers, threads=args.threads, device_limits=device_limits,
+            default_limit=default_limit, extensions=args.ext, follow_symlinks=args.follow_symlinks,
+            executor=pool
+        )
+    finally:
+        out.flush()
+        if out is not sys.stdout:
+            out.close()
+        if pool is not None:
+            pool.shutdown()
+            report_quarantine(pool, args)
+
+    print_stats(stats)
+    elapsed = time.perf_counter() - start
+    print(f"Scanned {counts['files']} files ({counts['errors']} errors) in {elapsed:.1f}s", file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "scan":
+        return run_scan(args)
+    if args.command == "pipeline":
+        return run_devices(args)
+    if args.command == "duplicates":
+        return run_duplicates(args)
+    if args.command == "index":
+        return run_index(args)
+    if args.command == "query":
+        return run_query(args)
+    if args.command == "update":
+        return run_update(args)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Search indexes for MediaInfo Viewer
+Matching is done in Python over prebuilt lowercase strings, so the Treeview
+only has to apply the difference between the old and new results
+"""
+
+import bisect
+import heapq
+import re
+import threading
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+class TrackSearchIndex:
+    """Substring index over the attribute rows of the displayed track"""
+
+    def __init__(self, entries=()):
+        # One lowercase haystack per row, joined from the row's searchable strings
+        self.texts = ["\n".join(str(part) for part in parts).lower() for parts in entries]
+        self._last_query = ""
+        self._last_matches = None
+
+    def __len__(self):
+        return len(self.texts)
+
+    def search(self, query):
+        """Get the set of matching row indices, or None when every row matches"""
+        query = query.strip().lower()
+        if not query:
+            self._last_query, self._last_matches = "", None
+            return None
+
+        # Typing more characters can only narrow the previous result
+        if self._last_matches is not None and query.startswith(self._last_query):
+            candidates = self._last_matches
+        else:
+            candidates = range(len(self.texts))
+
+        texts = self.texts
+        matches = {i for i in candidates if query in texts[i]}
+        self._last_query, self._last_matches = query, matches
+        return matches
+
+
+class SearchHit:
+    """A single attribute matched by a global search"""
+    __slots__ = ('file_path', 'track_index', 'track_label', 'attr', 'value', 'score')
+
+    def __init__(self, file_path, track_index, track_label, attr, value, score=0):
+        self.file_path = file_path
+        self.track_index = track_index
+        self.track_label = track_label
+        self.attr = attr
+        self.value = value
+        self.score = score
+
+    def __repr__(self):
+        return f"<SearchHit {self.file_path}#{self.track_index} {self.attr}={self.value!r} ({self.score})>"
+
+
+def tokenize(text):
+    """Split a string into lowercase word tokens"""
+    return _TOKEN_RE.findall(str(text).lower())
+
+
+class GlobalSearchIndex:
+    """Inverted index over every attribute of every track of every loaded file
+
+    Attribute names (raw and translated) and values are indexed separately so
+    that a query can be plain terms ("hevc 3840") or field-qualified
+    ("language=ja"). Terms match whole tokens or token prefixes.
+    """
+
+    # Score for a term matching a whole token / only a token prefix
+    EXACT_SCORE = 3
+    PREFIX_SCORE = 1
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._docs = {}        # doc id -> SearchHit template
+        self._doc_tokens = {}  # doc id -> (name tokens, value tokens)
+        self._files = {}       # file path -> [doc ids]
+        self._names = {}       # token -> set of doc ids (attribute names)
+        self._values = {}      # token -> set of doc ids (attribute values)
+        self._sorted_names = None
+        self._sorted_values = None
+        self._next_id = 0
+
+    def __len__(self):
+        return len(self._docs)
+
+    def files(self):
+        """Get the paths of all indexed files"""
+        with self._lock:
+            return list(self._files)
+
+    def add_file(self, file_path, track_views, track_labels=None, name_translations=()):
+        """Index all rows of a file's track views, replacing any previous entry for it
+
+        name_translations is an iterable of functions mapping an attribute name
+        to a display name, so queries in any UI language find the attribute.
+        """
+        entries = []
+        for view in track_views:
+            label = track_labels[view.index] if track_labels else view.track_type
+            for row in view.rows:
+                name_tokens = set(tokenize(row.attr.replace('_', ' ')))
+                for translate in name_translations:
+                    name_tokens.update(tokenize(translate(row.attr)))
+                name_tokens.add(row.attr.lower())
+                value_tokens = set(tokenize(row.formatted))
+                value_tokens.update(tokenize(row.raw))
+                hit = SearchHit(file_path, view.index, label, row.attr, row.formatted)
+                entries.append((hit, name_tokens, value_tokens))
+
+        with self._lock:
+            self._remove_file_locked(file_path)
+            doc_ids = []
+            for hit, name_tokens, value_tokens in entries:
+                doc_id = self._next_id
+                self._next_id += 1
+                self._docs[doc_id] = hit
+                self._doc_tokens[doc_id] = (name_tokens, value_tokens)
+                for token in name_tokens:
+                    self._names.setdefault(token, set()).add(doc_id)
+                for token in value_tokens:
+                    self._values.setdefault(token, set()).add(doc_id)
+                doc_ids.append(doc_id)
+            self._files[file_path] = doc_ids
+            self._sorted_names = self._sorted_values = None
+
+    def remove_file(self, file_path):
+        """Drop a file from the index"""
+        with self._lock:
+            self._remove_file_locked(file_path)
+
+    def _remove_file_locked(self, file_path):
+        for doc_id in self._files.pop(file_path, ()):
+            name_tokens, value_tokens = self._doc_tokens.pop(doc_id)
+            del self._docs[doc_id]
+            for postings, tokens in ((self._names, name_tokens), (self._values, value_tokens)):
+                for token in tokens:
+                    docs = postings[token]
+                    docs.discard(doc_id)
+                    if not docs:
+                        del postings[token]
+            self._sorted_names = self._sorted_values = None
+
+    def _lookup(self, postings, vocabulary, term):
+        """Get {doc id: score} for docs having a token equal to or starting with term"""
+        scores = dict.fromkeys(postings.get(term, ()), self.EXACT_SCORE)
+        start = bisect.bisect_left(vocabulary, term)
+        for i in range(start, len(vocabulary)):
+            token = vocabulary[i]
+            if not token.startswith(term):
+                break
+            if token != term:
+                for doc_id in postings[token]:
+                    if doc_id not in scores:
+                        scores[doc_id] = self.PREFIX_SCORE
+        return scores
+
+    def search(self, query, limit=200):
+        """Get hits for a query, best matches first"""
+        clauses = []
+        for part in query.split():
+            if '=' in part:
+                name, _, value = part.partition('=')
+                clauses.append((tokenize(name), tokenize(value)))
+            else:
+                clauses.append((None, tokenize(part)))
+        if not any(name or value for name, value in clauses):
+            return []
+
+        with self._lock:
+            if self._sorted_names is None:
+                self._sorted_names = sorted(self._names)
+                self._sorted_values = sorted(self._values)
+
+            total = None
+            for name_terms, value_terms in clauses:
+                if not name_terms and not value_terms:
+                    continue
+                if name_terms is None:
+                    # Plain term: every token must match a name or a value
+                    for term in value_terms:
+                        scores = self._lookup(self._values, self._sorted_values, term)
+                        for doc_id, score in self._lookup(self._names, self._sorted_names, term).items():
+                            scores[doc_id] = max(scores.get(doc_id, 0), score + 1)
+                        total = self._intersect(total, scores)
+                else:
+                    for term in name_terms:
+                        total = self._intersect(total, self._lookup(self._names, self._sorted_names, term))
+                    for term in value_terms:
+                        total = self._intersect(total, self._lookup(self._values, self._sorted_values, term))
+                if not total:
+                    return []
+
+            ranked = heapq.nlargest(limit, total.items(), key=lambda item: (item[1], -item[0]))
+            hits = []
+            for doc_id, score in ranked:
+                hit = self._docs[doc_id]
+                hits.append(SearchHit(hit.file_path, hit.track_index, hit.track_label,
+                                      hit.attr, hit.value, score))
+        return hits
+
+    @staticmethod
+    def _intersect(total, scores):
+        """Combine a running {doc id: score} result with the scores of one more term"""
+        if total is None:
+            return scores
+        if len(scores) < len(total):
+            total, scores = scores, total
+        return {doc_id: score + scores[doc_id] for doc_id, score in total.items() if doc_id in scores}
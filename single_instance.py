@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Single-instance support for MediaInfo Viewer
+The first viewer listens on a per-user Unix domain socket; later launches
+forward their file paths over it and exit without building a window
+"""
+
+import os
+import socket
+import stat
+import threading
+
+# Seconds a forwarding launch waits for the running viewer to acknowledge
+FORWARD_TIMEOUT = 1.0
+
+
+def is_supported():
+    """Check whether single-instance mode is available on this platform"""
+    return os.name == 'posix' and hasattr(socket, 'AF_UNIX')
+
+
+def private_directory(parent):
+    """Get a directory under parent that only the current user can use, creating it if needed
+
+    Raises OSError if the path exists but is not a directory owned by the
+    user, e.g. one planted in a shared temp directory by someone else.
+    """
+    path = os.path.join(parent, f'mediainfo-{os.getuid()}')
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid():
+        raise PermissionError(f"{path} is not a directory owned by the current user")
+    if stat.S_IMODE(st.st_mode) & 0o077:
+        os.chmod(path, 0o700)
+    return path
+
+
+def socket_path():
+    """Get the per-user socket path shared by all viewer instances
+
+    Without XDG_RUNTIME_DIR the socket lives in a private directory in the
+    shared temp directory, so other users cannot claim its name first.
+    """
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return os.path.join(runtime_dir, f'mediainfo-viewer-{os.getuid()}.sock')
+    import tempfile
+    return os.path.join(private_directory(tempfile.gettempdir()), 'viewer.sock')
+
+
+def forward_paths(paths, path=None, timeout=FORWARD_TIMEOUT):
+    """Send file paths to a running viewer, returning True if one accepted them"""
+    if not is_supported():
+        return False
+    try:
+        path = path or socket_path()
+    except OSError:
+        return False
+
+    payload = "\n".join(os.path.abspath(p) for p in paths).encode('utf-8', 'surrogateescape')
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(path)
+            sock.sendall(payload)
+            sock.shutdown(socket.SHUT_WR)
+            return sock.recv(2) == b'OK'
+    except OSError:
+        return False
+
+
+class InstanceServer:
+    """Accepts paths forwarded by later launches and hands them to a callback"""
+
+    def __init__(self, on_paths, path=None):
+        self.on_paths = on_paths
+        self.path = path
+        self._sock = None
+        self._thread = None
+
+    def start(self):
+        """Start listening, returning False if another instance already owns the socket"""
+        if not is_supported():
+            return False
+        try:
+            self.path = self.path or socket_path()
+        except OSError:
+            return False
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)
+        try:
+            try:
+                sock.bind(self.path)
+            except OSError:
+                # Either a live instance owns the socket or a crashed one left it behind
+                if forward_paths([], self.path):
+                    sock.close()
+                    return False
+                os.unlink(self.path)
+                sock.bind(self.path)
+        except OSError:
+            sock.close()
+            return False
+        finally:
+            os.umask(old_umask)
+
+        sock.listen(8)
+        self._sock = sock
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        return True
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return  # Socket closed
+
+            with conn:
+                try:
+                    conn.settimeout(FORWARD_TIMEOUT)
+                    chunks = []
+                    while True:
+                        chunk = conn.recv(65536)
+                        if not chunk:
+                            break
+                        chunks.append(chunk)
+                    conn.sendall(b'OK')
+                except OSError:
+                    continue
+
+            data = b''.join(chunks).decode('utf-8', 'surrogateescape')
+            self.on_paths([line for line in data.split("\n") if line])
+
+    def close(self):
+        """Stop listening and remove the socket file"""
+        if self._sock is None:
+            return
+        self._sock.close()
+        self._sock = None
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test script for the device-aware scanning pipeline
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from async_scanner import DevicePipeline, parse_device_limit, run_pipeline
+from test_scanner import make_tree
+
+
+def touch(path):
+    with open(path, 'wb') as f:
+        f.write(b'\0' * 16)
+
+
+class SlowParse:
+    """Parse stand-in that records how many calls overlap"""
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def __call__(self, path):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        return {'path': path, 'tracks': []}
+
+
+def test_pipeline_parses_every_file():
+    """Every file under every root should reach the sink once, with stats for its device"""
+    print("🧪 Testing pipeline scan...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        make_tree(tmp)
+        records = []
+        stats = run_pipeline([tmp], records.append, threads=True)
+        print(f"✅ {stats[0].summary()}")
+
+        assert sorted(os.path.basename(record['path']) for record in records) == ['one.wav', 'three.wav', 'two.wav']
+        for record in records:
+            assert record['tracks'][1]['format'] == 'PCM'
+        assert len(stats) == 1
+        assert stats[0].device == os.stat(tmp).st_dev
+        assert stats[0].files == 3 and stats[0].errors == 0
+        assert stats[0].bytes == sum(os.path.getsize(record['path']) for record in records)
+
+
+def test_device_limit_and_backpressure():
+    """A device's limit caps concurrent parses, and a slow sink holds the walk back"""
+    print("\n🧪 Testing device limit and backpressure...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(24):
+            touch(os.path.join(tmp, f'{i:02}.wav'))
+
+        parse = SlowParse()
+        device, limit = parse_device_limit(f'{tmp}=3')
+        backlog = []
+
+        def slow_sink(record):
+            backlog.append(sum(lane.queue.qsize() for lane in pipeline.lanes.values()))
+            time.sleep(0.005)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            pipeline = DevicePipeline(executor, slow_sink, parse, {device: limit}, queue_size=4)
+            asyncio.run(pipeline.run([tmp]))
+
+        print(f"✅ Peak concurrent parses: {parse.peak}, largest queue: {max(backlog)}")
+        assert parse.peak == 3
+        assert len(backlog) == 24
+        assert max(backlog) <= 4
+
+
+def test_sink_error_stops_pipeline():
+    """A failing sink ends the run with its error instead of hanging"""
+    print("\n🧪 Testing sink failure...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(40):
+            touch(os.path.join(tmp, f'{i:02}.wav'))
+
+        def broken_sink(record):
+            raise BrokenPipeError("output closed")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            pipeline = DevicePipeline(executor, broken_sink, SlowParse(0.001), queue_size=2)
+            try:
+                asyncio.run(pipeline.run([tmp]))
+            except BrokenPipeError:
+                print("✅ Sink error raised")
+            else:
+                raise AssertionError("sink error was swallowed")
+        assert pipeline.stats()[0].files < 40
+
+
+if __name__ == "__main__":
+    test_pipeline_parses_every_file()
+    test_device_limit_and_backpressure()
+    test_sink_error_stops_pipeline()
+    print("\n🎉 Async scanner tests passed!")
+    sys.exit(0)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Test script for the export helpers
+"""
+
+import io
+import json
+import os
+import sys
+import tempfile
+
+from exporters import ExportCancelled, export_to_file, views_to_records, write_export
+from track_model import build_media_view
+from test_track_model import parse_sample
+
+
+def test_streaming_export():
+    """Exports stream track by track, match json.dump, and leave nothing behind when cancelled"""
+    print("\n🧪 Testing streaming export...")
+
+    views = build_media_view(parse_sample())
+    records = views_to_records(views)
+
+    out = io.StringIO()
+    write_export([('/a.wav', views)], out, 'json')
+    assert out.getvalue() == json.dumps(records, indent=2, ensure_ascii=False)
+
+    out = io.StringIO()
+    write_export([('/a.wav', views), ('/b.wav', views)], out, 'json')
+    assert json.loads(out.getvalue()) == [{'path': '/a.wav', 'tracks': records}, {'path': '/b.wav', 'tracks': records}]
+
+    progress = []
+    out = io.StringIO()
+    write_export([('/a.wav', views), ('/b.wav', views)], out, 'ndjson', progress=lambda d, t: progress.append((d, t)))
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [line['path'] for line in lines] == ['/a.wav', '/b.wav']
+    assert progress == [(1, 4), (2, 4), (3, 4), (4, 4)]
+    print(f"✅ Progress: {progress}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        target = os.path.join(tmp, 'report.txt')
+        try:
+            export_to_file([('/a.wav', views)] * 3, target, progress=lambda d, t: None, cancelled=lambda: True)
+            assert False, "export should have been cancelled"
+        except ExportCancelled:
+            pass
+        assert os.listdir(tmp) == []
+
+        export_to_file([('/a.wav', views)], os.path.join(tmp, 'report.ndjson'))
+        assert os.listdir(tmp) == ['report.ndjson']
+
+
+if __name__ == "__main__":
+    test_streaming_export()
+    print("\n🎉 Exporter tests passed!")
+    sys.exit(0)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test script for the file-like readers libmediainfo parses through
+"""
+
+import hashlib
+import io
+import os
+import random
+import sys
+import tempfile
+
+from file_readers import HashingReader, HeadTailReader, parse_read_window
+from parse_cache import media_info_from_xml, parse_media_xml
+from test_parse_cache import write_test_wav
+
+
+def test_hashing_reader_random_access():
+    """Hashes match the whole file whatever order libmediainfo reads it in"""
+    print("🧪 Testing hashing reader...")
+
+    data = random.Random(3).randbytes(100000)
+    reader = HashingReader(io.BytesIO(data), ('md5', 'sha256'), chunk_size=4096)
+    assert reader.seek(0, os.SEEK_END) == len(data)
+    reader.seek(0)
+    assert reader.read(1000) == data[:1000]
+    reader.seek(90000)                      # jump ahead, like a trailing index
+    assert reader.read(5000) == data[90000:95000]
+    reader.seek(500)                        # and back
+    assert reader.read(2000) == data[500:2500]
+
+    digests = reader.finish()
+    print(f"✅ Read {reader.bytes_read} bytes for a {len(data)} byte file")
+    assert digests == {'md5': hashlib.md5(data).hexdigest(), 'sha256': hashlib.sha256(data).hexdigest()}
+    # Only the backwards re-read is read twice
+    assert reader.bytes_read == len(data) + 2000
+
+
+def test_head_tail_windows():
+    """Reads inside the windows are served from memory; only seeks outside them read the file"""
+    print("\n🧪 Testing head/tail reader...")
+
+    data = random.Random(5).randbytes(100000)
+    reader = HeadTailReader(io.BytesIO(data), head_size=8192, tail_size=4096)
+    assert reader.seek(0, os.SEEK_END) == len(data)
+    reader.seek(0)
+    assert reader.read(4096) + reader.read(4096) == data[:8192]
+    assert reader.bytes_read == 8192                     # the head, fetched once
+    assert reader.read(4096) == b''                      # reading on past the head ends the file
+    reader.seek(-4096, os.SEEK_END)
+    assert reader.read(10000) == data[-4096:]
+    assert reader.read(10) == b''
+    # A read running past the head window stops at its end
+    reader.seek(8000)
+    assert reader.read(1000) == data[8000:8192]
+    assert reader.bytes_read == 8192 + 4096 and reader.fallback_reads == 0
+
+    reader.seek(50000)
+    assert reader.read(1000) == data[50000:51000]
+    print(f"✅ Read {reader.bytes_read} bytes, {reader.fallback_reads} outside the windows")
+    assert reader.fallback_reads == 1 and reader.bytes_read == 8192 + 4096 + 1000
+    # A seek opens a run of at most a head window's size
+    assert len(reader.read(20000)) == 8192 - 1000 and reader.read(1000) == b''
+
+    assert parse_read_window("8") == (8 << 20, 8 << 20)
+    assert parse_read_window("4,0.5") == (4 << 20, 512 << 10)
+
+
+def test_bounded_parse_reads_less():
+    """libmediainfo parsing through the windows reads a fraction of a real file with the same result"""
+    print("\n🧪 Testing bounded parse of a real file...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        media_file = os.path.join(tmp, 'long.wav')
+        write_test_wav(media_file, seconds=60)
+        reads = []
+        bounded = parse_media_xml(media_file, read_window=(64 * 1024, 64 * 1024),
+                                  on_read=lambda bytes_read, size: reads.append((bytes_read, size)))
+        full = parse_media_xml(media_file)
+
+    (bytes_read, size), = reads
+    print(f"✅ Read {bytes_read} of {size} bytes")
+    assert bytes_read < size // 10
+    bounded_tracks = media_info_from_xml(bounded).tracks
+    assert [track.to_data() for track in bounded_tracks] == \
+        [track.to_data() for track in media_info_from_xml(full).tracks]
+
+
+if __name__ == "__main__":
+    test_hashing_reader_random_access()
+    test_head_tail_windows()
+    test_bounded_parse_reads_less()
+    print("\n🎉 File reader tests passed!")
+    sys.exit(0)
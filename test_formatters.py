@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test script for the value formatter registry
+"""
+
+import random
+import sys
+
+import formatters
+from formatters import cache_info, format_column, format_value
+
+
+def test_formatted_values():
+    """Registered attributes get their unit, others their string value"""
+    print("🧪 Testing value formatting...")
+
+    cases = [
+        ("duration", "65000", "01:05"),
+        ("duration", 3725000, "01:02:05"),
+        ("file_size", "1024000", "1000.0 KB"),
+        ("file_size", 1024, "1.0 KB"),
+        ("stream_size", 825, "825.0 B"),
+        ("bit_rate", "128000", "128.0 kbps"),
+        ("overall_bit_rate", "1500000", "1.5 Mbps"),
+        ("bit_rate", 999, "999 bps"),
+        ("bit_rate", "Variable", "Variable"),
+        ("format", "AAC", "AAC"),
+        ("duration", None, "None"),
+        ("other_duration", ["1 s", "00:00:01"], "['1 s', '00:00:01']"),
+    ]
+    for attr, value, expected in cases:
+        result = format_value(attr, value)
+        print(f"  {attr}: {value!r} → {result}")
+        assert result == expected, (attr, value, result)
+    print("✅ Values formatted")
+
+
+def test_cache_reuses_results():
+    """Repeated raw values are formatted once"""
+    print("\n🧪 Testing format cache...")
+
+    formatters._format_cached.cache_clear()
+    for _ in range(100):
+        format_value("sampling_rate", 48000)
+        format_value("bit_rate", 320000)
+    info = cache_info()
+    print(f"✅ {info}")
+    assert (info.hits, info.misses) == (99, 1)
+
+
+def test_column_matches_scalar():
+    """Column formatting gives the same strings as format_value"""
+    print("\n🧪 Testing column formatting...")
+
+    rng = random.Random(7)
+    for attr in ("duration", "file_size", "bit_rate", "format"):
+        values = [rng.choice([rng.randrange(0, 10 ** rng.randrange(1, 16)), "N/A", str(rng.random() * 1e9), None])
+                  for _ in range(512)]
+        values.append(1024 ** 3)
+        assert format_column(attr, values) == [format_value(attr, value) for value in values], attr
+        assert format_column(attr, values[:3]) == [format_value(attr, value) for value in values[:3]]
+    print("✅ Columns match")
+
+
+
+def test_formatter_is_abstract():
+    """Unit formatters must implement format"""
+    print("\n🧪 Testing formatter base class...")
+
+    try:
+        formatters.UnitFormatter()
+    except TypeError:
+        print("✅ UnitFormatter cannot be instantiated")
+    else:
+        raise AssertionError("UnitFormatter should be abstract")
+
+
+if __name__ == "__main__":
+    test_formatted_values()
+    test_cache_reuses_results()
+    test_column_matches_scalar()
+    test_formatter_is_abstract()
+    print("\n🎉 Formatter tests passed!")
+    sys.exit(0)
@@ -7,6 +7,7 @@ import sys
 import os
 from pymediainfo import MediaInfo
 from translations import get_ui_text, get_attribute_name, get_category_name
+from formatters import format_value
 
 def test_complete_workflow():
     """Test the complete workflow with both languages"""
@@ -48,23 +49,9 @@ def print_track_info(track, language):
         value = getattr(track, attr, None)
         if value is not None:
             display_name = get_attribute_name(attr, language)
-            formatted_value = format_value_simple(attr, value)
+            formatted_value = format_value(attr, value)
             print(f"  {display_name}: {formatted_value}")
 
-def format_value_simple(attr_name, value):
-    """Simple value formatting for test"""
-    if attr_name == "file_size":
-        try:
-            size = int(float(value))
-            for unit in ['B', 'KB', 'MB', 'GB']:
-                if size < 1024.0:
-                    return f"{size:.1f} {unit}"
-                size /= 1024.0
-            return f"{size:.1f} TB"
-        except:
-            return str(value)
-    return str(value)
-
 def test_search_functionality(track):
     """Simulate search functionality"""
     search_terms = ['format', 'size', '格式', '大小']
@@ -86,7 +73,7 @@ def test_search_functionality(track):
             if size_val:
                 display_name_en = get_attribute_name('file_size', 'en')
                 display_name_zh = get_attribute_name('file_size', 'zh')
-                formatted_size = format_value_simple('file_size', size_val)
+                formatted_size = format_value('file_size', size_val)
                 print(f"  ✅ Found: {display_name_en}/{display_name_zh} = {formatted_size}")
 
 def test_language_switching():
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Test script for crash-isolated batch parsing
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from async_scanner import run_pipeline
+from isolated_pool import CRASHED, MEMORY, TIMEOUT, IsolatedPool, process_rss
+from library_index import LibraryIndex
+from scanner import build_parser, parse_file_record, update_tree
+from test_parse_cache import write_test_wav
+from test_scanner import make_tree
+
+
+def misbehaving_parse(path):
+    """Parse stand-in that hangs, crashes or balloons depending on the file name"""
+    name = os.path.splitext(os.path.basename(path))[0]
+    if name == 'hang':
+        time.sleep(60)
+    elif name == 'crash':
+        os._exit(3)
+    elif name == 'abort':
+        os.abort()
+    elif name == 'balloon':
+        hoard = bytearray(64 * 1024 * 1024)
+        hoard[::4096] = b'x' * len(hoard[::4096])
+        time.sleep(60)
+    elif name == 'raise':
+        raise ValueError("bad header")
+    return {'path': path, 'pid': os.getpid()}
+
+
+def poisoned_parse(path):
+    """The scanner's parse, except that files named crash.* kill their worker"""
+    if os.path.basename(path).startswith('crash.'):
+        os._exit(3)
+    return parse_file_record(path, identify=True)
+
+
+def test_failures_are_quarantined():
+    """Hanging and crashing files are killed and quarantined while the rest complete"""
+    print("🧪 Testing quarantine of hanging and crashing files...")
+
+    paths = ['a', 'hang', 'b', 'crash', 'c', 'abort', 'raise', 'd']
+    pool = IsolatedPool(misbehaving_parse, workers=2, timeout=1.0, max_rss=0)
+    start = time.monotonic()
+    records = {record['path']: record for record in pool.map(paths)}
+    elapsed = time.monotonic() - start
+    reasons = {entry['path']: entry['reason'] for entry in pool.quarantine}
+    print(f"✅ {len(records)} records in {elapsed:.1f}s, quarantined: {reasons}")
+
+    assert sorted(records) == sorted(paths)
+    assert reasons == {'hang': TIMEOUT, 'crash': CRASHED, 'abort': CRASHED}
+    assert 'SIGABRT' in records['abort']['error']
+    assert 'status 3' in records['crash']['error']
+    # An exception is an ordinary parse error, not a reason to quarantine
+    assert records['raise']['error'] == 'bad header' and 'quarantined' not in records['raise']
+    assert all('pid' in records[path] for path in 'abcd')
+    assert pool.restarts == 3
+    assert elapsed < 10
+
+
+def test_memory_cap():
+    """A worker growing past the memory cap is killed and its file quarantined"""
+    print("\n🧪 Testing worker memory cap...")
+
+    if process_rss(os.getpid()) is None:
+        print("⚠️ Skipped: no /proc on this platform")
+        return
+    pool = IsolatedPool(misbehaving_parse, workers=1, timeout=20.0, max_rss=32 * 1024 * 1024)
+    records = list(pool.map(['balloon', 'after']))
+    print(f"✅ Quarantine: {pool.quarantine}")
+
+    assert pool.quarantine[0]['path'] == 'balloon' and pool.quarantine[0]['reason'] == MEMORY
+    assert records[-1]['path'] == 'after' and 'pid' in records[-1]
+
+
+def test_workers_are_recycled():
+    """Workers are replaced after max_files files"""
+    print("\n🧪 Testing worker recycling...")
+
+    pool = IsolatedPool(misbehaving_parse, workers=1, max_files=2)
+    pids = [record['pid'] for record in pool.map([str(i) for i in range(6)])]
+    print(f"✅ Worker pids: {pids}")
+
+    assert len(set(pids)) == 3
+    assert pids[0] == pids[1] != pids[2] == pids[3]
+    assert pool.quarantine == [] and pool.restarts == 0
+
+
+def test_submit_isolates_failures():
+    """Jobs submitted like to an executor get the same limits, e.g. from the asyncio pipeline"""
+    print("\n🧪 Testing isolated submit...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ('a', 'crash', 'hang', 'b'):
+            with open(os.path.join(tmp, name + '.wav'), 'wb') as f:
+                f.write(b'\0')
+        pool = IsolatedPool(workers=2, timeout=1.0, max_rss=0)
+        records = []
+        try:
+            stats = run_pipeline([tmp], records.append, misbehaving_parse, executor=pool)
+        finally:
+            pool.shutdown()
+        reasons = sorted((os.path.basename(entry['path']), entry['reason']) for entry in pool.quarantine)
+        print(f"✅ {len(records)} records, quarantined: {reasons}")
+
+        assert len(records) == 4 and stats[0].files == 4 and stats[0].errors == 2
+        assert reasons == [('crash.wav', CRASHED), ('hang.wav', TIMEOUT)]
+        assert sorted(os.path.basename(record['path']) for record in records if 'error' not in record) == \
+            ['a.wav', 'b.wav']
+
+
+def test_update_survives_poison_file():
+    """An incremental update with --isolate indexes the good files and quarantines the bad one"""
+    print("\n🧪 Testing isolated library update...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, 'library')
+        make_tree(root)
+        write_test_wav(os.path.join(root, 'crash.wav'))
+        library = LibraryIndex(os.path.join(tmp, 'library.sqlite3'))
+        args = build_parser().parse_args(['update', root, '-j', '2', '--isolate'])
+        pool = IsolatedPool(poisoned_parse, workers=2, timeout=10.0)
+
+        assert update_tree(library, root, args, pool) == (3, 0)
+        print(f"✅ Indexed {len(library)} files, quarantined {[e['path'] for e in pool.quarantine]}")
+        assert [entry['path'] for entry in pool.quarantine] == [os.path.join(root, 'crash.wav')]
+        library.close()
+
+
+if __name__ == "__main__":
+    test_failures_are_quarantined()
+    test_memory_cap()
+    test_workers_are_recycled()
+    test_submit_isolates_failures()
+    test_update_survives_poison_file()
+    print("\n🎉 Isolated pool tests passed!")
+    sys.exit(0)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test script for the SQLite media library index
+"""
+
+import os
+import sys
+import tempfile
+
+from library_index import LibraryIndex, parse_condition
+
+
+def sample_tracks(video_format, width, transfer):
+    return [
+        {'track_type': 'General', 'format': 'Matroska', 'duration': '5000.000', 'file_size': '1000'},
+        {'track_type': 'Video', 'format': video_format, 'width': str(width), 'height': str(width * 9 // 16),
+         'transfer_characteristics': transfer, 'frame_rate': '23.976'},
+        {'track_type': 'Audio', 'format': 'AAC', 'sampling_rate': '48000', 'channel_s': '6', 'language': 'ja'},
+    ]
+
+
+def test_typed_queries():
+    """Typed columns compare numerically, other attributes through the JSON blob"""
+    print("🧪 Testing library queries...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        library = LibraryIndex(os.path.join(tmp, 'library.sqlite3'))
+        library.add_records([
+            {'path': os.path.join(tmp, 'uhd_hdr.mkv'), 'tracks': sample_tracks('HEVC', 3840, 'PQ')},
+            {'path': os.path.join(tmp, 'dci.mkv'), 'tracks': sample_tracks('HEVC', 4096, 'HLG')},
+            {'path': os.path.join(tmp, 'hd.mkv'), 'tracks': sample_tracks('AVC', 1920, 'BT.709')},
+            {'path': os.path.join(tmp, 'broken.mkv'), 'error': 'unreadable'},
+        ])
+        assert len(library) == 3
+
+        names = lambda results: [os.path.basename(path) for path, _, _ in results]
+        assert names(library.query(['track_type=Video', 'format=hevc', 'width>=3840'])) == ['uhd_hdr.mkv', 'dci.mkv']
+        assert names(library.query(['format=HEVC', 'width>3840', 'transfer_characteristics~hl'])) == ['dci.mkv']
+        assert library.count(['language=JA']) == 3
+        assert library.count([('channel_s', '>=', '6')]) == 3
+        # Numbers in the JSON blob compare as numbers, not strings
+        assert library.count(['frame_rate>9']) == 3
+        assert library.count(['file_size<999']) == 0
+
+        path, index, track = library.query(['width=1920'])[0]
+        print(f"✅ {os.path.basename(path)}#{index}: {track['format']} {track['width']}x{track['height']}")
+        assert (index, track['width'], track['frame_rate']) == (1, 1920, '23.976')
+
+        # Re-adding a file replaces its tracks
+        library.add(os.path.join(tmp, 'hd.mkv'), sample_tracks('AV1', 7680, 'PQ'))
+        assert library.count(['format=AVC']) == 0 and library.count(['width>=7680']) == 1
+        library.remove(os.path.join(tmp, 'hd.mkv'))
+        assert library.count(['track_type=Video']) == 2
+        library.close()
+
+
+def test_limit_returns_first_rows():
+    """A limited query returns the first rows in indexing and track order, not an arbitrary subset"""
+    print("\n🧪 Testing query limit...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        library = LibraryIndex(os.path.join(tmp, 'library.sqlite3'))
+        # Inserted in reverse so that indexing order differs from path order
+        library.add_records([
+            {'path': os.path.join(tmp, f'{i:03}.mkv'), 'tracks': sample_tracks('HEVC', 3840, 'PQ')}
+            for i in reversed(range(40))
+        ])
+        full = library.query(['format=HEVC'])
+        limited = library.query(['format=HEVC'], limit=5)
+        print(f"✅ First rows: {[os.path.basename(path) for path, _, _ in limited]}")
+
+        assert [os.path.basename(path) for path, _, _ in full] == [f'{i:03}.mkv' for i in reversed(range(40))]
+        assert [(path, index) for path, index, _ in limited] == [(path, index) for path, index, _ in full[:5]]
+        assert os.path.basename(limited[0][0]) == '039.mkv'
+        # A re-indexed file moves to the end, its tracks still together and in order
+        library.add(os.path.join(tmp, '039.mkv'), sample_tracks('HEVC', 3840, 'PQ'))
+        assert [index for path, index, _ in library.query([]) if path.endswith('039.mkv')] == [0, 1, 2]
+        assert library.query([])[-1][0].endswith('039.mkv')
+        assert [index for _, index, _ in library.query([], limit=4)] == [0, 1, 2, 0]
+        library.close()
+
+
+def test_condition_parsing():
+    """Conditions need an attribute, an operator and a value"""
+    print("\n🧪 Testing condition parsing...")
+
+    assert parse_condition("width>=3840") == ('width', '>=', '3840')
+    assert parse_condition(" title ~ Mad Max ") == ('title', '~', 'Mad Max')
+    for bad in ("width", "width>=", "=HEVC", "a b=c"):
+        try:
+            parse_condition(bad)
+        except ValueError:
+            continue
+        raise AssertionError(bad)
+    print("✅ Conditions parsed")
+
+
+if __name__ == "__main__":
+    test_typed_queries()
+    test_limit_returns_first_rows()
+    test_condition_parsing()
+    print("\n🎉 Library index tests passed!")
+    sys.exit(0)
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Test script for the cancellable load scheduler
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from load_scheduler import LoadScheduler
+
+
+def test_only_newest_load_delivers():
+    """Superseded loads must never deliver, queued ones must not even run"""
+    print("🧪 Testing load supersession...")
+
+    scheduler = LoadScheduler(max_workers=1)
+    release = threading.Event()
+    started = []
+    delivered = []
+    done = threading.Event()
+
+    def slow_parse(name):
+        started.append(name)
+        if name == 'first':
+            release.wait(2)
+        return name
+
+    def callback(generation, result, error):
+        delivered.append((generation, result, error))
+        done.set()
+
+    scheduler.submit(slow_parse, 'first', callback=callback)
+    while not started:
+        pass
+    scheduler.submit(slow_parse, 'second', callback=callback)
+    third = scheduler.submit(slow_parse, 'third', callback=callback)
+    print(f"✅ Stats while first parse runs: {scheduler.stats()}")
+    assert scheduler.stats() == (1, 1)
+
+    release.set()
+    assert done.wait(2)
+    scheduler.shutdown()
+
+    print(f"✅ Started: {started}, delivered: {delivered}")
+    assert started == ['first', 'third']
+    assert delivered == [(third, 'third', None)]
+
+
+def test_errors_are_delivered():
+    """A failing load should hand its exception to the callback"""
+    print("\n🧪 Testing load errors...")
+
+    scheduler = LoadScheduler()
+    results = []
+    done = threading.Event()
+
+    def fail():
+        raise ValueError("bad file")
+
+    scheduler.submit(fail, callback=lambda g, r, e: (results.append(e), done.set()))
+    assert done.wait(2)
+    scheduler.shutdown()
+    print(f"✅ Error: {results[0]!r}")
+    assert isinstance(results[0], ValueError)
+    assert scheduler.stats() == (0, 0)
+
+
+def test_partial_results():
+    """Partial results should arrive before the final one, and not after supersession"""
+    print("\n🧪 Testing partial results...")
+
+    scheduler = LoadScheduler(max_workers=1)
+    events = []
+    done = threading.Event()
+
+    def progressive(name, report):
+        report(name + ':quick')
+        return name + ':full'
+
+    scheduler.submit(
+        progressive, 'a',
+        callback=lambda g, r, e: (events.append(r), done.set()),
+        partial_callback=lambda g, r: events.append(r)
+    )
+    assert done.wait(2)
+
+    # A load superseded before reporting delivers nothing at all
+    superseded = []
+    release = threading.Event()
+
+    def blocked(report):
+        release.wait(2)
+        report('stale')
+        return 'stale'
+
+    scheduler.submit(blocked, callback=lambda g, r, e: superseded.append(r),
+                     partial_callback=lambda g, r: superseded.append(r))
+    done.clear()
+    scheduler.submit(lambda: 'newest', callback=lambda g, r, e: done.set())
+    release.set()
+    assert done.wait(2)
+    scheduler.shutdown()
+
+    print(f"✅ Delivered: {events}")
+    assert events == ['a:quick', 'a:full']
+    assert superseded == []
+
+
+def test_cancel_pending():
+    """Cancelling pending loads should stop every submitted load from delivering"""
+    print("\n🧪 Testing cancel_pending...")
+
+    scheduler = LoadScheduler(max_workers=1)
+    started = threading.Event()
+    release = threading.Event()
+    delivered = []
+
+    def running():
+        started.set()
+        release.wait(2)
+        return 'running'
+
+    scheduler.submit(running, callback=lambda g, r, e: delivered.append(r))
+    assert started.wait(2)
+    scheduler.submit(lambda: 'queued', callback=lambda g, r, e: delivered.append(r))
+    scheduler.cancel_pending()
+    assert scheduler.stats() == (0, 1)
+    release.set()
+    scheduler.shutdown()
+    for thread in scheduler._threads:
+        thread.join(2)
+    print(f"✅ Delivered after cancel: {delivered}")
+    assert delivered == []
+
+
+def test_stuck_load_does_not_block_exit():
+    """A parse that never returns must not keep the process alive after shutdown"""
+    print("\n🧪 Testing exit with a stuck load...")
+
+    script = (
+        "import threading, time\n"
+        "from load_scheduler import LoadScheduler\n"
+        "scheduler = LoadScheduler()\n"
+        "started = threading.Event()\n"
+        "scheduler.submit(lambda: (started.set(), time.sleep(60)))\n"
+        "started.wait(5)\n"
+        "scheduler.shutdown()\n"
+    )
+    start = time.monotonic()
+    subprocess.run([sys.executable, '-c', script], cwd=os.path.dirname(os.path.abspath(__file__)),
+                   check=True, timeout=30)
+    elapsed = time.monotonic() - start
+    print(f"✅ Process exited after {elapsed:.1f}s")
+    assert elapsed < 10
+
+
+if __name__ == "__main__":
+    test_only_newest_load_delivers()
+    test_errors_are_delivered()
+    test_partial_results()
+    test_cancel_pending()
+    test_stuck_load_does_not_block_exit()
+    print("\n🎉 Load scheduler tests passed!")
+    sys.exit(0)
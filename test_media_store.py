@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Test script for the in-memory store of parsed files
+"""
+
+import sys
+
+from media_store import MediaStore, estimate_size
+from track_model import TrackView
+
+
+def test_lru_eviction():
+    """Least recently used files are evicted once the budget is exceeded"""
+    print("🧪 Testing LRU eviction...")
+
+    evicted = []
+    store = MediaStore(max_bytes=300, on_evict=lambda key, value: evicted.append(key))
+    store.put('a', 'A', 100)
+    store.put('b', 'B', 100)
+    store.put('c', 'C', 100)
+    assert store.get('a') == 'A'       # 'a' is now the most recently used
+    assert store.peek('b') == 'B'      # peeking doesn't count as a use
+    store.put('d', 'D', 100)
+    assert evicted == ['b']
+    assert store.keys() == ['c', 'a', 'd']
+    assert store.total_bytes == 300
+
+    # Replacing an entry updates its size instead of counting it twice
+    store.put('a', 'A2', 50)
+    assert store.total_bytes == 250 and len(store) == 3
+
+    # An oversized entry is kept on its own
+    store.put('big', 'BIG', 1000)
+    assert store.keys() == ['big'] and 'a' not in store
+    assert store.pop('big') == 'BIG' and store.total_bytes == 0
+    print(f"✅ Evicted in order: {evicted}")
+
+
+def test_estimate_size():
+    """Estimates grow with the attributes held"""
+    print("\n🧪 Testing size estimates...")
+
+    small = TrackView(0, 'General', None, 'AAC', {}, {'format': 'AAC'})
+    large = TrackView(0, 'General', None, None, {}, {f'attr_{i}': 'x' * 100 for i in range(50)})
+    assert 0 < estimate_size([small]) < estimate_size([large])
+    assert estimate_size([small, small]) == 2 * estimate_size([small])
+    print(f"✅ {estimate_size([small])} vs {estimate_size([large])} bytes")
+
+
+if __name__ == "__main__":
+    test_lru_eviction()
+    test_estimate_size()
+    print("\n🎉 Media store tests passed!")
+    sys.exit(0)
@@ -7,6 +7,7 @@ import os
 import sys
 from pymediainfo import MediaInfo
 from pathlib import Path
+from formatters import format_value
 
 def test_translation_functionality():
     """Test translation functionality"""
@@ -74,45 +75,6 @@ def test_mediainfo_parsing():
         print(f"❌ Error parsing file: {e}")
         return False
 
-def format_value_test(attr_name, value):
-    """Test the value formatting function"""
-    if attr_name in ["duration"]:
-        try:
-            ms = int(float(value))
-            seconds = ms // 1000
-            hours = seconds // 3600
-            minutes = (seconds % 3600) // 60
-            secs = seconds % 60
-            if hours > 0:
-                return f"{hours:02d}:{minutes:02d}:{secs:02d}"
-            else:
-                return f"{minutes:02d}:{secs:02d}"
-        except:
-            return str(value)
-    elif attr_name in ["file_size", "stream_size"]:
-        try:
-            size = int(float(value))
-            for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-                if size < 1024.0:
-                    return f"{size:.1f} {unit}"
-                size /= 1024.0
-            return f"{size:.1f} PB"
-        except:
-            return str(value)
-    elif attr_name in ["bit_rate", "overall_bit_rate", "maximum_bit_rate"]:
-        try:
-            bitrate = int(float(value))
-            if bitrate >= 1000000:
-                return f"{bitrate/1000000:.1f} Mbps"
-            elif bitrate >= 1000:
-                return f"{bitrate/1000:.1f} kbps"
-            else:
-                return f"{bitrate} bps"
-        except:
-            return str(value)
-    
-    return str(value)
-
 def test_value_formatting():
     """Test value formatting functions"""
     print("\n🧪 Testing value formatting...")
@@ -125,7 +87,7 @@ def test_value_formatting():
     ]
     
     for attr, value, expected in test_cases:
-        result = format_value_test(attr, value)
+        result = format_value(attr, value)
         status = "✅" if result == expected else "❌"
         print(f"  {status} {attr}: {value} → {result} (expected: {expected})")
 
@@ -181,6 +143,22 @@ def test_structured_display():
         print(f"❌ Structured display test failed: {e}")
         return False
 
+def test_lazy_gui_imports():
+    """Importing the viewer module must not load the GUI stack or libmediainfo"""
+    print("\n🧪 Testing lazy imports...")
+    
+    import subprocess
+    code = (
+        "import sys, mediainfo_viewer; "
+        "print(','.join(m for m in ('customtkinter', 'tkinter', 'pymediainfo', 'PIL', 'json') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    loaded = result.stdout.strip()
+    print(f"✅ Heavy modules loaded at import: {loaded or 'none'}")
+    assert result.returncode == 0, result.stderr
+    assert loaded == ""
+
 def main():
     print("🎬 MediaInfo Viewer - Enhanced Test Suite")
     print("=" * 50)
@@ -200,6 +178,9 @@ def main():
     # Test structured display
     display_test = test_structured_display()
     
+    # Test lazy imports
+    test_lazy_gui_imports()
+    
     print("\n" + "=" * 50)
     if ui_test and translation_test and parsing_test and display_test:
         print("🎉 All tests passed! The enhanced MediaInfo Viewer should work correctly.")
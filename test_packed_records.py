@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test script for packed scan record transfer
+"""
+
+import io
+import json
+import sys
+
+from packed_records import PackedRecord, pack_records, unpack_records
+from scanner import write_ndjson
+
+
+RECORDS = [
+    {'path': '/media/一.mkv', 'tracks': [{'track_type': 'General', 'format': 'Matroska'}]},
+    {'path': '/media/bad.mkv', 'error': 'unreadable'},
+    {'path': '/media/two.mp4', 'tracks': [], 'bytes_read': 4096},
+]
+
+
+def test_round_trip():
+    """Unpacked records read back exactly as the dicts that were packed"""
+    print("🧪 Testing pack/unpack round trip...")
+
+    packed = unpack_records(pack_records(RECORDS))
+    print(f"✅ Unpacked {len(packed)} records")
+
+    assert all(isinstance(record, PackedRecord) for record in packed)
+    assert [dict(record) for record in packed] == RECORDS
+    assert packed[0]['tracks'][0]['format'] == 'Matroska'
+    assert packed[2].get('bytes_read') == 4096 and packed[2].get('identity') is None
+    assert unpack_records(pack_records([])) == []
+
+
+def test_lazy_decoding():
+    """Error checks and NDJSON output work without decoding any record"""
+    print("\n🧪 Testing lazy decoding...")
+
+    packed = unpack_records(pack_records(RECORDS))
+    assert ['error' in record for record in packed] == [False, True, False]
+    assert ['tracks' in record for record in packed] == [True, False, True]
+
+    out = io.StringIO()
+    files, errors = write_ndjson(packed, out)
+    assert all(record._record is None for record in packed)
+    print(f"✅ Wrote {files} lines ({errors} errors) without decoding")
+
+    assert (files, errors) == (3, 1)
+    assert [json.loads(line) for line in out.getvalue().splitlines()] == RECORDS
+    # Text stays available once a record has been decoded
+    assert packed[0]['path'] == '/media/一.mkv'
+    assert json.loads(packed[0].text) == RECORDS[0]
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_lazy_decoding()
+    print("\n🎉 Packed record tests passed!")
+    sys.exit(0)
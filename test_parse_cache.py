@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Test script for the persistent MediaInfo parse cache
+"""
+
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import wave
+
+import parse_cache
+from parse_cache import ParseCache, content_fingerprint, file_identity, load_media
+
+
+def write_test_wav(path, seconds=1):
+    """Write a small silent WAV file that libmediainfo can analyse"""
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(2)
+        wav.setsampwidth(2)
+        wav.setframerate(8000)
+        wav.writeframes(b'\x00\x00' * 2 * 8000 * seconds)
+
+
+def test_cache_hit_after_miss():
+    """A second parse of an unchanged file should be served from the cache"""
+    print("🧪 Testing parse cache hits and misses...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        media_file = os.path.join(tmp, 'sample.wav')
+        write_test_wav(media_file)
+        cache = ParseCache(os.path.join(tmp, 'cache.sqlite3'))
+
+        first = cache.parse(media_file)
+        second = cache.parse(media_file)
+        print(f"✅ Hits: {cache.hits}, misses: {cache.misses}")
+
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert first == second
+        assert [t.track_type for t in second.tracks] == ['General', 'Audio']
+        cache.close()
+
+
+def test_cache_invalidated_by_change():
+    """Modifying a file should change its identity and miss the cache"""
+    print("\n🧪 Testing parse cache invalidation...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        media_file = os.path.join(tmp, 'sample.wav')
+        write_test_wav(media_file)
+        cache = ParseCache(os.path.join(tmp, 'cache.sqlite3'))
+
+        cache.parse(media_file)
+        before = file_identity(media_file)
+        write_test_wav(media_file, seconds=2)
+        st = os.stat(media_file)
+        os.utime(media_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1000000))
+        assert file_identity(media_file) != before
+
+        media_info = cache.parse(media_file)
+        print(f"✅ Duration after change: {media_info.tracks[0].duration}")
+        assert cache.misses == 2
+        assert len(cache) == 1
+        cache.close()
+
+
+def test_cache_eviction():
+    """The cache should stay within its size budget"""
+    print("\n🧪 Testing parse cache eviction...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ParseCache(os.path.join(tmp, 'cache.sqlite3'), max_bytes=2048)
+        payload = os.urandom(600).hex()
+        for i in range(5):
+            path = os.path.join(tmp, f'file{i}.bin')
+            with open(path, 'wb') as f:
+                f.write(b'x' * i)
+            cache.put(path, payload)
+
+        print(f"✅ Entries kept: {len(cache)}")
+        assert len(cache) < 5
+        assert cache.get(os.path.join(tmp, 'file4.bin')) == payload
+        cache.close()
+
+
+def test_quick_pass_before_full():
+    """Files over the threshold should get a quick pass first, and only on a cache miss"""
+    print("\n🧪 Testing quick first pass...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        media_file = os.path.join(tmp, 'sample.wav')
+        write_test_wav(media_file)
+        cache = ParseCache(os.path.join(tmp, 'cache.sqlite3'))
+        quick = []
+
+        full = load_media(media_file, cache, quick_threshold=0, on_quick=quick.append)
+        print(f"✅ Quick tracks: {[t.track_type for t in quick[0].tracks]}")
+        assert len(quick) == 1
+        assert [t.track_type for t in quick[0].tracks] == [t.track_type for t in full.tracks]
+
+        # Served from the cache: no quick pass needed
+        load_media(media_file, cache, quick_threshold=0, on_quick=quick.append)
+        assert len(quick) == 1 and cache.hits == 1
+
+        # Files under the threshold go straight to the full parse
+        load_media(media_file, None, quick_threshold=1 << 40, on_quick=quick.append)
+        assert len(quick) == 1
+        cache.close()
+
+
+def test_checksums_in_same_read():
+    """Checksums are added to the General track; cached reports without them are re-read"""
+    print("\n🧪 Testing checksums...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        media_file = os.path.join(tmp, 'sample.wav')
+        write_test_wav(media_file)
+        cache = ParseCache(os.path.join(tmp, 'cache.sqlite3'))
+        with open(media_file, 'rb') as f:
+            data = f.read()
+
+        plain = load_media(media_file, cache)
+        hashed = load_media(media_file, cache, checksums=('md5', 'sha256'))
+        general = hashed.general_tracks[0]
+        print(f"✅ MD5: {general.md5}")
+        assert general.md5 == hashlib.md5(data).hexdigest()
+        assert general.sha256 == hashlib.sha256(data).hexdigest()
+        # A cached report without the checksums is a miss, not a hit
+        assert (cache.hits, cache.misses) == (0, 2)
+        # Apart from the checksums, the report matches a parse by path
+        report = general.to_data()
+        del report['md5'], report['sha256']
+        assert report == plain.general_tracks[0].to_data()
+
+        load_media(media_file, cache, checksums=('md5',))
+        assert (cache.hits, cache.misses) == (1, 2)
+        cache.close()
+
+
+def test_fingerprint_reuse_across_copies():
+    """Copied and renamed files get their report by content, under their own name"""
+    print("\n🧪 Testing content fingerprints...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        original = os.path.join(tmp, 'original.wav')
+        write_test_wav(original)
+        cache = ParseCache(os.path.join(tmp, 'cache.sqlite3'))
+        first = load_media(original, cache, checksums=('md5',))
+
+        copy = os.path.join(tmp, 'archive', 'copy.wav')
+        os.makedirs(os.path.dirname(copy))
+        shutil.copyfile(original, copy)
+        moved = os.path.join(tmp, 'moved.wav')
+        os.rename(original, moved)
+
+        parse = parse_cache.parse_media_xml
+        parse_cache.parse_media_xml = None  # libmediainfo must not be needed
+        try:
+            copied = load_media(copy, cache)
+            renamed = load_media(moved, cache)
+        finally:
+            parse_cache.parse_media_xml = parse
+        print(f"✅ Fingerprint hits: {cache.fingerprint_hits}")
+        assert cache.fingerprint_hits == 1
+        assert copied.general_tracks[0].complete_name == copy
+        assert copied.general_tracks[0].folder_name == os.path.dirname(copy)
+        assert renamed.general_tracks[0].file_name == 'moved'
+        # Checksums of the original aren't vouched for by a sampled fingerprint
+        assert first.general_tracks[0].md5 and copied.general_tracks[0].md5 is None
+        assert copied.audio_tracks[0].to_data() == first.audio_tracks[0].to_data()
+
+        assert content_fingerprint(copy) == content_fingerprint(moved)
+        assert cache.duplicates() == [(content_fingerprint(copy), [copy, moved])]
+
+        # Reloading a path already recorded neither fingerprints it nor writes
+        changes = cache._conn.total_changes
+        fingerprint = parse_cache.content_fingerprint
+        parse_cache.content_fingerprint = None
+        try:
+            load_media(moved, cache)
+        finally:
+            parse_cache.content_fingerprint = fingerprint
+        assert cache._conn.total_changes == changes + 1  # only the LRU timestamp
+        os.remove(moved)
+        assert cache.duplicates() == []
+        cache.close()
+
+
+if __name__ == "__main__":
+    test_cache_hit_after_miss()
+    test_cache_invalidated_by_change()
+    test_cache_eviction()
+    test_quick_pass_before_full()
+    test_checksums_in_same_read()
+    test_fingerprint_reuse_across_copies()
+    print("\n🎉 Parse cache tests passed!")
+    sys.exit(0)
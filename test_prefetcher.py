@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test script for the neighbour prefetcher
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from mediainfo_viewer import MediaInfoViewer
+from prefetcher import Prefetcher, sibling_files
+from test_parse_cache import write_test_wav
+
+
+def make_folder(tmp, names):
+    for i, name in enumerate(names):
+        path = os.path.join(tmp, name)
+        with open(path, 'wb') as f:
+            f.write(b'x')
+        # Modification times in reverse name order
+        os.utime(path, (1000 - i, 1000 - i))
+
+
+def test_sibling_order():
+    """Siblings follow the opened file by name or by modification time"""
+    print("🧪 Testing sibling order...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        make_folder(tmp, ['a.mp4', 'b.mkv', 'notes.txt', 'c.mov', 'd.mp3'])
+        names = lambda paths: [os.path.basename(path) for path in paths]
+        assert names(sibling_files(os.path.join(tmp, 'a.mp4'), 2)) == ['b.mkv', 'c.mov']
+        assert names(sibling_files(os.path.join(tmp, 'c.mov'), 5)) == ['d.mp3']
+        assert names(sibling_files(os.path.join(tmp, 'c.mov'), 5, order='mtime')) == ['b.mkv', 'a.mp4']
+        # A file that isn't listed media itself has no neighbours
+        assert sibling_files(os.path.join(tmp, 'notes.txt'), 2) == []
+    print("✅ Siblings ordered")
+
+
+def test_prefetch_backs_off():
+    """Nothing is parsed while the foreground is busy; results are taken once"""
+    print("\n🧪 Testing prefetch back-off...")
+
+    busy = threading.Event()
+    busy.set()
+    parsed = []
+    done = threading.Event()
+
+    def parse(path):
+        parsed.append(os.path.basename(path))
+        if len(parsed) == 2:
+            done.set()
+        return object(), []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        make_folder(tmp, ['a.mp4', 'b.mp4', 'c.mp4', 'd.mp4'])
+        prefetcher = Prefetcher(parse, is_busy=busy.is_set, count=2, interval=0)
+        try:
+            prefetcher.schedule(os.path.join(tmp, 'a.mp4'))
+            time.sleep(0.3)
+            assert parsed == []
+            busy.clear()
+            assert done.wait(5)
+            assert parsed == ['b.mp4', 'c.mp4']
+            deadline = time.time() + 5
+            while len(prefetcher.store) < 2 and time.time() < deadline:
+                time.sleep(0.01)
+            assert prefetcher.take(os.path.join(tmp, 'b.mp4')) is not None
+            assert prefetcher.take(os.path.join(tmp, 'b.mp4')) is None
+        finally:
+            prefetcher.close()
+    print(f"✅ Prefetched after back-off: {parsed}")
+
+
+def test_take_joins_running_prefetch():
+    """Taking a file that is being prefetched waits for that parse instead of starting another"""
+    print("\n🧪 Testing hand-over of a running prefetch...")
+
+    started = threading.Event()
+    release = threading.Event()
+    parsed = []
+
+    def parse(path):
+        parsed.append(os.path.basename(path))
+        started.set()
+        release.wait(5)
+        return 'media', []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        make_folder(tmp, ['a.mp4', 'b.mp4'])
+        prefetcher = Prefetcher(parse, count=1, interval=0)
+        try:
+            prefetcher.schedule(os.path.join(tmp, 'a.mp4'))
+            assert started.wait(5)
+            b = os.path.join(tmp, 'b.mp4')
+            assert prefetcher.take(b) is None
+            threading.Timer(0.2, release.set).start()
+            assert prefetcher.take(b, wait=True) == ('media', [])
+            assert parsed == ['b.mp4']
+        finally:
+            prefetcher.close()
+    print("✅ Running prefetch handed over")
+
+
+def test_prefetch_with_viewer_parse():
+    """The viewer's own parse runs on the prefetch thread and its results are opened from the store"""
+    print("\n🧪 Testing prefetch through the viewer's parse...")
+
+    # Only the state parse_file and parse_media use, without a window
+    viewer = MediaInfoViewer.__new__(MediaInfoViewer)
+    viewer.parse_cache = None
+    viewer.quick_parse_threshold = None
+    viewer.checksums = ()
+    viewer.read_window = None
+    viewer.read_stats = {}
+    viewer.prefetcher = Prefetcher(viewer.parse_media, count=2, interval=0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ('a.wav', 'b.wav', 'c.wav'):
+            write_test_wav(os.path.join(tmp, name))
+        try:
+            viewer.prefetcher.schedule(os.path.join(tmp, 'a.wav'))
+            deadline = time.time() + 10
+            while len(viewer.prefetcher.store) < 2 and time.time() < deadline:
+                time.sleep(0.01)
+            assert len(viewer.prefetcher.store) == 2
+
+            b = os.path.join(tmp, 'b.wav')
+            path, media_info, track_views = viewer.parse_file(b)
+            assert path == b and track_views[0].track_type == 'General'
+            assert b not in viewer.prefetcher.store
+            # Not prefetched any more, so parsed in the foreground
+            assert viewer.parse_file(b)[1] is not media_info
+        finally:
+            viewer.prefetcher.close()
+    print("✅ Prefetched with the viewer's parse and opened without a second parse")
+
+
+if __name__ == "__main__":
+    test_sibling_order()
+    test_prefetch_backs_off()
+    test_take_joins_running_prefetch()
+    test_prefetch_with_viewer_parse()
+    print("\n🎉 Prefetcher tests passed!")
+    sys.exit(0)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test script for the headless batch scanner
+"""
+
+import io
+import json
+import os
+import sys
+import tempfile
+
+import scanner
+from library_index import LibraryIndex
+from scanner import build_parser, parse_batch, diff_tree, iter_media_files, scan, update_tree, write_ndjson, parse_extensions
+from test_parse_cache import write_test_wav
+
+
+def make_tree(root):
+    """Create a small directory tree with media and non-media files"""
+    os.makedirs(os.path.join(root, 'a', 'b'))
+    write_test_wav(os.path.join(root, 'one.wav'))
+    write_test_wav(os.path.join(root, 'a', 'two.wav'))
+    write_test_wav(os.path.join(root, 'a', 'b', 'three.wav'))
+    with open(os.path.join(root, 'a', 'notes.txt'), 'w') as f:
+        f.write('not media')
+
+
+def test_walk_filters_extensions():
+    """The walker should recurse and honour the extension filter"""
+    print("🧪 Testing directory walk...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        make_tree(tmp)
+        found = sorted(os.path.relpath(p, tmp) for p in iter_media_files(tmp))
+        everything = list(iter_media_files(tmp, parse_extensions('*')))
+        print(f"✅ Found: {found}")
+
+        assert found == sorted(['one.wav', os.path.join('a', 'two.wav'), os.path.join('a', 'b', 'three.wav')])
+        assert len(everything) == 4
+
+
+def test_scan_streams_ndjson():
+    """Scanning over a process pool should emit one record per file"""
+    print("\n🧪 Testing parallel scan to NDJSON...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        make_tree(tmp)
+        out = io.StringIO()
+        files, errors = write_ndjson(scan(iter_media_files(tmp), workers=2, batch_size=1), out)
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        print(f"✅ Scanned {files} files with {errors} errors")
+
+        assert (files, errors) == (3, 0)
+        assert len(records) == 3
+        for record in records:
+            assert record['tracks'][0]['track_type'] == 'General'
+            assert record['tracks'][1]['format'] == 'PCM'
+
+
+def crashing_parse_batch(paths, *options):
+    """parse_batch, except that a batch holding a file named crash.* kills its worker"""
+    if any(os.path.basename(path).startswith('crash.') for path in paths):
+        os._exit(3)
+    return parse_batch(paths, *options)
+
+
+def test_scan_survives_worker_crash():
+    """A file that kills its worker costs only its own record, not the scan"""
+    print("\n🧪 Testing scan past a crashing file...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        names = [f'{i:02}.wav' for i in range(12)] + ['crash.wav']
+        for name in names:
+            write_test_wav(os.path.join(tmp, name))
+        scanner.parse_batch = crashing_parse_batch
+        try:
+            records = list(scan(iter_media_files(tmp), workers=2, batch_size=2))
+        finally:
+            scanner.parse_batch = parse_batch
+        failed = [os.path.basename(record['path']) for record in records if 'error' in record]
+        print(f"✅ Scanned {len(records)} files, failed: {failed}")
+
+        assert sorted(os.path.basename(record['path']) for record in records) == sorted(names)
+        assert failed == ['crash.wav']
+
+
+def test_incremental_update():
+    """Only new and changed files are parsed; deleted files leave the library"""
+    print("\n🧪 Testing incremental library update...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, 'library')
+        make_tree(root)
+        library = LibraryIndex(os.path.join(tmp, 'library.sqlite3'))
+        args = build_parser().parse_args(['update', root, '-j', '1'])
+
+        assert update_tree(library, root, args) == (3, 0)
+        assert diff_tree(library, root) == ([], [])
+
+        changed = os.path.join(root, 'a', 'two.wav')
+        write_test_wav(changed, seconds=2)
+        st = os.stat(changed)
+        os.utime(changed, ns=(st.st_atime_ns, st.st_mtime_ns + 1000000))
+        removed = os.path.join(root, 'one.wav')
+        os.remove(removed)
+        write_test_wav(os.path.join(root, 'a', 'b', 'four.wav'))
+
+        changed_files, removed_files = diff_tree(library, root)
+        print(f"✅ Changed: {[os.path.basename(p) for p in changed_files]}, "
+              f"removed: {[os.path.basename(p) for p in removed_files]}")
+        assert sorted(changed_files) == sorted([changed, os.path.join(root, 'a', 'b', 'four.wav')])
+        assert removed_files == [removed]
+
+        assert update_tree(library, root, args) == (2, 1)
+        assert len(library) == 3
+        assert library.count(['track_type=Audio', 'duration>=2000']) == 1
+        library.close()
+
+
+if __name__ == "__main__":
+    test_walk_filters_extensions()
+    test_scan_streams_ndjson()
+    test_scan_survives_worker_crash()
+    test_incremental_update()
+    print("\n🎉 Scanner tests passed!")
+    sys.exit(0)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test script for the attribute search indexes
+"""
+
+import sys
+import time
+
+from search_index import TrackSearchIndex, GlobalSearchIndex
+from track_model import AttributeRow, TrackView
+
+
+def test_track_search_matches():
+    """Queries should match names, translated names and values"""
+    print("🧪 Testing track search index...")
+
+    index = TrackSearchIndex([
+        ("Duration", "duration", "01:05", 65000),
+        ("格式", "format", "PCM", "PCM"),
+        ("Sampling Rate", "sampling_rate", "8000", 8000),
+    ])
+
+    assert index.search("") is None
+    assert index.search("  ") is None
+    assert index.search("format") == {1}
+    assert index.search("格式") == {1}
+    assert index.search("PCM") == {1}
+    assert index.search("8000") == {2}
+    assert index.search("rat") == {0, 2}
+    # Narrowing a query reuses the previous result
+    assert index.search("rate") == {2}
+    assert index.search("ra") == {0, 2}
+    print("✅ Search results correct")
+
+
+def test_track_search_speed():
+    """A keystroke over 2,000 attributes should take well under 5 ms"""
+    print("\n🧪 Testing track search speed...")
+
+    index = TrackSearchIndex(
+        (f"Attribute {i}", f"attribute_{i}", f"value {i * 37}", i * 37) for i in range(2000)
+    )
+    start = time.perf_counter()
+    for query in ("a", "at", "att", "attr", "attribute 1", "value 9"):
+        index.search(query)
+    per_query = (time.perf_counter() - start) / 6 * 1000
+    print(f"✅ {per_query:.2f} ms per keystroke")
+    assert per_query < 5
+
+
+def make_views(audio_languages):
+    """Build track views for a file with one audio track per language"""
+    general = TrackView(0, 'General', None, 'Matroska', [
+        AttributeRow('format', 'Matroska', 'Matroska', 'Basic Information'),
+    ], {})
+    views = [general]
+    for i, language in enumerate(audio_languages, start=1):
+        views.append(TrackView(i, 'Audio', str(i), 'AAC', [
+            AttributeRow('format', 'AAC', 'AAC', 'Basic Information'),
+            AttributeRow('language', language, language, 'Other Properties'),
+            AttributeRow('sampling_rate', 48000, '48000', 'Audio Properties'),
+        ], {}))
+    return views
+
+
+def test_global_search():
+    """Hits should span tracks and files and support name=value queries"""
+    print("\n🧪 Testing global search index...")
+
+    index = GlobalSearchIndex()
+    index.add_file('/a.mkv', make_views(['en', 'ja']))
+    index.add_file('/b.mkv', make_views(['ja']))
+    index.add_file('/c.mkv', make_views(['fr']), name_translations=[lambda attr: {'language': '语言'}.get(attr, attr)])
+
+    hits = index.search('language=ja')
+    print(f"✅ language=ja: {hits}")
+    assert sorted((hit.file_path, hit.track_index) for hit in hits) == [('/a.mkv', 2), ('/b.mkv', 1)]
+    assert all(hit.attr == 'language' for hit in hits)
+
+    assert {hit.file_path for hit in index.search('aac')} == {'/a.mkv', '/b.mkv', '/c.mkv'}
+    assert [hit.value for hit in index.search('语言')] == ['fr']
+    # Prefix matches rank below whole-token matches
+    hits = index.search('matr')
+    assert hits and all(hit.attr == 'format' for hit in hits)
+    assert index.search('format')[0].score > index.search('form')[0].score
+
+    # Re-adding a file replaces it, removing drops it
+    index.add_file('/b.mkv', make_views(['de']))
+    assert [hit.file_path for hit in index.search('language=ja')] == ['/a.mkv']
+    index.remove_file('/a.mkv')
+    assert index.search('language=ja') == []
+    assert index.search('') == []
+
+
+def test_global_search_speed():
+    """Lookups across hundreds of files should stay well under 100 ms"""
+    print("\n🧪 Testing global search speed...")
+
+    index = GlobalSearchIndex()
+    languages = ['en', 'ja', 'fr', 'de', 'es', 'zh']
+    for i in range(500):
+        index.add_file(f'/library/{i}.mkv', make_views(languages[:1 + i % 6]))
+
+    start = time.perf_counter()
+    for query in ('language=ja', 'aac', 'sampling', '48000', 'e'):
+        index.search(query)
+    per_query = (time.perf_counter() - start) / 5 * 1000
+    print(f"✅ {per_query:.2f} ms per query over {len(index)} attributes")
+    assert per_query < 100
+
+
+if __name__ == "__main__":
+    test_track_search_matches()
+    test_track_search_speed()
+    test_global_search()
+    test_global_search_speed()
+    print("\n🎉 Search index tests passed!")
+    sys.exit(0)
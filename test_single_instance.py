@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test script for single-instance path forwarding
+"""
+
+import os
+import socket
+import stat
+import sys
+import tempfile
+import threading
+
+import single_instance
+from single_instance import InstanceServer, forward_paths
+
+
+def test_forward_to_running_instance():
+    """Paths sent by a second launch should reach the first instance"""
+    print("🧪 Testing path forwarding...")
+    if not single_instance.is_supported():
+        print("⚠️ Unix domain sockets not available, skipping")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sock_path = os.path.join(tmp, 'viewer.sock')
+        received = []
+        event = threading.Event()
+
+        def on_paths(paths):
+            received.extend(paths)
+            event.set()
+
+        assert not forward_paths(['a.mkv'], sock_path)
+
+        server = InstanceServer(on_paths, sock_path)
+        assert server.start()
+        try:
+            assert forward_paths(['a.mkv', '/media/b.mp4'], sock_path)
+            assert event.wait(2)
+            print(f"✅ Received: {received}")
+            assert received == [os.path.abspath('a.mkv'), '/media/b.mp4']
+
+            # A second server must not steal the socket from a live one
+            assert not InstanceServer(on_paths, sock_path).start()
+        finally:
+            server.close()
+        assert not os.path.exists(sock_path)
+
+
+def test_stale_socket_is_replaced():
+    """A socket file left behind by a crashed viewer should not block startup"""
+    print("\n🧪 Testing stale socket recovery...")
+    if not single_instance.is_supported():
+        print("⚠️ Unix domain sockets not available, skipping")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sock_path = os.path.join(tmp, 'viewer.sock')
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(sock_path)
+        stale.close()
+
+        server = InstanceServer(lambda paths: None, sock_path)
+        assert server.start()
+        print("✅ Stale socket replaced")
+        server.close()
+
+
+def test_socket_in_private_directory():
+    """Without XDG_RUNTIME_DIR the socket goes in a 0700 directory owned by the user"""
+    print("\n🧪 Testing private socket directory...")
+    if not single_instance.is_supported():
+        print("⚠️ Unix domain sockets not available, skipping")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        saved = os.environ.pop('XDG_RUNTIME_DIR', None)
+        saved_tempdir = tempfile.tempdir
+        tempfile.tempdir = tmp
+        try:
+            path = single_instance.socket_path()
+        finally:
+            tempfile.tempdir = saved_tempdir
+            if saved is not None:
+                os.environ['XDG_RUNTIME_DIR'] = saved
+
+        directory = os.path.dirname(path)
+        assert os.path.dirname(directory) == tmp
+        assert stat.S_IMODE(os.lstat(directory).st_mode) == 0o700
+        print(f"✅ Socket path: {path}")
+
+        # A loosened directory is tightened again
+        os.chmod(directory, 0o755)
+        assert single_instance.private_directory(tmp) == directory
+        assert stat.S_IMODE(os.lstat(directory).st_mode) == 0o700
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # A name planted in advance, here a symlink, is refused
+        os.symlink(tmp, os.path.join(tmp, f'mediainfo-{os.getuid()}'))
+        try:
+            single_instance.private_directory(tmp)
+        except PermissionError:
+            print("✅ Planted path refused")
+        else:
+            raise AssertionError("symlinked directory was accepted")
+
+
+if __name__ == "__main__":
+    test_forward_to_running_instance()
+    test_stale_socket_is_replaced()
+    test_socket_in_private_directory()
+    print("\n🎉 Single-instance tests passed!")
+    sys.exit(0)
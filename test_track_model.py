@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test script for the normalized track view-model
+"""
+
+import io
+import os
+import sys
+import tempfile
+
+from pymediainfo import MediaInfo
+from exporters import media_to_records, views_to_records, write_text_report
+from track_model import OTHER_CATEGORY, build_media_view, category_labels
+from test_parse_cache import write_test_wav
+
+
+def parse_sample():
+    """Parse a freshly generated WAV file"""
+    with tempfile.TemporaryDirectory() as tmp:
+        media_file = os.path.join(tmp, 'sample.wav')
+        write_test_wav(media_file)
+        return MediaInfo.parse(media_file)
+
+
+def test_rows_are_categorized():
+    """Each track should be split into category rows once, in display order"""
+    print("🧪 Testing track view rows...")
+
+    views = build_media_view(parse_sample())
+    audio = views[1]
+    categories = [category for category, _ in audio.categories()]
+    print(f"✅ Audio categories: {categories}")
+
+    assert audio.track_type == 'Audio'
+    assert categories == ['Basic Information', 'Audio Properties', OTHER_CATEGORY]
+    basic = dict((row.attr, row.formatted) for row in audio.categories()[0][1])
+    assert basic['format'] == 'PCM'
+    assert basic['duration'] == '00:01'
+    # Attributes listed in a category never repeat under "Other Properties"
+    other = [row.attr for row in audio.rows if row.category == OTHER_CATEGORY]
+    assert 'format' not in other and 'sampling_rate' not in other
+
+
+def test_exporters_read_views():
+    """JSON records and text reports should come from the prebuilt views"""
+    print("\n🧪 Testing exporters on track views...")
+
+    media_info = parse_sample()
+    views = build_media_view(media_info)
+    assert views_to_records(views) == media_to_records(media_info)
+
+    out = io.StringIO()
+    write_text_report(views, out, 'en')
+    report = out.getvalue()
+    print(f"✅ Text report has {len(report.splitlines())} lines")
+    assert "AUDIO TRACK INFORMATION" in report
+    assert "Sampling Rate" in report
+
+
+def test_rows_carry_labels():
+    """Rows should carry their display name in every language, shared between rows"""
+    print("\n🧪 Testing pretranslated labels...")
+
+    views = build_media_view(parse_sample())
+    general, audio = views
+    row = next(row for row in audio.rows if row.attr == 'sampling_rate')
+    print(f"✅ Labels: {row.labels}")
+    assert row.labels == {'en': 'Sampling Rate', 'zh': '采样率'}
+    assert next(r for r in general.rows if r.attr == 'format').labels is \
+        next(r for r in audio.rows if r.attr == 'format').labels
+    assert category_labels(OTHER_CATEGORY)['en'] == OTHER_CATEGORY
+
+
+if __name__ == "__main__":
+    test_rows_are_categorized()
+    test_exporters_read_views()
+    test_rows_carry_labels()
+    print("\n🎉 Track view-model tests passed!")
+    sys.exit(0)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test script for the compiled translation tables and language packs
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+import translations
+from translations import (add_language_pack_dir, get_attribute_name, get_available_languages,
+                          get_category_name, get_language_name, get_ui_text)
+
+
+def test_builtin_and_pack_languages():
+    """English is built in, Chinese comes from its language pack"""
+    print("🧪 Testing built-in and packaged languages...")
+
+    assert get_available_languages()[:2] == ['en', 'zh']
+    assert get_language_name('zh') == '中文'
+    assert get_ui_text('title', 'zh') == '媒体信息查看器'
+    assert get_attribute_name('sampling_rate', 'zh') == '采样率'
+    assert get_category_name('Basic Information', 'zh') == '基本信息'
+    # Unknown languages display in English
+    assert get_ui_text('title', 'xx') == get_ui_text('title', 'en')
+    print("✅ Lookups correct")
+
+
+def test_fallbacks_are_memoized():
+    """Untranslated attributes are formatted once and then served from the table"""
+    print("\n🧪 Testing memoized fallbacks...")
+
+    translations._fallback_name.cache_clear()
+    for language in ('en', 'zh', 'en'):
+        assert get_attribute_name('frame_rate_mode', language) == 'Frame Rate Mode'
+    info = translations._fallback_name.cache_info()
+    print(f"✅ Fallback cache: {info}")
+    assert info.misses == 1
+    assert 'frame_rate_mode' in translations.get_language_tables('zh').attributes
+
+
+def test_extra_language_pack():
+    """Language packs in added directories are found and loaded on first use"""
+    print("\n🧪 Testing extra language packs...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, 'de.json'), 'w', encoding='utf-8') as f:
+            json.dump({"name": "Deutsch", "ui": {"title": "MediaInfo-Betrachter"},
+                       "attributes": {"duration": "Dauer"}}, f)
+        add_language_pack_dir(tmp)
+        try:
+            assert 'de' in get_available_languages()
+            assert 'de' not in translations._compiled
+            assert get_language_name('de') == 'Deutsch'
+            assert get_attribute_name('duration', 'de') == 'Dauer'
+            # Missing UI text falls back to English
+            assert get_ui_text('ready', 'de') == 'Ready'
+            print(f"✅ Languages: {get_available_languages()}")
+        finally:
+            translations.LANGUAGE_PACK_DIRS.remove(tmp)
+            translations._available = None
+            translations._compiled.clear()
+
+
+if __name__ == "__main__":
+    test_builtin_and_pack_languages()
+    test_fallbacks_are_memoized()
+    test_extra_language_pack()
+    print("\n🎉 Translation tests passed!")
+    sys.exit(0)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Test script for the inotify directory tree watcher
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from tree_watcher import TreeWatcher, is_supported
+
+
+def poll_until(watcher, expected, timeout=5):
+    """Collect settled paths until the expected ones have all been reported"""
+    seen = set()
+    deadline = time.monotonic() + timeout
+    while not expected <= seen and time.monotonic() < deadline:
+        seen.update(watcher.poll(timeout=0.1))
+    return seen
+
+
+def test_changes_reported_once_settled():
+    """Writes are reported after they settle, including in new subdirectories"""
+    print("🧪 Testing tree watcher...")
+    if not is_supported():
+        print("⚠️ inotify unavailable, skipped")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with TreeWatcher(tmp, settle=0.3) as watcher:
+            path = os.path.join(tmp, 'clip.mp4')
+            with open(path, 'wb') as f:
+                f.write(b'x')
+                f.flush()
+                # Still being written: not reported yet
+                assert watcher.poll(timeout=0.1) == []
+                f.write(b'y')
+            assert poll_until(watcher, {path}) == {path}
+
+            subdir = os.path.join(tmp, 'day2')
+            os.mkdir(subdir)
+            assert poll_until(watcher, {subdir}) == {subdir}
+            nested = os.path.join(subdir, 'clip2.mp4')
+            with open(nested, 'wb') as f:
+                f.write(b'z')
+            os.remove(path)
+            seen = poll_until(watcher, {nested, path})
+            print(f"✅ Reported: {sorted(os.path.relpath(p, tmp) for p in seen)}")
+            assert seen == {nested, path}
+
+
+if __name__ == "__main__":
+    test_changes_reported_once_settled()
+    print("\n🎉 Tree watcher tests passed!")
+    sys.exit(0)
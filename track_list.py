@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Recycled track list for MediaInfo Viewer
+Shows any number of tracks with a fixed pool of buttons sized to the visible
+area; scrolling only rebinds the buttons' labels, and the pool is reused for
+every file that is loaded
+"""
+
+import sys
+
+import customtkinter as ctk
+
+# Height of one track button and the vertical gap around it, in pixels
+ROW_HEIGHT = 40
+ROW_PADDING = 5
+
+
+class TrackList(ctk.CTkFrame):
+    """Scrollable list of track buttons that only creates the visible rows"""
+
+    def __init__(self, master, on_select, **kwargs):
+        super().__init__(master, **kwargs)
+        self.on_select = on_select
+        self.labels = []
+        self.first = 0        # index of the track shown in the first slot
+        self.selected = None
+        self.buttons = []
+        self._slots = []      # (track index, text, selected) last drawn per button
+        self._visible = 1
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+        self.body = ctk.CTkFrame(self, fg_color="transparent")
+        self.body.grid(row=0, column=0, sticky="nsew", padx=(5, 0))
+        self.body.grid_columnconfigure(0, weight=1)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.yview)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+
+        theme = ctk.ThemeManager.theme["CTkButton"]
+        self._normal_color = theme["fg_color"]
+        self._selected_color = theme["hover_color"]
+
+        self.body.bind("<Configure>", self._on_resize)
+        self._bind_wheel(self.body)
+
+    def set_tracks(self, labels, selected=None):
+        """Show a new list of tracks, scrolled to the top"""
+        self.labels = list(labels)
+        self.first = 0
+        self.selected = None
+        if selected is not None:
+            self.select(selected)
+        else:
+            self._refresh()
+
+    def relabel(self, labels):
+        """Replace the labels of the listed tracks, keeping scroll position and selection"""
+        self.labels = list(labels)
+        if self.selected is not None and self.selected >= len(self.labels):
+            self.selected = None
+        self._scroll_to(self.first)
+
+    def select(self, index):
+        """Highlight a track and scroll it into view"""
+        self.selected = index
+        if index < self.first:
+            self._scroll_to(index)
+        elif index >= self.first + self._visible:
+            self._scroll_to(index - self._visible + 1)
+        else:
+            self._refresh()
+
+    def yview(self, *args):
+        """Scroll in response to the scrollbar ('moveto' fraction or 'scroll' n 'units'/'pages')"""
+        if not args:
+            return
+        if args[0] == 'moveto':
+            self._scroll_to(round(float(args[1]) * len(self.labels)))
+        elif args[0] == 'scroll':
+            step = self._visible if args[2] == 'pages' else 1
+            self._scroll_to(self.first + int(args[1]) * step)
+
+    def _scroll_to(self, first):
+        self.first = max(0, min(first, len(self.labels) - self._visible))
+        self._refresh()
+
+    def _on_resize(self, event):
+        visible = max(1, event.height // (ROW_HEIGHT + 2 * ROW_PADDING))
+        if visible != self._visible:
+            self._visible = visible
+            self._scroll_to(self.first)
+
+    def _on_wheel(self, event):
+        if event.num == 4:
+            delta = -1
+        elif event.num == 5:
+            delta = 1
+        else:
+            # Windows reports multiples of 120 per notch, macOS small deltas
+            delta = -event.delta // 120 if sys.platform == 'win32' else -event.delta
+        if delta:
+            self._scroll_to(self.first + delta)
+
+    def _bind_wheel(self, widget):
+        if sys.platform.startswith('linux'):
+            widget.bind("<Button-4>", self._on_wheel, add="+")
+            widget.bind("<Button-5>", self._on_wheel, add="+")
+        else:
+            widget.bind("<MouseWheel>", self._on_wheel, add="+")
+
+    def _on_click(self, slot):
+        index = self.first + slot
+        if index < len(self.labels):
+            self.on_select(index)
+
+    def _refresh(self):
+        """Draw the visible slice of tracks onto the button pool, touching only changed buttons"""
+        count = min(self._visible, len(self.labels) - self.first)
+
+        while len(self.buttons) < count:
+            slot = len(self.buttons)
+            button = ctk.CTkButton(
+                self.body,
+                text="",
+                command=lambda slot=slot: self._on_click(slot),
+                height=ROW_HEIGHT,
+                anchor="w"
+            )
+            self._bind_wheel(button)
+            self.buttons.append(button)
+            self._slots.append(None)
+
+        for slot, button in enumerate(self.buttons):
+            if slot >= count:
+                if self._slots[slot] is not None:
+                    button.grid_remove()
+                    self._slots[slot] = None
+                continue
+
+            index = self.first + slot
+            state = (index, self.labels[index], index == self.selected)
+            previous = self._slots[slot]
+            if previous == state:
+                continue
+            if previous is None:
+                button.grid(row=slot, column=0, sticky="ew", pady=ROW_PADDING)
+            if previous is None or previous[1:] != state[1:]:
+                button.configure(
+                    text=state[1],
+                    fg_color=self._selected_color if state[2] else self._normal_color
+                )
+            self._slots[slot] = state
+
+        if self.labels:
+            self.scrollbar.set(self.first / len(self.labels), (self.first + count) / len(self.labels))
+        else:
+            self.scrollbar.set(0, 1)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Track view-model for MediaInfo Viewer
+Each parsed track is normalized once into categorized, pre-formatted attribute
+rows that the tree, the search and the exporters all read from
+"""
+
+from formatters import format_column
+from translations import get_attribute_name, get_available_languages, get_category_name
+
+# Attributes shown under each category, in display order
+CATEGORIES = {
+    "Basic Information": [
+        "format", "format_profile", "codec_id", "duration", "file_size",
+        "overall_bit_rate", "track_id", "stream_identifier"
+    ],
+    "Video Properties": [
+        "width", "height", "display_aspect_ratio", "frame_rate", "bit_rate",
+        "bit_depth", "chroma_subsampling", "color_space", "scan_type", "pixel_aspect_ratio"
+    ],
+    "Audio Properties": [
+        "channel_s", "sampling_rate", "bit_rate", "compression_mode",
+        "channel_layout", "bit_depth", "channel_positions"
+    ],
+    "Technical Details": [
+        "writing_library", "encoded_date", "tagged_date", "color_primaries",
+        "transfer_characteristics", "matrix_coefficients", "commercial_name", "internet_media_type",
+        "md5", "sha256"
+    ],
+    "Metadata": [
+        "title", "performer", "album", "track_name", "artist", "genre",
+        "recorded_date", "copyright", "comment"
+    ]
+}
+
+# Catch-all category for attributes not listed above
+OTHER_CATEGORY = "Other Properties"
+
+# Every attribute that belongs to a named category
+CATEGORIZED_ATTRIBUTES = frozenset(attr for attrs in CATEGORIES.values() for attr in attrs)
+
+# attribute / category -> {language: display name}, shared by every row
+_ATTRIBUTE_LABELS = {}
+_CATEGORY_LABELS = {}
+
+
+def attribute_labels(attr):
+    """Get an attribute's display name in every UI language"""
+    labels = _ATTRIBUTE_LABELS.get(attr)
+    if labels is None:
+        labels = _ATTRIBUTE_LABELS[attr] = {
+            language: get_attribute_name(attr, language) for language in get_available_languages()
+        }
+    return labels
+
+
+def category_labels(category):
+    """Get a category's display name in every UI language"""
+    labels = _CATEGORY_LABELS.get(category)
+    if labels is None:
+        labels = _CATEGORY_LABELS[category] = {
+            language: get_category_name(category, language) for language in get_available_languages()
+        }
+    return labels
+
+
+def relevant_categories(track_type):
+    """Get the named categories displayed for a track type"""
+    track_type = (track_type or "").lower()
+    if track_type == "video":
+        return ["Basic Information", "Video Properties", "Technical Details"]
+    elif track_type == "audio":
+        return ["Basic Information", "Audio Properties", "Metadata"]
+    return ["Basic Information", "Technical Details", "Metadata"]
+
+
+def format_rows(rows):
+    """Fill in the formatted values of rows, one attribute column at a time"""
+    columns = {}
+    for row in rows:
+        columns.setdefault(row.attr, []).append(row)
+    for attr, column in columns.items():
+        for row, formatted in zip(column, format_column(attr, [row.raw for row in column])):
+            row.formatted = formatted
+
+
+class AttributeRow:
+    """A single displayable attribute of a track"""
+    __slots__ = ('attr', 'raw', 'formatted', 'category', 'labels')
+
+    def __init__(self, attr, raw, formatted, category):
+        self.attr = attr
+        self.raw = raw
+        self.formatted = formatted
+        self.category = category
+        # Display name per UI language, so switching language needs no lookups
+        self.labels = attribute_labels(attr)
+
+    def __repr__(self):
+        return f"<AttributeRow {self.category}/{self.attr}={self.formatted!r}>"
+
+
+class TrackView:
+    """Normalized representation of one parsed track"""
+    __slots__ = ('index', 'track_type', 'track_id', 'format', 'rows', 'data')
+
+    def __init__(self, index, track_type, track_id, format, rows, data):
+        self.index = index
+        self.track_type = track_type
+        self.track_id = track_id
+        self.format = format
+        # Displayable rows grouped by category, in display order
+        self.rows = rows
+        # Every non-empty attribute as a string, as exported to JSON
+        self.data = data
+
+    def categories(self):
+        """Get (category, rows) pairs in display order"""
+        groups = []
+        for row in self.rows:
+            if not groups or groups[-1][0] != row.category:
+                groups.append((row.category, []))
+            groups[-1][1].append(row)
+        return groups
+
+    def __repr__(self):
+        return f"<TrackView #{self.index} {self.track_type} ({len(self.rows)} rows)>"
+
+
+def track_to_dict(track):
+    """Get all non-empty attributes of a track as a name -> string mapping"""
+    track_data = {}
+    for attr_name, value in sorted(track.to_data().items()):
+        if not attr_name.startswith('_') and value is not None:
+            track_data[attr_name] = str(value)
+    return track_data
+
+
+def _collect_track_view(track, index):
+    """Build a TrackView whose rows are not formatted yet"""
+    attributes = track.to_data()
+    track_type = track.track_type or "Unknown"
+    data = track_to_dict(track)
+
+    rows = []
+    for category in relevant_categories(track_type):
+        for attr in CATEGORIES[category]:
+            value = attributes.get(attr)
+            if value is not None and data[attr].strip():
+                rows.append(AttributeRow(attr, value, None, category))
+
+    for attr_name, text in data.items():
+        if attr_name not in CATEGORIZED_ATTRIBUTES and text.strip():
+            rows.append(AttributeRow(attr_name, attributes[attr_name], None, OTHER_CATEGORY))
+
+    return TrackView(index, track_type, track.track_id, track.format, rows, data)
+
+
+def build_track_view(track, index=0):
+    """Normalize a pymediainfo Track into a TrackView"""
+    view = _collect_track_view(track, index)
+    format_rows(view.rows)
+    return view
+
+
+def build_media_view(media_info):
+    """Normalize every track of a parsed file, formatting its values one attribute column at a time"""
+    views = [_collect_track_view(track, i) for i, track in enumerate(media_info.tracks)]
+    format_rows([row for view in views for row in view.rows])
+    return views
@@ -1,9 +1,17 @@
 #!/usr/bin/env python3
 """
 Translation module for MediaInfo Viewer
-Provides Chinese translations for all MediaInfo attributes and UI elements
+English is built in; other languages (Chinese included) are language packs in
+languages/<code>.json, loaded on first use and compiled into flat lookup tables
 """
 
+import functools
+import os
+import threading
+
+# Directories searched for language packs, in order
+LANGUAGE_PACK_DIRS = [os.path.join(os.path.dirname(os.path.abspath(__file__)), 'languages')]
+
 # UI element translations
 UI_TRANSLATIONS = {
     'en': {
@@ -16,6 +24,7 @@ UI_TRANSLATIONS = {
         'ready': 'Ready',
         'loading': 'Loading file...',
         'file_loaded': 'File loaded successfully',
+        'file_loaded_read': 'File loaded successfully · read {read} of {size}',
         'error_loading': 'Error loading file',
         'search_placeholder': '🔍 Search information...',
         'language': 'Language',
@@ -25,31 +34,33 @@ UI_TRANSLATIONS = {
         'welcome_title': '🎬 Welcome to MediaInfo Viewer',
         'welcome_features': 'Features:',
         'welcome_to_start': 'To get started:',
-        'supported_formats': 'Supported formats: Video, Audio, Image, and more!'
-    },
-    'zh': {
-        'title': '媒体信息查看器',
-        'open_file': '📁 打开媒体文件',
-        'export_info': '💾 导出信息',
-        'tracks': '📋 音视频轨道',
-        'media_information': '📄 媒体信息',
-        'no_file_selected': '未选择文件',
-        'ready': '就绪',
-        'loading': '正在加载文件...',
-        'file_loaded': '文件加载成功',
-        'error_loading': '文件加载错误',
-        'search_placeholder': '🔍 搜索信息...',
-        'language': '语言',
-        'category': '类别',
-        'attribute': '属性',
-        'value': '值',
-        'welcome_title': '🎬 欢迎使用媒体信息查看器',
-        'welcome_features': '功能特性：',
-        'welcome_to_start': '开始使用：',
-        'supported_formats': '支持格式：视频、音频、图片等多种格式！'
+        'supported_formats': 'Supported formats: Video, Audio, Image, and more!',
+        'cache_stats': 'Cache: {hits} hits / {misses} misses',
+        'cache_disabled': 'Cache: off',
+        'search_all_files': 'All files',
+        'search_results': '{count} matches in {files} files',
+        'file': 'File',
+        'track': 'Track',
+        'load_stats': 'Queued: {queued} · Parsing: {in_flight}',
+        'loading_full': 'Quick scan shown, analysing full file...',
+        'more_rows': '⋯ {count} more',
+        'exporting': 'Exporting... {percent}%',
+        'export_cancelled': 'Export cancelled',
+        'cancel_export': 'Cancel',
+        'export_all_files': 'Export all {count} open files? Choose No to export only the current file.'
     }
 }
 
+# Language menu names of the built-in languages
+LANGUAGE_NAMES = {
+    'en': 'English'
+}
+
+# Track type translations
+TRACK_TYPE_TRANSLATIONS = {
+    'en': {}
+}
+
 # MediaInfo attribute translations
 MEDIAINFO_TRANSLATIONS = {
     'en': {
@@ -100,6 +111,8 @@ MEDIAINFO_TRANSLATIONS = {
         'matrix_coefficients': 'Matrix Coefficients',
         'commercial_name': 'Commercial Name',
         'internet_media_type': 'MIME Type',
+        'md5': 'MD5',
+        'sha256': 'SHA-256',
         
         # Metadata
         'title': 'Title',
@@ -121,91 +134,121 @@ MEDIAINFO_TRANSLATIONS = {
         'language': 'Language',
         'default': 'Default',
         'forced': 'Forced'
-    },
-    'zh': {
-        # Categories
-        'Basic Information': '基本信息',
-        'Video Properties': '视频属性',
-        'Audio Properties': '音频属性', 
-        'Technical Details': '技术细节',
-        'Metadata': '元数据',
-        'Other Properties': '其他属性',
-        
-        # Basic Information
-        'format': '格式',
-        'format_profile': '格式配置',
-        'codec_id': '编解码器ID',
-        'duration': '时长',
-        'file_size': '文件大小',
-        'overall_bit_rate': '总比特率',
-        'track_id': '轨道ID',
-        'stream_identifier': '流标识符',
-        
-        # Video Properties
-        'width': '宽度',
-        'height': '高度',
-        'display_aspect_ratio': '宽高比',
-        'frame_rate': '帧率',
-        'bit_rate': '比特率',
-        'bit_depth': '位深度',
-        'chroma_subsampling': '色度子采样',
-        'color_space': '色彩空间',
-        'scan_type': '扫描方式',
-        'pixel_aspect_ratio': '像素宽高比',
-        'resolution': '分辨率',
-        
-        # Audio Properties
-        'channel_s': '声道数',
-        'sampling_rate': '采样率',
-        'compression_mode': '压缩模式',
-        'channel_layout': '声道布局',
-        'channel_positions': '声道位置',
-        
-        # Technical Details
-        'writing_library': '编码库',
-        'encoded_date': '编码日期',
-        'tagged_date': '标记日期',
-        'color_primaries': '色彩原色',
-        'transfer_characteristics': '传输特性',
-        'matrix_coefficients': '矩阵系数',
-        'commercial_name': '商业名称',
-        'internet_media_type': 'MIME类型',
-        
-        # Metadata
-        'title': '标题',
-        'performer': '表演者',
-        'album': '专辑',
-        'track_name': '曲目名称',
-        'artist': '艺术家',
-        'genre': '流派',
-        'recorded_date': '录制日期',
-        'copyright': '版权',
-        'comment': '注释',
-        
-        # Additional common attributes
-        'maximum_bit_rate': '最大比特率',
-        'minimum_bit_rate': '最小比特率',
-        'stream_size': '流大小',
-        'frame_count': '帧数',
-        'delay': '延迟',
-        'language': '语言',
-        'default': '默认',
-        'forced': '强制'
     }
 }
 
+class LanguageTables:
+    """Flat lookup tables for one language, compiled once on first use"""
+    __slots__ = ('language', 'name', 'ui', 'names', 'attributes', 'track_types')
+
+    def __init__(self, language, name, ui, names, track_types):
+        self.language = language
+        self.name = name
+        # UI text, with English filling any key the language pack lacks
+        self.ui = {**UI_TRANSLATIONS['en'], **ui}
+        # Category and attribute names as translated
+        self.names = names
+        # Attribute names including computed fallbacks, grown as attributes are seen
+        self.attributes = dict(names)
+        self.track_types = track_types
+
+
+_compiled = {}
+_compile_lock = threading.RLock()
+_available = None
+
+
+@functools.lru_cache(maxsize=None)
+def _fallback_name(attribute):
+    """Format an attribute name that has no translation, e.g. frame_rate_mode -> Frame Rate Mode"""
+    return attribute.replace('_', ' ').title()
+
+
+def _find_language_pack(language):
+    for directory in LANGUAGE_PACK_DIRS:
+        path = os.path.join(directory, f"{language}.json")
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def _compile(language):
+    if language in UI_TRANSLATIONS:
+        return LanguageTables(
+            language, LANGUAGE_NAMES.get(language, language), UI_TRANSLATIONS[language],
+            MEDIAINFO_TRANSLATIONS[language], TRACK_TYPE_TRANSLATIONS[language]
+        )
+
+    path = _find_language_pack(language)
+    if path is None:
+        # Unknown languages display in English
+        return get_language_tables('en')
+
+    import json
+    with open(path, encoding='utf-8') as f:
+        pack = json.load(f)
+    return LanguageTables(
+        language, pack.get('name', language), pack.get('ui', {}),
+        pack.get('attributes', {}), pack.get('track_types', {})
+    )
+
+
+def get_language_tables(language):
+    """Get the compiled lookup tables of a language, loading its language pack if needed"""
+    tables = _compiled.get(language)
+    if tables is None:
+        with _compile_lock:
+            tables = _compiled.get(language)
+            if tables is None:
+                tables = _compiled[language] = _compile(language)
+    return tables
+
+
+def add_language_pack_dir(directory):
+    """Search another directory for language packs, ahead of the built-in ones"""
+    global _available
+    LANGUAGE_PACK_DIRS.insert(0, directory)
+    _available = None
+    _compiled.clear()
+
+
 def get_ui_text(key, language='en'):
     """Get UI text translation"""
-    return UI_TRANSLATIONS.get(language, UI_TRANSLATIONS['en']).get(key, key)
+    return get_language_tables(language).ui.get(key, key)
 
 def get_attribute_name(attribute, language='en'):
     """Get translated attribute name"""
-    return MEDIAINFO_TRANSLATIONS.get(language, MEDIAINFO_TRANSLATIONS['en']).get(attribute, attribute.replace('_', ' ').title())
+    attributes = get_language_tables(language).attributes
+    name = attributes.get(attribute)
+    if name is None:
+        name = attributes[attribute] = _fallback_name(attribute)
+    return name
 
 def get_category_name(category, language='en'):
     """Get translated category name"""
-    return MEDIAINFO_TRANSLATIONS.get(language, MEDIAINFO_TRANSLATIONS['en']).get(category, category)
+    return get_language_tables(language).names.get(category, category)
+
+def get_track_type_name(track_type, language='en'):
+    """Get translated track type name"""
+    return get_language_tables(language).track_types.get(track_type, track_type)
 
 def get_available_languages():
     """Get list of available languages"""
-    return list(UI_TRANSLATIONS.keys())
\ No newline at end of file
+    global _available
+    if _available is None:
+        languages = list(UI_TRANSLATIONS)
+        for directory in LANGUAGE_PACK_DIRS:
+            try:
+                names = sorted(os.listdir(directory))
+            except OSError:
+                continue
+            for name in names:
+                code, ext = os.path.splitext(name)
+                if ext == '.json' and code not in languages:
+                    languages.append(code)
+        _available = languages
+    return list(_available)
+
+def get_language_name(language):
+    """Get the name of a language as shown in the language menu, e.g. 中文"""
+    return get_language_tables(language).name
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Directory tree watcher for MediaInfo Viewer
+Follows a library tree with Linux inotify (through ctypes, no extra
+dependency) and hands back changed paths once writes to them have settled,
+so files still being copied in are not parsed half-written
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+# Seconds without further events before a changed path is reported
+DEFAULT_SETTLE = 2.0
+
+# inotify event masks, from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+
+_EVENT = struct.Struct('iIII')  # wd, mask, cookie, name length
+
+_libc = None
+
+
+def _get_libc():
+    global _libc
+    if _libc is None:
+        _libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+    return _libc
+
+
+def is_supported():
+    """Check whether inotify is available on this platform"""
+    if not sys.platform.startswith('linux'):
+        return False
+    try:
+        return hasattr(_get_libc(), 'inotify_init1')
+    except OSError:
+        return False
+
+
+class TreeWatcher:
+    """Watches every directory under a root and reports paths whose changes have settled
+
+    A reported path may be a file that was created, written or moved in, a
+    directory that appeared (its contents need a walk), or a path that no
+    longer exists (it and anything under it were deleted or moved away).
+    """
+
+    def __init__(self, root, settle=DEFAULT_SETTLE, follow_symlinks=False):
+        libc = _get_libc()
+        self.root = os.path.abspath(root)
+        self.settle = settle
+        self.follow_symlinks = follow_symlinks
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._dirs = {}      # watch descriptor -> directory path
+        self._pending = {}   # path -> time of its last event
+        # Set when events were lost and the whole tree needs rescanning
+        self.overflowed = False
+        self._watch_tree(self.root)
+
+    def _watch_tree(self, root):
+        """Add watches for root and every directory below it"""
+        libc = _get_libc()
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            wd = libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+            if wd < 0:
+                # Vanished or unreadable; nothing to watch
+                continue
+            self._dirs[wd] = directory
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=self.follow_symlinks):
+                            stack.append(entry.path)
+            except OSError:
+                continue
+
+    def poll(self, timeout=None):
+        """Wait up to timeout seconds for events, then get the paths that have settled"""
+        now = time.monotonic()
+        if self._pending:
+            next_due = min(self._pending.values()) + self.settle - now
+            timeout = max(0.0, next_due if timeout is None else min(timeout, next_due))
+
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if ready:
+            self._read_events()
+
+        now = time.monotonic()
+        settled = [path for path, last in self._pending.items() if now - last >= self.settle]
+        for path in settled:
+            del self._pending[path]
+        return sorted(settled)
+
+    def _read_events(self):
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        now = time.monotonic()
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            name = data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b'\0')
+            offset += _EVENT.size + length
+
+            if mask & IN_Q_OVERFLOW:
+                self.overflowed = True
+                continue
+            directory = self._dirs.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_IGNORED:
+                # The directory was deleted or moved; its parent reports that
+                del self._dirs[wd]
+                continue
+            if not name:
+                continue
+
+            path = os.path.join(directory, os.fsdecode(name))
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                self._watch_tree(path)
+            self._pending[path] = now
+
+    def close(self):
+        """Stop watching"""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()